@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+伤害计算内核模块
+SkillProcessor.process_damage 公式（防御减伤、暴击判定、最小伤害保护）的批量版本，
+安装Numba时编译为本地代码，未安装时按纯Python执行（结果一致）；单次伤害仍由process_damage直接计算
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from battle._numba_compat import NUMBA_ENABLED, njit, prange
+
+
+@njit(cache=True)
+def compute_damage(base_damage, defense, crit_rate, crit_damage, target_level,
+                   defense_param1, defense_param2, min_damage, roll):
+    """计算一次伤害
+
+    Args:
+        roll: [0, 1)区间的随机数，小于暴击率时暴击
+
+    Returns:
+        (伤害值, 是否暴击, 防御减伤比例)
+    """
+    # 防御减伤比例：防御力 / (防御力 + (等级 * 参数1 + 参数2))
+    defense_reduction = defense / (defense + (target_level * defense_param1 + defense_param2))
+    is_crit = roll < crit_rate
+    # 暴击倍率用条件选择代替分支（乘以1.0不改变结果）
+    multiplier = crit_damage if is_crit else 1.0
+    damage = int(base_damage * multiplier * (1 - defense_reduction))
+    return max(min_damage, damage), is_crit, defense_reduction
+
+
+@njit(cache=True, parallel=True)
+def _compute_damage_batch(base_damage, defense, crit_rate, crit_damage, target_level,
+                          defense_param1, defense_param2, min_damage, rolls, out_damage, out_crit):
+    """并行计算多次相互独立的伤害，结果写入out_damage/out_crit"""
+    for i in prange(base_damage.shape[0]):
+        damage, is_crit, _ = compute_damage(base_damage[i], defense[i], crit_rate[i], crit_damage[i],
+                                            target_level[i], defense_param1, defense_param2, min_damage,
+                                            rolls[i])
+        out_damage[i] = damage
+        out_crit[i] = is_crit
+
+
+def compute_damage_batch(base_damage: np.ndarray, defense: np.ndarray, crit_rate: np.ndarray,
+                         crit_damage: np.ndarray, target_level: np.ndarray, defense_param1: float,
+                         defense_param2: float, min_damage: int, rolls: np.ndarray) -> Dict:
+    """批量计算伤害（多名攻击者对多名目标，各数组等长，逐元素对应一次攻击）
+
+    Args:
+        defense_param1, defense_param2, min_damage: 伤害公式参数，见skill_processor.damage_params
+        rolls: 每次攻击的暴击判定随机数
+
+    Returns:
+        包含伤害值数组和暴击标记数组的字典
+    """
+    n = len(base_damage)
+    damage = np.empty(n, dtype=np.int64)
+    is_crit = np.empty(n, dtype=np.bool_)
+    _compute_damage_batch(np.ascontiguousarray(base_damage, dtype=np.float64),
+                          np.ascontiguousarray(defense, dtype=np.float64),
+                          np.ascontiguousarray(crit_rate, dtype=np.float64),
+                          np.ascontiguousarray(crit_damage, dtype=np.float64),
+                          np.ascontiguousarray(target_level, dtype=np.float64),
+                          float(defense_param1), float(defense_param2), int(min_damage),
+                          np.ascontiguousarray(rolls, dtype=np.float64),
+                          damage, is_crit)
+    return {
+        'damage': damage,
+        'is_crit': is_crit
+    }
+
+
+# SWAR暴击判定：每个uint64随机数拆成8个字节通道，暴击率量化为1/256后逐通道比较
+_LANE_HIGH_BITS = np.uint64(0x8080808080808080)
+_LANE_ONES = np.uint64(0x0101010101010101)
+
+
+@njit(cache=True)
+def _swar_less_than(draws, threshold, high_bits):
+    """逐字节通道比较 draws < threshold（无符号），返回每个通道最高位为比较结果的uint64数组
+
+    低7位借助置位最高位相减比较（通道间不产生借位），最高位不同的通道直接由最高位决定。
+    """
+    low_ge = (draws | high_bits) - (threshold & ~high_bits)
+    return ((~draws & threshold) | (~(draws ^ threshold) & ~low_ge)) & high_bits
+
+
+def swar_crit_rolls(crit_rate: float, bits: np.ndarray, n: int) -> np.ndarray:
+    """按量化到1/256的暴击率批量判定暴击，每个64位随机数给出8次判定
+
+    Args:
+        crit_rate: 暴击率
+        bits: 至少 (n + 7) // 8 个uint64随机数
+        n: 判定次数
+
+    Returns:
+        长度为n的布尔数组
+    """
+    threshold = int(crit_rate * 256)
+    if threshold <= 0:
+        return np.zeros(n, dtype=np.bool_)
+    if threshold >= 256:
+        return np.ones(n, dtype=np.bool_)
+    lanes = _swar_less_than(np.ascontiguousarray(bits[:(n + 7) // 8], dtype=np.uint64),
+                            np.uint64(threshold) * _LANE_ONES, _LANE_HIGH_BITS)
+    # 每个通道的最高位即该次判定结果，按字节展开
+    return lanes.view(np.uint8)[:n] != 0
+
+
+# 伤害结算的目标属性，每个英雄一行；生命值、护盾值、等级为整数，按int32/int16紧凑存储
+# 防御力可能因固定值增益出现小数，保留float64以保证与逐个结算的结果一致
+BATTLE_STATE_DTYPE = np.dtype([
+    ('health', np.int32),     # 当前生命值
+    ('shield', np.int32),     # 当前护盾值
+    ('defense', np.float64),  # 防御力
+    ('level', np.int16),      # 等级
+])
+
+
+class BattleState:
+    """一组英雄伤害结算相关属性的列式快照（结构化数组存储，字段访问返回可原地修改的视图），
+    行下标与英雄列表一致"""
+
+    def __init__(self, heroes: List):
+        self.records = np.zeros(len(heroes), dtype=BATTLE_STATE_DTYPE)
+        for i, hero in enumerate(heroes):
+            self.records[i] = (hero.health, hero.shield_amount, hero.defense, hero.level)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        """按字段名访问列视图，如 state.health"""
+        records = self.__dict__.get('records')
+        if records is not None and name in BATTLE_STATE_DTYPE.names:
+            return records[name]
+        raise AttributeError(name)
+
+    def write_back(self, heroes: List):
+        """将生命值和护盾值写回英雄对象"""
+        for hero, health, shield in zip(heroes, self.records['health'].tolist(), self.records['shield'].tolist()):
+            hero.health = health
+            hero.shield_amount = shield
+
+
+def vector_damage(state: BattleState, base_damage: int, crit_rate: float, crit_damage: float,
+                  role_mult: np.ndarray, rank_mult: np.ndarray, defense_param1: float, defense_param2: float,
+                  min_damage: int, rolls: Optional[np.ndarray] = None) -> Dict:
+    """对state中的全部目标结算一次伤害，护盾优先吸收，原地更新state的护盾值和生命值
+
+    与逐个目标调用 process_damage、_calculate_job_counter_damage、_apply_with_shield 的结果一致。
+
+    Args:
+        state: 目标属性快照
+        base_damage: 基础伤害值
+        crit_rate: 攻击者暴击率
+        crit_damage: 攻击者暴击伤害倍率
+        role_mult: 对每个目标的职业克制倍率
+        rank_mult: 对每个目标的稀有度克制倍率
+        defense_param1, defense_param2, min_damage: 伤害公式参数，见skill_processor.damage_params
+        rolls: 每个目标的暴击判定随机数，None表示无视防御且不暴击
+
+    Returns:
+        包含伤害值、暴击标记、护盾吸收值数组的字典
+    """
+    n = len(state)
+    if rolls is None:
+        damage = np.full(n, int(base_damage), dtype=np.int64)
+        is_crit = np.zeros(n, dtype=np.bool_)
+    else:
+        batch = compute_damage_batch(np.full(n, float(base_damage)), state.defense, np.full(n, float(crit_rate)),
+                                     np.full(n, float(crit_damage)), state.level,
+                                     defense_param1, defense_param2, min_damage, rolls)
+        damage, is_crit = batch['damage'], batch['is_crit']
+
+    # 职业克制和稀有度克制倍率分别取整
+    damage = np.trunc(np.trunc(damage * role_mult) * rank_mult).astype(np.int64)
+
+    # 护盾优先吸收，剩余伤害扣除生命值
+    absorbed = np.where(damage > 0, np.minimum(damage, np.maximum(state.shield, 0)), 0)
+    shield = state.shield
+    shield -= absorbed.astype(np.int32)
+    remaining = damage - absorbed
+    health = state.health
+    health[:] = np.where(remaining > 0, np.maximum(0, health - remaining), health)
+    return {
+        'damage': damage,
+        'is_crit': is_crit,
+        'absorbed': absorbed
+    }
+
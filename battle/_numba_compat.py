@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Numba兼容模块
+统一导入Numba的njit/prange，未安装时提供占位实现，被装饰的函数按纯Python执行（结果一致，仅速度较慢）
+"""
+
+# 尝试导入Numba，未安装时退化为纯Python实现
+NUMBA_ENABLED = False
+try:
+    from numba import njit, prange
+    NUMBA_ENABLED = True
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Numba不可用时的占位装饰器"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
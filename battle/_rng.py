@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+随机数源模块
+技能处理器的随机数来源：默认使用标准库random模块的全局状态（可通过random.seed复现），
+也可换成按批生成随机数的NumPy Generator（NumPy在需要数组或创建Generator时才导入）
+"""
+
+import random
+from typing import Optional
+
+
+class ModuleRNG:
+    """使用标准库random模块全局状态的随机数源（默认）"""
+
+    __slots__ = ()
+
+    @staticmethod
+    def random() -> float:
+        """返回[0, 1)区间的随机数"""
+        return random.random()
+
+    @staticmethod
+    def random_array(n: int) -> 'np.ndarray':
+        """返回n个[0, 1)区间的随机数（与逐个调用random()的序列一致）"""
+        import numpy as np
+        return np.array([random.random() for _ in range(n)], dtype=np.float64)
+
+    @staticmethod
+    def random_bits(n: int) -> 'np.ndarray':
+        """返回n个64位随机整数（uint64数组）"""
+        import numpy as np
+        return np.frombuffer(random.getrandbits(64 * n).to_bytes(8 * n, 'little'), dtype=np.uint64).copy()
+
+
+class BatchedRNG:
+    """按批预先生成随机数的随机数源（每场战斗一个实例，相同种子可复现）
+
+    每次从NumPy Generator生成一批随机数缓存为Python浮点数列表，
+    random()只需按下标取值，用完后再生成下一批。
+    """
+
+    __slots__ = ('_generator', '_batch_size', '_buffer', '_index')
+
+    def __init__(self, seed: Optional[int] = None, batch_size: int = 4096):
+        import numpy as np
+        self._generator = np.random.default_rng(seed)
+        self._batch_size = batch_size
+        self._buffer = self._generator.random(batch_size).tolist()
+        self._index = 0
+
+    def random(self) -> float:
+        """返回[0, 1)区间的随机数"""
+        index = self._index
+        if index >= self._batch_size:
+            self._buffer = self._generator.random(self._batch_size).tolist()
+            index = 0
+        self._index = index + 1
+        return self._buffer[index]
+
+    def random_array(self, n: int) -> 'np.ndarray':
+        """返回n个[0, 1)区间的随机数，直接由Generator生成"""
+        return self._generator.random(n)
+
+    def random_bits(self, n: int) -> 'np.ndarray':
+        """返回n个64位随机整数（uint64数组），直接取自Generator的位生成器"""
+        return self._generator.bit_generator.random_raw(n)
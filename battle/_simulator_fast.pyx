@@ -0,0 +1,87 @@
+# cython: language_level=3
+# -*- coding: utf-8 -*-
+"""
+战斗模拟器加速模块（Cython）
+与BattleSimulator._process_skill_effect / _end_of_turn 的逻辑保持一致，
+使用 scripts/build_ext.py 编译；未编译时模拟器自动使用纯Python实现
+"""
+
+from battle.status_manager import StatusManager
+from battle.effects import (
+    AttackEffect, TrueDamageEffect, ControlEffect, FreezeEffect, BuffEffect, ResistEffect, effect_from_dict
+)
+
+
+cpdef process_skill_effect(sim, effect, attacker, defender, str attacker_name, str defender_name, list msgs,
+                           dict target_names=None):
+    """处理技能效果，产生的日志追加到msgs缓冲中（msgs为None时不记录日志）"""
+    effect = effect_from_dict(effect, target_names)
+    if effect is None:
+        return
+
+    cls = type(effect)
+    if msgs is None and cls is not ControlEffect and cls is not FreezeEffect:
+        return
+    cdef str target_display_name
+    target_name = effect.target
+
+    if cls is AttackEffect:
+        msgs.append(f"  - 造成 {effect.damage} 点伤害{' (暴击!)' if effect.is_crit else ''}")
+
+    elif cls is TrueDamageEffect:
+        msgs.append(f"  - 造成 {effect.damage} 点真实伤害（无视防御）")
+
+    elif cls is ControlEffect or cls is FreezeEffect:
+        subtype = effect.subtype if cls is ControlEffect else 'freeze'
+        if target_name is None or target_name == defender_name:
+            target, target_display_name = defender, defender_name
+        else:
+            target, target_display_name = attacker, attacker_name
+        StatusManager.apply_status_effect(target, subtype, effect.duration, target_display_name)
+        if msgs is not None:
+            msgs.append(f"  - {target_display_name} 被施加 {subtype} 效果，持续 {effect.duration} 回合!")
+
+    elif cls is BuffEffect:
+        if target_name is None or target_name == attacker_name:
+            target_display_name = attacker_name
+        else:
+            target_display_name = defender_name
+        msgs.append(f"  - {target_display_name} 获得 {effect.subtype} 效果，数值: {effect.amount}")
+
+    elif cls is ResistEffect:
+        if target_name is None or target_name == defender_name:
+            target_display_name = defender_name
+        else:
+            target_display_name = attacker_name
+        msgs.append(f"  - {target_display_name} 抵抗了 {effect.skill_name} 的 {effect.effect_type} 效果!")
+
+
+cpdef end_of_turn(sim):
+    """回合结束处理"""
+    cdef list msgs
+
+    hero1 = sim.hero1
+    hero2 = sim.hero2
+
+    # 减少技能冷却
+    hero1.tick_cooldowns()
+    hero2.tick_cooldowns()
+
+    # 处理状态效果（没有任何状态效果的英雄跳过查询），结果同时用于日志和回合记录
+    hero1_effects = StatusManager.get_active_effects(hero1) if StatusManager.has_active_effects(hero1) else []
+    hero2_effects = StatusManager.get_active_effects(hero2) if StatusManager.has_active_effects(hero2) else []
+
+    if sim._detailed:
+        msgs = [f"=== 回合 {sim.current_turn} 结束 ==="]
+        for hero_name, active_effects in ((sim._hero1_display, hero1_effects), (sim._hero2_display, hero2_effects)):
+            if active_effects:
+                msgs.append(f"{hero_name} 的状态效果:")
+                for effect in active_effects:
+                    remaining = effect['duration'] - 1
+                    if remaining > 0:
+                        msgs.append(f"  - {effect['type']}: 剩余 {remaining} 回合")
+                    else:
+                        msgs.append(f"  - {effect['type']}: 效果结束")
+        sim._flush(msgs)
+
+    sim._record_turn(hero1_effects, hero2_effects)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+战斗提示输出模块
+技能效果、状态效果的控制台提示（默认关闭，设置环境变量BATTLE_VERBOSE=1开启）
+"""
+
+import os
+
+VERBOSE_MODE = os.environ.get('BATTLE_VERBOSE') == '1'
+
+
+def emit(message: str, *args):
+    """输出提示（仅VERBOSE_MODE开启时）
+
+    参数按%格式延迟填入message，关闭时不做任何字符串格式化。
+    """
+    if VERBOSE_MODE:
+        print(message % args if args else message)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+技能效果表模块
+将技能编辑器生成的效果字典打包为NumPy结构化数组，用于大规模技能库的批量统计分析
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from battle._numba_compat import NUMBA_ENABLED, njit
+from battle.skill_editor import EFFECT_TYPE_CODES
+
+
+# 每个效果一行，不适用于该效果类型的字段为0
+EFFECT_TABLE_DTYPE = np.dtype([
+    ('type_code', np.uint8),            # 效果类型编码，见EFFECT_TYPE_CODES
+    ('probability', np.float32),        # 触发概率
+    ('duration', np.int16),             # 持续时间(回合数)
+    ('base_damage', np.int32),          # 基础伤害值（伤害效果）
+    ('damage_multiplier', np.float32),  # 伤害系数（伤害效果）
+    ('value', np.float32),              # 增益/减益/状态数值
+    ('shield_amount', np.int32),        # 护盾值（护盾效果）
+])
+
+
+class SkillEffectTable:
+    """技能效果表（结构化数组存储，字段访问返回可原地修改的视图）"""
+
+    def __init__(self, records: np.ndarray):
+        self.records = records
+
+    @classmethod
+    def from_effects(cls, effects: List[Dict]) -> 'SkillEffectTable':
+        """从完整的效果字典列表创建效果表
+
+        Args:
+            effects: 效果字典列表（SkillEditor.create_custom_skill生成的effects），未知类型的效果被忽略
+        """
+        effects = [effect for effect in effects if effect.get('type') in EFFECT_TYPE_CODES]
+        records = np.zeros(len(effects), dtype=EFFECT_TABLE_DTYPE)
+        for i, effect in enumerate(effects):
+            get = effect.get
+            records[i] = (
+                EFFECT_TYPE_CODES[effect['type']],
+                get('probability', 1.0),
+                get('duration', 0),
+                get('base_damage', 0),
+                get('damage_multiplier', 0.0),
+                get('value', 0.0),
+                get('shield_amount', 0),
+            )
+        return cls(records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        """按字段名访问列视图，如 table.probability"""
+        records = self.__dict__.get('records')
+        if records is not None and name in EFFECT_TABLE_DTYPE.names:
+            return records[name]
+        raise AttributeError(name)
+
+    def type_mask(self, effect_type: str) -> np.ndarray:
+        """指定效果类型的布尔掩码"""
+        return self.records['type_code'] == EFFECT_TYPE_CODES[effect_type]
+
+    def roll_triggers(self, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """按触发概率批量判定所有效果是否触发
+
+        Args:
+            rng: 随机数生成器，None表示新建一个
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        return rng.random(len(self.records)) < self.records['probability']
+
+
+@njit(cache=True)
+def _evaluate_triggers(probs, rolls, out):
+    """逐个效果比较随机数与触发概率（Numba内核，随机数由调用方统一生成）"""
+    for i in range(probs.shape[0]):
+        out[i] = rolls[i] < probs[i]
+
+
+def evaluate_triggers(probs: np.ndarray, seed: Optional[int] = None) -> np.ndarray:
+    """批量判定效果是否触发
+
+    随机数统一由NumPy Generator生成，是否安装Numba不影响相同种子的结果。
+
+    Args:
+        probs: 触发概率数组（如SkillEffectTable.probability）
+        seed: 随机种子，None表示随机
+
+    Returns:
+        与probs等长的布尔数组
+    """
+    rolls = np.random.default_rng(seed).random(len(probs))
+    if not NUMBA_ENABLED:
+        return rolls < probs
+
+    out = np.empty(len(probs), dtype=np.bool_)
+    _evaluate_triggers(np.ascontiguousarray(probs, dtype=np.float64), rolls, out)
+    return out
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+技能效果记录模块
+定义战斗模拟器处理的技能效果类型（使用__slots__的轻量记录类）
+"""
+
+from typing import Dict, Optional
+
+
+class Effect:
+    """技能效果记录基类"""
+
+    __slots__ = ('target',)
+    type = ''
+
+    def __init__(self, target: Optional[str] = None):
+        self.target = target  # 目标显示名称，None表示使用默认目标
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'Effect':
+        """从技能处理器/插件返回的效果字典创建记录"""
+        return cls(target=effect.get('target'))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._all_slots())
+        return f"{self.__class__.__name__}({fields})"
+
+    @classmethod
+    def _all_slots(cls):
+        """按继承顺序列出所有字段"""
+        slots = []
+        for klass in reversed(cls.__mro__):
+            slots.extend(getattr(klass, '__slots__', ()))
+        return slots
+
+
+class AttackEffect(Effect):
+    """伤害效果"""
+
+    __slots__ = ('damage', 'is_crit')
+    type = 'attack'
+
+    def __init__(self, damage: int = 0, is_crit: bool = False, target: Optional[str] = None):
+        super().__init__(target)
+        self.damage = damage
+        self.is_crit = is_crit
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'AttackEffect':
+        return cls(effect.get('damage', 0), effect.get('is_crit', False), effect.get('target'))
+
+
+class TrueDamageEffect(Effect):
+    """真实伤害效果（无视防御）"""
+
+    __slots__ = ('damage',)
+    type = 'true_damage'
+
+    def __init__(self, damage: int = 0, target: Optional[str] = None):
+        super().__init__(target)
+        self.damage = damage
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'TrueDamageEffect':
+        return cls(effect.get('damage', 0), effect.get('target'))
+
+
+class ControlEffect(Effect):
+    """控制效果（眩晕、麻痹、嘲讽等）"""
+
+    __slots__ = ('subtype', 'duration')
+    type = 'control'
+
+    def __init__(self, subtype: str = 'stun', duration: int = 2, target: Optional[str] = None):
+        super().__init__(target)
+        self.subtype = subtype
+        self.duration = duration
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'ControlEffect':
+        return cls(effect.get('subtype', 'stun'), effect.get('duration', 2), effect.get('target'))
+
+
+class FreezeEffect(Effect):
+    """冰冻效果"""
+
+    __slots__ = ('duration',)
+    type = 'freeze'
+
+    def __init__(self, duration: int = 2, target: Optional[str] = None):
+        super().__init__(target)
+        self.duration = duration
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'FreezeEffect':
+        return cls(effect.get('duration', 2), effect.get('target'))
+
+
+class BuffEffect(Effect):
+    """增益效果"""
+
+    __slots__ = ('subtype', 'amount')
+    type = 'buff'
+
+    def __init__(self, subtype: str = 'attack_boost', amount=0, target: Optional[str] = None):
+        super().__init__(target)
+        self.subtype = subtype
+        self.amount = amount
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'BuffEffect':
+        return cls(effect.get('subtype', 'attack_boost'), effect.get('amount', 0), effect.get('target'))
+
+
+class ResistEffect(Effect):
+    """抵抗效果（目标抵抗了技能的附加效果）"""
+
+    __slots__ = ('skill_name', 'effect_type')
+    type = 'resist'
+
+    def __init__(self, skill_name: str = '技能', effect_type: str = '效果', target: Optional[str] = None):
+        super().__init__(target)
+        self.skill_name = skill_name
+        self.effect_type = effect_type  # 被抵抗的效果类型
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'ResistEffect':
+        return cls(effect.get('skill_name', '技能'), effect.get('effect_type', '效果'), effect.get('target'))
+
+
+# 效果类型字符串 -> 记录类
+EFFECT_TYPES = {
+    cls.type: cls
+    for cls in (AttackEffect, TrueDamageEffect, ControlEffect, FreezeEffect, BuffEffect, ResistEffect)
+}
+
+
+def effect_from_dict(effect, target_names: Optional[Dict[str, str]] = None) -> Optional[Effect]:
+    """将效果字典转换为效果记录
+
+    已经是效果记录的对象直接使用（技能处理器每次生成新记录，目标名称原地转换）；
+    战斗模拟器不处理的效果类型返回None。
+
+    Args:
+        effect: 效果字典或效果记录
+        target_names: 英雄名称 -> 显示名称，效果目标为英雄名称时转换为显示名称（不修改效果字典）
+    """
+    if isinstance(effect, Effect):
+        record = effect
+    else:
+        effect_class = EFFECT_TYPES.get(effect.get('type'))
+        if effect_class is None:
+            return None
+        record = effect_class.from_dict(effect)
+    if target_names and record.target in target_names:
+        record.target = target_names[record.target]
+    return record
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量战斗模拟模块
+将英雄属性打包为NumPy数组，在纯数值内核中并行模拟大量战斗，用于平衡性统计
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from battle._numba_compat import NUMBA_ENABLED, njit, prange
+
+
+# 属性数组列索引（每个英雄一行）
+STAT_HP = 0
+STAT_ATK = 1
+STAT_DEF = 2
+STAT_LEVEL = 3
+STAT_CRIT_RATE = 4
+STAT_CRIT_DMG = 5
+STAT_SKILL_CD = 6
+STAT_SKILL_COEF = 7   # 伤害类技能系数，0表示技能按普通攻击结算
+STAT_JOB_MULT = 8     # 对对手的职业克制倍率
+STAT_RANK_MULT = 9    # 对对手的稀有度克制倍率
+STAT_SKILL_PROB = 10  # 技能可用时使用技能的概率
+STAT_REVIVE = 11      # 是否拥有不屈意志（1.0/0.0）
+STAT_FIELDS = 12
+
+
+def pack_hero_stats(hero, opponent) -> np.ndarray:
+    """将英雄属性打包为一行数值数组
+
+    技能部分只取第一个技能：技能类型为伤害类时按攻击力 * 技能系数结算，
+    否则与SkillProcessor的默认处理一致，按普通攻击结算。
+    控制、BUFF、护盾等效果不在批量模拟范围内。
+
+    Args:
+        hero: 英雄对象
+        opponent: 对手英雄对象（用于预先计算克制倍率）
+
+    Returns:
+        长度为STAT_FIELDS的float64数组
+    """
+    from battle.skill_processor import SkillProcessor, _job_counter_multipliers
+
+    row = np.zeros(STAT_FIELDS, dtype=np.float64)
+    row[STAT_HP] = hero.max_health
+    row[STAT_ATK] = hero.attack
+    row[STAT_DEF] = hero.defense
+    row[STAT_LEVEL] = hero.level
+    row[STAT_CRIT_RATE] = hero.crit_rate
+    row[STAT_CRIT_DMG] = hero.crit_damage
+    row[STAT_SKILL_PROB] = 0.8 if hero.plugin_skills else 0.7
+
+    if hero.skills:
+        skill = hero.skills[0]
+        cooldown = skill.get('cooldown', 0)
+        row[STAT_SKILL_CD] = cooldown if cooldown == cooldown else 0  # NaN视为无冷却
+        if str(skill.get('技能类型', '')) in ['1', '1.0']:
+            row[STAT_SKILL_COEF] = SkillProcessor._get_skill_value(hero, skill)
+
+    # 克制倍率与技能处理器共用同一张表
+    row[STAT_JOB_MULT], row[STAT_RANK_MULT] = _job_counter_multipliers(hero.role, opponent.role, hero.rank, opponent.rank)
+    row[STAT_REVIVE] = 1.0 if 'unyielding_will' in hero.passive_states else 0.0
+    return row
+
+
+@njit(cache=True)
+def _action_damage(stats, attack, attacker, defender, use_skill, defense_param1, defense_param2, min_damage):
+    """计算一次行动造成的伤害"""
+    if use_skill and stats[attacker, STAT_SKILL_COEF] > 0.0:
+        # 伤害类技能：攻击力 * 技能系数，不暴击、无最小伤害保护
+        damage = int(attack * stats[attacker, STAT_SKILL_COEF])
+        damage = int(damage * stats[attacker, STAT_JOB_MULT])
+        return int(damage * stats[attacker, STAT_RANK_MULT])
+
+    defense = stats[defender, STAT_DEF]
+    reduction = defense / (defense + (stats[defender, STAT_LEVEL] * defense_param1 + defense_param2))
+    if np.random.random() < stats[attacker, STAT_CRIT_RATE]:
+        damage = int(attack * stats[attacker, STAT_CRIT_DMG] * (1 - reduction))
+    else:
+        damage = int(attack * (1 - reduction))
+    damage = int(damage * stats[attacker, STAT_JOB_MULT])
+    damage = int(damage * stats[attacker, STAT_RANK_MULT])
+    return max(min_damage, damage)
+
+
+@njit(cache=True, parallel=True)
+def _simulate_batch(stats, n_sims, max_turns, seed, defense_param1, defense_param2, min_damage,
+                    out_winners, out_turns):
+    """并行模拟n_sims场相互独立的战斗
+
+    out_winners[i]为第i场的胜利者下标（0或1），out_turns[i]为战斗回合数。
+    """
+    for sim in prange(n_sims):
+        np.random.seed(seed + sim)
+        hp = stats[:, STAT_HP].copy()
+        attack = stats[:, STAT_ATK].copy()
+        cooldown = np.zeros(2)
+        revive_left = stats[:, STAT_REVIVE].copy()
+        boost_left = np.zeros(2)
+        boost_amount = np.zeros(2)
+        turn = 0
+
+        while hp[0] > 0 and hp[1] > 0:
+            turn += 1
+
+            # 回合开始：不屈意志攻击力提升倒计时
+            for h in range(2):
+                if boost_left[h] > 0:
+                    boost_left[h] -= 1
+                    if boost_left[h] == 0:
+                        attack[h] -= boost_amount[h]
+                        boost_amount[h] = 0
+
+            # 双方同时决策，随后依次行动（与BattleSimulator一致，已阵亡的英雄2仍完成本回合行动）
+            use_skill = np.zeros(2, dtype=np.bool_)
+            for h in range(2):
+                use_skill[h] = cooldown[h] <= 0 and np.random.random() < stats[h, STAT_SKILL_PROB]
+
+            for h in range(2):
+                target = 1 - h
+                damage = _action_damage(stats, attack[h], h, target, use_skill[h],
+                                        defense_param1, defense_param2, min_damage)
+                if use_skill[h]:
+                    cooldown[h] = stats[h, STAT_SKILL_CD]
+                if damage > 0 and hp[target] > 0:
+                    hp[target] = max(0.0, hp[target] - damage)
+                    if hp[target] == 0 and revive_left[target] > 0:
+                        # 不屈意志：首次阵亡复活并恢复40%最大生命值，攻击力提升持续10回合
+                        revive_left[target] = 0
+                        hp[target] = int(stats[target, STAT_HP] * 0.4)
+                        boost_amount[target] = int(attack[target] * (0.55 + stats[target, STAT_LEVEL] * 0.05))
+                        attack[target] += boost_amount[target]
+                        boost_left[target] = 10
+
+            # 回合结束减少冷却
+            for h in range(2):
+                if cooldown[h] > 0:
+                    cooldown[h] -= 1
+
+            if turn >= max_turns:
+                # 生命值较少的一方判负，相同则随机
+                if hp[0] < hp[1]:
+                    hp[0] = 0.0
+                elif hp[1] < hp[0]:
+                    hp[1] = 0.0
+                elif np.random.random() < 0.5:
+                    hp[0] = 0.0
+                else:
+                    hp[1] = 0.0
+                break
+
+        out_winners[sim] = 0 if hp[0] > 0 else 1
+        out_turns[sim] = turn
+
+
+def simulate_battles(stats: np.ndarray, n_sims: int, max_turns: int = 100,
+                     seed: Optional[int] = None) -> Dict:
+    """批量模拟两名英雄之间的战斗
+
+    Args:
+        stats: 形状为(2, STAT_FIELDS)的属性数组，见pack_hero_stats
+        n_sims: 模拟场数
+        max_turns: 每场最大回合数
+        seed: 随机种子，None表示随机
+
+    Returns:
+        包含胜场统计和每场结果的字典
+    """
+    from battle.skill_processor import damage_params
+
+    if seed is None:
+        seed = int(np.random.randint(0, 2 ** 31 - 1))
+
+    # 伤害公式参数与技能处理器使用同一份缓存
+    defense_param1, defense_param2, min_damage = damage_params()
+    winners = np.zeros(n_sims, dtype=np.int8)
+    turns = np.zeros(n_sims, dtype=np.int32)
+    _simulate_batch(np.ascontiguousarray(stats, dtype=np.float64), n_sims, max_turns, seed,
+                    defense_param1, defense_param2, min_damage, winners, turns)
+
+    wins = np.bincount(winners, minlength=2)
+    return {
+        'wins': wins,
+        'win_rate': wins / n_sims if n_sims else np.zeros(2),
+        'avg_turns': float(turns.mean()) if n_sims else 0.0,
+        'winners': winners,
+        'turns': turns
+    }
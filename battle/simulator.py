@@ -6,23 +6,91 @@
 """
 
 import random
-from typing import Dict, List, Optional
+import sys
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 from core.hero import Hero
+from battle.status_manager import StatusManager
+from battle.effects import (
+    AttackEffect, TrueDamageEffect, ControlEffect, FreezeEffect, BuffEffect, ResistEffect, effect_from_dict
+)
+
+# 可选的Cython加速实现（scripts/build_ext.py编译），未编译时使用纯Python实现
+try:
+    from battle import _simulator_fast
+except ImportError:
+    _simulator_fast = None
+
+
+class TurnRecord(NamedTuple):
+    """单回合战斗记录"""
+    turn: int
+    hero1_health: int
+    hero2_health: int
+    hero1_effects: List[Dict]
+    hero2_effects: List[Dict]
+
+# 日志级别
+LOG_SILENT = 0        # 不记录任何日志，只计算战斗结果
+LOG_WINNER_ONLY = 1   # 只记录战斗开始和结果
+LOG_SUMMARY = 2       # 记录完整的详细日志（默认）
+LOG_VERBOSE = 3       # 记录完整的详细日志并输出到控制台
+
+# 行动结果/效果字典中频繁访问的键和类型值，统一驻留（sys.intern）后字典探测和比较可直接命中同一对象
+(_KEY_SUCCESS, _KEY_MESSAGE, _KEY_DAMAGE, _KEY_HEAL_AMOUNT, _KEY_EFFECTS, _KEY_SKILL_NAME,
+ _KEY_EXTRA_EFFECTS, _KEY_TYPE, _KEY_DURATION, _KEY_PASSIVE_NAME, _KEY_REVIVE_HEALTH,
+ _KEY_ATTACK_BOOST_PERCENT) = map(sys.intern, (
+    'success', 'message', 'damage', 'heal_amount', 'effects', 'skill_name',
+    'extra_effects', 'type', 'duration', 'passive_name', 'revive_health',
+    'attack_boost_percent'))
+_PASSIVE_TRIGGER = sys.intern('passive_trigger')
+_UNYIELDING_WILL = sys.intern('unyielding_will')
+_FREEZE = sys.intern('freeze')
+
+# 冻结或眩晕时本回合无法行动
+_ACTION_BLOCKING_MASK = Hero.FROZEN | Hero.STUNNED
+
+# 技能效果日志模板（预先绑定format方法）
+_CRIT_TEXT = " (暴击!)"
+_MSG_ATTACK = "  - 造成 {} 点伤害{}".format
+_MSG_TRUE_DAMAGE = "  - 造成 {} 点真实伤害（无视防御）".format
+_MSG_STATUS_APPLIED = "  - {} 被施加 {} 效果，持续 {} 回合!".format
+_MSG_BUFF = "  - {} 获得 {} 效果，数值: {}".format
+_MSG_RESIST = "  - {} 抵抗了 {} 的 {} 效果!".format
 
 
 class BattleSimulator:
     """战斗模拟器"""
     
-    def __init__(self):
-        """初始化战斗模拟器"""
+    def __init__(self, verbose: bool = False, log_level: Optional[int] = None):
+        """初始化战斗模拟器
+        
+        Args:
+            verbose: 是否同时将战斗过程输出到控制台，默认仅记录到详细日志
+            log_level: 日志级别（LOG_SILENT ~ LOG_VERBOSE），指定时优先于verbose
+        """
         self.hero1 = None
         self.hero2 = None
         self.current_turn = 0
         self.battle_log = []
         self.detailed_log = []  # 详细的战斗过程日志
+        self._set_log_level(log_level if log_level is not None else (LOG_VERBOSE if verbose else LOG_SUMMARY))
+        self._hero1_display = None
+        self._hero2_display = None
+        self._name_map = {}  # {id(hero): 显示名称}
+        self._effect_target_names = {}  # {id(行动方): {英雄名称: 显示名称}}
     
-    def setup_battle(self, hero1: Hero, hero2: Hero):
-        """设置战斗双方"""
+    def setup_battle(self, hero1: Hero, hero2: Hero, verbose: Optional[bool] = None,
+                     log_level: Optional[int] = None):
+        """设置战斗双方
+        
+        Args:
+            verbose: 是否输出到控制台，None表示沿用初始化时的设置
+            log_level: 日志级别，None表示沿用初始化时的设置，指定时优先于verbose
+        """
+        if log_level is not None:
+            self._set_log_level(log_level)
+        elif verbose is not None:
+            self._set_log_level(LOG_VERBOSE if verbose else min(self._log_level, LOG_SUMMARY))
         self.hero1 = hero1
         self.hero2 = hero2
         self.current_turn = 0
@@ -37,10 +105,26 @@ class BattleSimulator:
             hero1_display_name = f"{hero1.name} (1)"
             hero2_display_name = f"{hero2.name} (2)"
         
-        battle_start_msg = f"战斗开始: {hero1_display_name} (Lv.{hero1.level}) vs {hero2_display_name} (Lv.{hero2.level})"
-        print(battle_start_msg)
-        self.detailed_log.append(battle_start_msg)
-        self.detailed_log.append("=" * 60)
+        # 显示名称在整场战斗中不变，预先缓存
+        self._hero1_display = hero1_display_name
+        self._hero2_display = hero2_display_name
+        self._name_map = {id(hero1): hero1_display_name, id(hero2): hero2_display_name}
+        # 技能效果目标（英雄名称）到显示名称的映射，按行动方区分，同名时优先指向防御方
+        self._effect_target_names = {
+            id(hero1): {hero1.name: hero1_display_name, hero2.name: hero2_display_name},
+            id(hero2): {hero2.name: hero2_display_name, hero1.name: hero1_display_name},
+        }
+        
+        if self._log_level >= LOG_WINNER_ONLY:
+            battle_start_msg = f"战斗开始: {hero1_display_name} (Lv.{hero1.level}) vs {hero2_display_name} (Lv.{hero2.level})"
+            self._log(battle_start_msg)
+            self.detailed_log.append("=" * 60)
+    
+    def _set_log_level(self, log_level: int):
+        """设置日志级别，同步verbose和是否记录详细日志的标志"""
+        self._log_level = log_level
+        self.verbose = log_level >= LOG_VERBOSE
+        self._detailed = log_level >= LOG_SUMMARY
     
     def run_battle(self, max_turns: int = 100) -> Dict:
         """运行战斗直到结束
@@ -51,93 +135,91 @@ class BattleSimulator:
         if not self.hero1 or not self.hero2:
             return {'winner': None, 'turns': 0, 'log': []}
         
+        # 循环内频繁访问的属性绑定为局部变量
+        hero1, hero2 = self.hero1, self.hero2
+        log = self._log
+        detailed = self._detailed
+        
         # 战斗前重置技能冷却
-        self.hero1.reset_cooldowns()
-        self.hero2.reset_cooldowns()
+        hero1.reset_cooldowns()
+        hero2.reset_cooldowns()
+        
+        # 按最大回合数预分配回合记录，结束后截断
+        self.battle_log = [None] * max_turns
         
-        while self.hero1.is_alive() and self.hero2.is_alive():
+        hero1_name, hero2_name = self._hero1_display, self._hero2_display
+        
+        while hero1.is_alive() and hero2.is_alive():
             self.current_turn += 1
-            turn_msg = f"\n=== 第 {self.current_turn} 回合 ==="
-            print(turn_msg)
-            self.detailed_log.append(turn_msg)
+            if detailed:
+                turn_msg = f"\n=== 第 {self.current_turn} 回合 ==="
+                log(turn_msg)
             
             # 回合开始时更新状态效果
-            from battle.status_manager import StatusManager
-            hero1_name = self._get_display_name(self.hero1)
-            hero2_name = self._get_display_name(self.hero2)
-            StatusManager.update_hero_status(self.hero1, hero1_name)
-            StatusManager.update_hero_status(self.hero2, hero2_name)
+            StatusManager.update_hero_status(hero1, hero1_name)
+            StatusManager.update_hero_status(hero2, hero2_name)
             
             # 即时战斗模式：双方同时行动
-            hero1_action = self._choose_action(self.hero1)
-            hero2_action = self._choose_action(self.hero2)
-            
-            # 获取显示名称
-            hero1_name = self._get_display_name(self.hero1)
-            hero2_name = self._get_display_name(self.hero2)
+            hero1_action, hero1_skills, hero1_plugin_skills = self._choose_action(hero1)
+            hero2_action, hero2_skills, hero2_plugin_skills = self._choose_action(hero2)
             
             # 检查控制状态
-            hero1_can_act = not (self.hero1.is_frozen or self.hero1.is_stunned)
-            hero2_can_act = not (self.hero2.is_frozen or self.hero2.is_stunned)
+            hero1_can_act = not (hero1.control_mask & _ACTION_BLOCKING_MASK)
+            hero2_can_act = not (hero2.control_mask & _ACTION_BLOCKING_MASK)
             
             # 英雄1行动
             if hero1_can_act:
-                self._process_hero_action(self.hero1, self.hero2, hero1_action, hero1_name, hero2_name)
-            else:
-                control_type = "冻结" if self.hero1.is_frozen else "眩晕"
+                self._process_hero_action(hero1, hero2, hero1_action, hero1_name, hero2_name,
+                                          hero1_skills, hero1_plugin_skills)
+            elif detailed:
+                control_type = "冻结" if hero1.is_frozen else "眩晕"
                 control_msg = f"{hero1_name} 处于{control_type}状态，无法行动!"
-                print(control_msg)
-                self.detailed_log.append(control_msg)
+                log(control_msg)
             
             # 英雄2行动
             if hero2_can_act:
-                self._process_hero_action(self.hero2, self.hero1, hero2_action, hero2_name, hero1_name)
-            else:
-                control_type = "冻结" if self.hero2.is_frozen else "眩晕"
+                self._process_hero_action(hero2, hero1, hero2_action, hero2_name, hero1_name,
+                                          hero2_skills, hero2_plugin_skills)
+            elif detailed:
+                control_type = "冻结" if hero2.is_frozen else "眩晕"
                 control_msg = f"{hero2_name} 处于{control_type}状态，无法行动!"
-                print(control_msg)
-                self.detailed_log.append(control_msg)
+                log(control_msg)
             
             # 回合结束处理
             self._end_of_turn()
             
             # 检查是否达到最大回合数
             if self.current_turn >= max_turns:
-                max_turns_msg = f"战斗达到最大回合数 {max_turns}，强制结束!"
-                print(max_turns_msg)
-                self.detailed_log.append(max_turns_msg)
+                if detailed:
+                    max_turns_msg = f"战斗达到最大回合数 {max_turns}，强制结束!"
+                    log(max_turns_msg)
                 
-                # 比较双方生命值，生命较少的一方生命值降为0
-                if self.hero1.health < self.hero2.health:
-                    self.hero1.health = 0
-                    end_msg = f"{self._get_display_name(self.hero1)} 生命值较少，生命值降为0"
-                elif self.hero2.health < self.hero1.health:
-                    self.hero2.health = 0
-                    end_msg = f"{self._get_display_name(self.hero2)} 生命值较少，生命值降为0"
+                # 比较双方生命值，生命较少的一方生命值降为0，相同则随机选择一方
+                tie = hero1.health == hero2.health
+                if tie:
+                    loser = hero1 if random.random() < 0.5 else hero2
                 else:
-                    # 生命值相同，随机选择一方
-                    import random
-                    if random.random() < 0.5:
-                        self.hero1.health = 0
-                        end_msg = f"双方生命值相同，随机选择 {self._get_display_name(self.hero1)} 生命值降为0"
-                    else:
-                        self.hero2.health = 0
-                        end_msg = f"双方生命值相同，随机选择 {self._get_display_name(self.hero2)} 生命值降为0"
+                    loser = hero1 if hero1.health < hero2.health else hero2
+                loser.health = 0
                 
-                print(end_msg)
-                self.detailed_log.append(end_msg)
+                if detailed:
+                    loser_name = self._get_display_name(loser)
+                    end_msg = (f"双方生命值相同，随机选择 {loser_name} 生命值降为0" if tie
+                               else f"{loser_name} 生命值较少，生命值降为0")
+                    log(end_msg)
                 break
         
+        del self.battle_log[self.current_turn:]
+        
         # 确定胜利者
-        winner = self.hero1 if self.hero1.is_alive() else self.hero2
-        loser = self.hero2 if self.hero1.is_alive() else self.hero1
+        winner = hero1 if hero1.is_alive() else hero2
+        loser = hero2 if hero1.is_alive() else hero1
         
-        battle_end_msg = f"\n战斗结束! 胜利者: {winner.name}"
-        turns_msg = f"战斗回合: {self.current_turn}"
-        print(battle_end_msg)
-        print(turns_msg)
-        self.detailed_log.append(battle_end_msg)
-        self.detailed_log.append(turns_msg)
+        if self._log_level >= LOG_WINNER_ONLY:
+            battle_end_msg = f"\n战斗结束! 胜利者: {winner.name}"
+            turns_msg = f"战斗回合: {self.current_turn}"
+            log(battle_end_msg)
+            log(turns_msg)
         
         return {
             'winner': winner.name,
@@ -148,22 +230,60 @@ class BattleSimulator:
             'detailed_log': self.detailed_log  # 返回详细战斗日志
         }
     
-
+    def run_many_battles(self, hero1: Optional[Hero] = None, hero2: Optional[Hero] = None,
+                         n_sims: int = 1000, max_turns: int = 100, seed: Optional[int] = None) -> Dict:
+        """批量模拟战斗（蒙特卡洛平衡性统计）
+        
+        使用纯数值内核并行模拟，不生成战斗日志，也不修改英雄状态。
+        仅模拟普通攻击和伤害类技能，结果用于比较胜率而非复现单场战斗。
+        
+        Args:
+            hero1: 英雄1，默认使用setup_battle设置的英雄
+            hero2: 英雄2，默认使用setup_battle设置的英雄
+            n_sims: 模拟场数
+            max_turns: 每场最大回合数
+            seed: 随机种子
+        """
+        from battle.fast_sim import pack_hero_stats, simulate_battles
+        import numpy as np
+        
+        hero1 = hero1 or self.hero1
+        hero2 = hero2 or self.hero2
+        if not hero1 or not hero2:
+            return {'wins': np.zeros(2, dtype=np.int64), 'win_rate': np.zeros(2), 'avg_turns': 0.0}
+        
+        stats = np.vstack([pack_hero_stats(hero1, hero2), pack_hero_stats(hero2, hero1)])
+        result = simulate_battles(stats, n_sims, max_turns, seed)
+        result['hero1'] = hero1.name
+        result['hero2'] = hero2.name
+        return result
+    
+    def _log(self, msg: str):
+        """记录战斗日志，仅在verbose模式下输出到控制台"""
+        self.detailed_log.append(msg)
+        if self.verbose:
+            print(msg)
+    
+    def _flush(self, msgs: List[str]):
+        """批量写入一次行动产生的日志"""
+        if not msgs:
+            return
+        self.detailed_log.extend(msgs)
+        if self.verbose:
+            sys.stdout.write("\n".join(msgs) + "\n")
     
     def _get_display_name(self, hero: Hero) -> str:
         """获取带标识符的英雄显示名称"""
-        if self.hero1 and self.hero2 and self.hero1.name == self.hero2.name:
-            if hero is self.hero1:
-                return f"{hero.name} (1)"
-            elif hero is self.hero2:
-                return f"{hero.name} (2)"
-        return hero.name
+        return self._name_map.get(id(hero), hero.name)
     
-    def _choose_action(self, hero: Hero) -> str:
-        """选择行动类型"""
+    def _choose_action(self, hero: Hero) -> Tuple[str, Set[int], List[str]]:
+        """选择行动类型
+        
+        Returns:
+            (行动类型, 可用技能下标集合, 插件技能列表)，技能列表交给_process_hero_action复用
+        """
         # 简单AI：有可用技能时70%概率使用技能
-        available_skills = [i for i, skill in enumerate(hero.skills) 
-                          if skill['current_cooldown'] == 0]
+        available_skills = hero.ready_skills
         
         # 检查是否有可用的插件技能
         available_plugin_skills = hero.get_plugin_skills()
@@ -174,222 +294,251 @@ class BattleSimulator:
             skill_probability = 0.8  # 有插件技能时80%概率使用技能
         
         if (available_skills or available_plugin_skills) and random.random() < skill_probability:
-            return 'skill'
-        return 'attack'
+            return 'skill', available_skills, available_plugin_skills
+        return 'attack', available_skills, available_plugin_skills
     
-    def _process_hero_action(self, attacker: Hero, defender: Hero, action: str, attacker_name: str, defender_name: str):
-        """处理英雄行动"""
+    def _process_hero_action(self, attacker: Hero, defender: Hero, action: str, attacker_name: str, defender_name: str,
+                             ready_skills: Set[int], available_plugin_skills: List[str]):
+        """处理英雄行动
+        
+        Args:
+            ready_skills: 本回合_choose_action已获取的可用技能下标集合
+            available_plugin_skills: 本回合_choose_action已获取的插件技能列表
+        """
+        # 低于LOG_SUMMARY时只结算行动，不构造任何日志文本
+        detailed = self._detailed
+        msgs = [] if detailed else None
+        
         # 初始化默认结果
         result = {'success': True, 'message': '行动执行成功'}
         
         if action == 'skill':
-            # 随机选择可用技能（包括插件技能）
-            available_skills = [i for i, skill in enumerate(attacker.skills) 
-                              if skill['current_cooldown'] == 0]
-            available_plugin_skills = attacker.get_plugin_skills()
+            # 随机选择可用技能（包括插件技能），按随机下标取值
+            _randrange = random.randrange
+            available_skills = sorted(ready_skills)
             
-            # 决定使用普通技能还是插件技能
-            use_plugin_skill = False
-            if available_plugin_skills and random.random() < 0.4:  # 40%概率使用插件技能
-                use_plugin_skill = True
+            # 决定使用普通技能还是插件技能：40%概率使用插件技能
+            use_plugin_skill = bool(available_plugin_skills) and random.random() < 0.4
             
-            if use_plugin_skill and available_plugin_skills:
+            if use_plugin_skill:
                 # 使用插件技能
-                skill_name = random.choice(available_plugin_skills)
+                skill_name = available_plugin_skills[_randrange(len(available_plugin_skills))]
                 result = attacker.use_plugin_skill(skill_name, defender)
                 
-                if result['success']:
-                    skill_use_msg = f"{attacker_name} 使用插件技能: {skill_name}"
-                    print(skill_use_msg)
-                    self.detailed_log.append(skill_use_msg)
-                    
-                    # 处理插件技能效果
-                    if 'message' in result:
-                        message_msg = f"  - {result['message']}"
-                        print(message_msg)
-                        self.detailed_log.append(message_msg)
-                    
-                    # 处理伤害效果
-                    if 'damage' in result:
-                        damage_msg = f"  - 造成 {result['damage']} 点伤害"
-                        print(damage_msg)
-                        self.detailed_log.append(damage_msg)
-                    elif 'heal_amount' in result:
-                        heal_msg = f"  - 恢复 {result['heal_amount']} 点生命值"
-                        print(heal_msg)
-                        self.detailed_log.append(heal_msg)
+                if result[_KEY_SUCCESS]:
+                    if detailed:
+                        skill_use_msg = f"{attacker_name} 使用插件技能: {skill_name}"
+                        msgs.append(skill_use_msg)
+                        
+                        # 处理插件技能效果
+                        if _KEY_MESSAGE in result:
+                            message_msg = f"  - {result[_KEY_MESSAGE]}"
+                            msgs.append(message_msg)
+                        
+                        # 处理伤害效果
+                        if _KEY_DAMAGE in result:
+                            damage_msg = f"  - 造成 {result[_KEY_DAMAGE]} 点伤害"
+                            msgs.append(damage_msg)
+                        elif _KEY_HEAL_AMOUNT in result:
+                            heal_msg = f"  - 恢复 {result[_KEY_HEAL_AMOUNT]} 点生命值"
+                            msgs.append(heal_msg)
                     
                     # 处理额外效果
-                    for effect in result.get('effects', []):
-                        self._process_skill_effect(effect, attacker, defender, attacker_name, defender_name)
-                else:
-                    fail_msg = f"{attacker_name} 插件技能使用失败: {result['message']}"
-                    print(fail_msg)
-                    self.detailed_log.append(fail_msg)
+                    for effect in result.get(_KEY_EFFECTS, []):
+                        self._process_skill_effect(effect, attacker, defender, attacker_name, defender_name, msgs)
+                elif detailed:
+                    fail_msg = f"{attacker_name} 插件技能使用失败: {result[_KEY_MESSAGE]}"
+                    msgs.append(fail_msg)
                     
             elif available_skills:
                 # 使用普通技能
-                skill_index = random.choice(available_skills)
+                skill_index = available_skills[_randrange(len(available_skills))]
                 result = attacker.use_skill(skill_index, defender)
                 
-                if result['success']:
-                    skill_name = result['skill_name']
-                    skill_use_msg = f"{attacker_name} 使用 {skill_name}"
-                    print(skill_use_msg)
-                    self.detailed_log.append(skill_use_msg)
+                if result[_KEY_SUCCESS]:
+                    if detailed:
+                        skill_name = result[_KEY_SKILL_NAME]
+                        skill_use_msg = f"{attacker_name} 使用 {skill_name}"
+                        msgs.append(skill_use_msg)
                     
-                    # 处理技能效果，传递显示名称
-                    for effect in result.get('effects', []):
-                        # 更新效果中的目标名称为显示名称
-                        if 'target' in effect and effect['target'] == defender.name:
-                            effect['target'] = defender_name
-                        elif 'target' in effect and effect['target'] == attacker.name:
-                            effect['target'] = attacker_name
-                        self._process_skill_effect(effect, attacker, defender, attacker_name, defender_name)
-                else:
-                    fail_msg = f"{attacker_name} 技能使用失败: {result['message']}"
-                    print(fail_msg)
-                    self.detailed_log.append(fail_msg)
+                    # 处理技能效果，效果目标在转换为效果记录时映射为显示名称
+                    target_names = self._effect_target_names.get(id(attacker))
+                    for effect in result.get(_KEY_EFFECTS, []):
+                        self._process_skill_effect(effect, attacker, defender, attacker_name, defender_name, msgs,
+                                                   target_names)
+                elif detailed:
+                    fail_msg = f"{attacker_name} 技能使用失败: {result[_KEY_MESSAGE]}"
+                    msgs.append(fail_msg)
             else:
                 # 所有技能都在冷却，使用普通攻击
-                cooldown_msg = f"{attacker_name} 所有技能冷却中，使用普通攻击"
-                print(cooldown_msg)
-                self.detailed_log.append(cooldown_msg)
                 damage_result = attacker.attack_target(defender)
-                damage_msg = f"{attacker_name} 对 {defender_name} 造成 {damage_result['damage']} 点伤害"
-                print(damage_msg)
-                self.detailed_log.append(damage_msg)
-                
-                # 检查是否有被动技能触发信息
-                if 'extra_effects' in damage_result:
-                    for effect in damage_result['extra_effects']:
-                        if effect.get('type') == 'passive_trigger' and effect.get('passive_name') == 'unyielding_will':
-                            passive_msg = f"{defender_name} 的不屈意志触发! 复活并恢复{effect.get('revive_health', 0)}点生命值，攻击力提升{effect.get('attack_boost_percent', 30)}%持续10秒"
-                            print(passive_msg)
-                            self.detailed_log.append(passive_msg)
+                if detailed:
+                    cooldown_msg = f"{attacker_name} 所有技能冷却中，使用普通攻击"
+                    msgs.append(cooldown_msg)
+                    damage_msg = f"{attacker_name} 对 {defender_name} 造成 {damage_result[_KEY_DAMAGE]} 点伤害"
+                    msgs.append(damage_msg)
+                    self._log_passive_triggers(damage_result, defender_name, msgs)
         else:
             # 普通攻击
-            attack_msg = f"{attacker_name} 使用普通攻击"
-            print(attack_msg)
-            self.detailed_log.append(attack_msg)
             damage_result = attacker.attack_target(defender)
-            damage_msg = f"{attacker_name} 对 {defender_name} 造成 {damage_result['damage']} 点伤害"
-            print(damage_msg)
-            self.detailed_log.append(damage_msg)
-            
-            # 检查是否有被动技能触发信息
-            if 'extra_effects' in damage_result:
-                for effect in damage_result['extra_effects']:
-                    if effect.get('type') == 'passive_trigger' and effect.get('passive_name') == 'unyielding_will':
-                        passive_msg = f"{defender_name} 的不屈意志触发! 复活并恢复{effect.get('revive_health', 0)}点生命值，攻击力提升{effect.get('attack_boost_percent', 30)}%持续10秒"
-                        print(passive_msg)
-                        self.detailed_log.append(passive_msg)
-        
-        # 显示目标状态
-        status_msg = f"{defender_name} 剩余生命: {defender.health}/{defender.max_health}"
-        print(status_msg)
-        self.detailed_log.append(status_msg)
+            if detailed:
+                attack_msg = f"{attacker_name} 使用普通攻击"
+                msgs.append(attack_msg)
+                damage_msg = f"{attacker_name} 对 {defender_name} 造成 {damage_result[_KEY_DAMAGE]} 点伤害"
+                msgs.append(damage_msg)
+                self._log_passive_triggers(damage_result, defender_name, msgs)
+        
+        if detailed:
+            # 显示目标状态
+            status_msg = f"{defender_name} 剩余生命: {defender.health}/{defender.max_health}"
+            msgs.append(status_msg)
+            self._flush(msgs)
     
-    def _process_skill_effect(self, effect: Dict, attacker: Hero, defender: Hero, attacker_name: str, defender_name: str):
-        """处理技能效果"""
-        from battle.status_manager import StatusManager
-        
-        effect_type = effect.get('type')
-        
-        if effect_type == 'attack':
-            damage = effect.get('damage', 0)
-            is_crit = effect.get('is_crit', False)
-            crit_text = " (暴击!)" if is_crit else ""
-            damage_msg = f"  - 造成 {damage} 点伤害{crit_text}"
-            print(damage_msg)
-            self.detailed_log.append(damage_msg)
-            
-        elif effect_type == 'true_damage':
-            damage = effect.get('damage', 0)
-            true_damage_msg = f"  - 造成 {damage} 点真实伤害（无视防御）"
-            print(true_damage_msg)
-            self.detailed_log.append(true_damage_msg)
-            
-        elif effect_type == 'control':
-            subtype = effect.get('subtype', 'stun')
-            duration = effect.get('duration', 2)
-            target_name = effect.get('target', defender_name)
-            
-            target = defender if target_name == defender_name else attacker
-            target_display_name = defender_name if target_name == defender_name else attacker_name
-            StatusManager.apply_status_effect(target, subtype, duration, target_display_name)
-            control_msg = f"  - {target_display_name} 被施加 {subtype} 效果，持续 {duration} 回合!"
-            print(control_msg)
-            self.detailed_log.append(control_msg)
-            
-        elif effect_type == 'freeze':
-            duration = effect.get('duration', 2)
-            target_name = effect.get('target', defender_name)
-            
-            target = defender if target_name == defender_name else attacker
-            target_display_name = defender_name if target_name == defender_name else attacker_name
-            StatusManager.apply_status_effect(target, 'freeze', duration, target_display_name)
-            freeze_msg = f"  - {target_display_name} 被施加 freeze 效果，持续 {duration} 回合!"
-            print(freeze_msg)
-            self.detailed_log.append(freeze_msg)
-            
-        elif effect_type == 'buff':
-            subtype = effect.get('subtype', 'attack_boost')
-            amount = effect.get('amount', 0)
-            target_name = effect.get('target', attacker_name)
-            
-            target = attacker if target_name == attacker_name else defender
-            target_display_name = attacker_name if target_name == attacker_name else defender_name
-            buff_msg = f"  - {target_display_name} 获得 {subtype} 效果，数值: {amount}"
-            print(buff_msg)
-            self.detailed_log.append(buff_msg)
-            
-        elif effect_type == 'resist':
-            skill_name = effect.get('skill_name', '技能')
-            effect_type = effect.get('effect_type', '效果')
-            target_name = effect.get('target', defender_name)
-            
-            target_display_name = defender_name if target_name == defender_name else attacker_name
-            resist_msg = f"  - {target_display_name} 抵抗了 {skill_name} 的 {effect_type} 效果!"
-            print(resist_msg)
-            self.detailed_log.append(resist_msg)
+    def _log_passive_triggers(self, damage_result: Dict, defender_name: str, msgs: List[str]):
+        """记录普通攻击结果中的被动技能触发信息"""
+        extra_effects = damage_result.get(_KEY_EXTRA_EFFECTS)
+        if not extra_effects:
+            return
+        for effect in extra_effects:
+            if effect.get(_KEY_TYPE) == _PASSIVE_TRIGGER and effect.get(_KEY_PASSIVE_NAME) == _UNYIELDING_WILL:
+                passive_msg = f"{defender_name} 的不屈意志触发! 复活并恢复{effect.get(_KEY_REVIVE_HEALTH, 0)}点生命值，攻击力提升{effect.get(_KEY_ATTACK_BOOST_PERCENT, 30)}%持续10秒"
+                msgs.append(passive_msg)
+    
+    def _process_skill_effect(self, effect, attacker: Hero, defender: Hero, attacker_name: str, defender_name: str,
+                              msgs: List[str], target_names: Optional[Dict[str, str]] = None):
+        """处理技能效果，产生的日志追加到调用方的msgs缓冲中
+        
+        Args:
+            effect: 效果记录（battle.effects）或效果字典，字典会先转换为效果记录
+            msgs: 日志缓冲，为None时不记录日志，只处理影响战斗状态的效果
+            target_names: 英雄名称 -> 显示名称，用于转换效果字典中的目标
+        """
+        if _simulator_fast is not None:
+            _simulator_fast.process_skill_effect(self, effect, attacker, defender, attacker_name, defender_name, msgs,
+                                                 target_names)
+            return
+        
+        effect = effect_from_dict(effect, target_names)
+        if effect is None:
+            return
+        
+        if msgs is None:
+            handler = self._STATUS_EFFECT_HANDLERS.get(type(effect))
+        else:
+            handler = self._EFFECT_HANDLERS.get(type(effect))
+        if handler:
+            handler(self, effect, attacker, defender, attacker_name, defender_name, msgs)
+    
+    @staticmethod
+    def _resolve_target(target_name: Optional[str], primary: Hero, primary_name: str,
+                        other: Hero, other_name: str) -> Tuple[Hero, str]:
+        """解析效果目标，未指定目标或目标为primary_name时返回primary，否则返回other"""
+        if target_name is None or target_name == primary_name:
+            return primary, primary_name
+        return other, other_name
+    
+    def _handle_attack_effect(self, effect: AttackEffect, attacker: Hero, defender: Hero,
+                              attacker_name: str, defender_name: str, msgs: List[str]):
+        """伤害效果"""
+        msgs.append(_MSG_ATTACK(effect.damage, _CRIT_TEXT if effect.is_crit else ""))
+    
+    def _handle_true_damage_effect(self, effect: TrueDamageEffect, attacker: Hero, defender: Hero,
+                                   attacker_name: str, defender_name: str, msgs: List[str]):
+        """真实伤害效果"""
+        msgs.append(_MSG_TRUE_DAMAGE(effect.damage))
+    
+    def _handle_control_effect(self, effect: ControlEffect, attacker: Hero, defender: Hero,
+                               attacker_name: str, defender_name: str, msgs: List[str]):
+        """控制效果"""
+        target, target_display_name = self._resolve_target(effect.target, defender, defender_name,
+                                                           attacker, attacker_name)
+        StatusManager.apply_status_effect(target, effect.subtype, effect.duration, target_display_name)
+        if msgs is not None:
+            msgs.append(_MSG_STATUS_APPLIED(target_display_name, effect.subtype, effect.duration))
+    
+    def _handle_freeze_effect(self, effect: FreezeEffect, attacker: Hero, defender: Hero,
+                              attacker_name: str, defender_name: str, msgs: List[str]):
+        """冰冻效果"""
+        target, target_display_name = self._resolve_target(effect.target, defender, defender_name,
+                                                           attacker, attacker_name)
+        StatusManager.apply_status_effect(target, _FREEZE, effect.duration, target_display_name)
+        if msgs is not None:
+            msgs.append(_MSG_STATUS_APPLIED(target_display_name, _FREEZE, effect.duration))
+    
+    def _handle_buff_effect(self, effect: BuffEffect, attacker: Hero, defender: Hero,
+                            attacker_name: str, defender_name: str, msgs: List[str]):
+        """增益效果"""
+        _, target_display_name = self._resolve_target(effect.target, attacker, attacker_name,
+                                                      defender, defender_name)
+        msgs.append(_MSG_BUFF(target_display_name, effect.subtype, effect.amount))
+    
+    def _handle_resist_effect(self, effect: ResistEffect, attacker: Hero, defender: Hero,
+                              attacker_name: str, defender_name: str, msgs: List[str]):
+        """抵抗效果"""
+        _, target_display_name = self._resolve_target(effect.target, defender, defender_name,
+                                                      attacker, attacker_name)
+        msgs.append(_MSG_RESIST(target_display_name, effect.skill_name, effect.effect_type))
+    
+    # 效果记录类型 -> 处理方法
+    _EFFECT_HANDLERS = {
+        AttackEffect: _handle_attack_effect,
+        TrueDamageEffect: _handle_true_damage_effect,
+        ControlEffect: _handle_control_effect,
+        FreezeEffect: _handle_freeze_effect,
+        BuffEffect: _handle_buff_effect,
+        ResistEffect: _handle_resist_effect,
+    }
+    
+    # 不记录日志时只需处理会改变战斗状态的效果
+    _STATUS_EFFECT_HANDLERS = {
+        ControlEffect: _handle_control_effect,
+        FreezeEffect: _handle_freeze_effect,
+    }
     
     def _end_of_turn(self):
         """回合结束处理"""
-        turn_end_msg = f"=== 回合 {self.current_turn} 结束 ==="
-        print(turn_end_msg)
-        self.detailed_log.append(turn_end_msg)
+        if _simulator_fast is not None:
+            _simulator_fast.end_of_turn(self)
+            return
         
         # 减少技能冷却
-        for hero in [self.hero1, self.hero2]:
-            for skill in hero.skills:
-                if skill['current_cooldown'] > 0:
-                    skill['current_cooldown'] -= 1
-        
-        # 处理状态效果
-        from battle.status_manager import StatusManager
-        for hero in [self.hero1, self.hero2]:
-            active_effects = StatusManager.get_active_effects(hero.name)
-            if active_effects:
-                effects_msg = f"{hero.name} 的状态效果:"
-                print(effects_msg)
-                self.detailed_log.append(effects_msg)
-                for effect in active_effects:
-                    remaining = effect['duration'] - 1
-                    if remaining > 0:
-                        effect_msg = f"  - {effect['type']}: 剩余 {remaining} 回合"
-                        print(effect_msg)
-                        self.detailed_log.append(effect_msg)
-                    else:
-                        end_msg = f"  - {effect['type']}: 效果结束"
-                        print(end_msg)
-                        self.detailed_log.append(end_msg)
-        
-        # 记录回合状态
-        self.battle_log.append({
-            'turn': self.current_turn,
-            'hero1_health': self.hero1.health,
-            'hero2_health': self.hero2.health,
-            'hero1_effects': StatusManager.get_active_effects(self.hero1.name),
-            'hero2_effects': StatusManager.get_active_effects(self.hero2.name)
-        })
\ No newline at end of file
+        self.hero1.tick_cooldowns()
+        self.hero2.tick_cooldowns()
+        
+        # 处理状态效果（没有任何状态效果的英雄跳过查询），结果同时用于日志和回合记录
+        hero1, hero2 = self.hero1, self.hero2
+        hero1_effects = StatusManager.get_active_effects(hero1) if StatusManager.has_active_effects(hero1) else []
+        hero2_effects = StatusManager.get_active_effects(hero2) if StatusManager.has_active_effects(hero2) else []
+        
+        if self._detailed:
+            msgs = []
+            turn_end_msg = f"=== 回合 {self.current_turn} 结束 ==="
+            msgs.append(turn_end_msg)
+            
+            for hero_name, active_effects in ((self._hero1_display, hero1_effects),
+                                              (self._hero2_display, hero2_effects)):
+                if active_effects:
+                    effects_msg = f"{hero_name} 的状态效果:"
+                    msgs.append(effects_msg)
+                    for effect in active_effects:
+                        remaining = effect[_KEY_DURATION] - 1
+                        if remaining > 0:
+                            effect_msg = f"  - {effect[_KEY_TYPE]}: 剩余 {remaining} 回合"
+                            msgs.append(effect_msg)
+                        else:
+                            end_msg = f"  - {effect[_KEY_TYPE]}: 效果结束"
+                            msgs.append(end_msg)
+            
+            self._flush(msgs)
+        
+        self._record_turn(hero1_effects, hero2_effects)
+    
+    def _record_turn(self, hero1_effects: List[Dict], hero2_effects: List[Dict]):
+        """记录回合状态"""
+        turn = self.current_turn
+        self.battle_log[turn - 1] = TurnRecord(turn, self.hero1.health, self.hero2.health,
+                                               hero1_effects, hero2_effects)
+    
+    def battle_log_dicts(self) -> List[Dict]:
+        """以字典形式返回回合记录（兼容旧的battle_log格式）"""
+        return [record._asdict() for record in self.battle_log]
\ No newline at end of file
@@ -5,15 +5,82 @@
 提供强大的技能自定义功能，支持多种效果组合和条件触发
 """
 
+import functools
 import json
+import logging
 import os
 import random
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, asdict
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, fields
 from enum import Enum
 
+# 技能插件配置目录（相对项目根目录），可通过环境变量BATTLE_PLUGINS_DIR指定其他目录
+PLUGINS_DIR = Path(os.environ.get("BATTLE_PLUGINS_DIR", Path(__file__).resolve().parent.parent / "config" / "plugins"))
 
-class SkillType(Enum):
+# 技能文件后缀
+_SKILL_FILE_SUFFIX = ".json"
+
+# 尝试导入orjson加速技能文件读写，未安装时使用标准库json（输出格式一致）
+ORJSON_ENABLED = False
+try:
+    import orjson
+    ORJSON_ENABLED = True
+except ImportError:
+    pass
+
+
+def _read_json(filepath: str) -> Any:
+    """读取JSON文件"""
+    if ORJSON_ENABLED:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _target_file_mode(filepath: Path) -> int:
+    """写入文件应使用的权限：已存在时沿用原权限，否则为按当前umask创建新文件时的权限"""
+    try:
+        return stat.S_IMODE(os.stat(filepath).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _write_json(filepath: str, data: Any):
+    """写入JSON文件（UTF-8，缩进2格，整数键转为字符串）
+    
+    先在内存中序列化，一次写入同目录下的唯一临时文件后用os.replace替换目标文件，
+    写入中断时不会留下半个文件，并发保存同一文件时也不会互相覆盖临时文件。
+    """
+    if ORJSON_ENABLED:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        content = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    
+    filepath = Path(filepath)
+    tmp_file = tempfile.NamedTemporaryFile(dir=filepath.parent, prefix=filepath.name + ".",
+                                           suffix=".tmp", delete=False)
+    tmp_path = Path(tmp_file.name)
+    try:
+        with tmp_file:
+            tmp_file.write(content)
+        # 临时文件创建时权限为0600，替换前改为目标文件原有权限（新文件按umask计算）
+        os.chmod(tmp_path, _target_file_mode(filepath))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        # 写入失败时清理临时文件
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class SkillType(str, Enum):
     """技能类型枚举"""
     DAMAGE = "damage"        # 伤害类技能
     HEAL = "heal"           # 治疗类技能  
@@ -25,7 +92,7 @@ class SkillType(Enum):
     CUSTOM = "custom"       # 自定义类技能
 
 
-class DamageType(Enum):
+class DamageType(str, Enum):
     """伤害类型枚举"""
     PHYSICAL = "physical"   # 物理伤害
     MAGICAL = "magical"     # 魔法伤害
@@ -38,7 +105,7 @@ class DamageType(Enum):
     DARK = "dark"           # 暗影伤害
 
 
-class TargetType(Enum):
+class TargetType(str, Enum):
     """目标类型枚举"""
     SELF = "self"               # 自身
     SINGLE_ENEMY = "single_enemy"       # 单个敌人
@@ -49,7 +116,7 @@ class TargetType(Enum):
     RANDOM_ALLY = "random_ally"         # 随机友方
 
 
-class BuffType(Enum):
+class BuffType(str, Enum):
     """增益类型枚举"""
     ATTACK = "attack"           # 攻击力
     DEFENSE = "defense"         # 防御力
@@ -62,7 +129,7 @@ class BuffType(Enum):
     SHIELD = "shield"           # 护盾
 
 
-class ControlType(Enum):
+class ControlType(str, Enum):
     """控制类型枚举"""
     STUN = "stun"               # 眩晕
     FREEZE = "freeze"           # 冰冻
@@ -74,7 +141,7 @@ class ControlType(Enum):
     SLEEP = "sleep"             # 睡眠
 
 
-class StatusType(Enum):
+class StatusType(str, Enum):
     """状态类型枚举"""
     BURN = "burn"               # 燃烧
     POISON = "poison"           # 中毒
@@ -83,7 +150,7 @@ class StatusType(Enum):
     REGENERATION = "regeneration" # 再生
 
 
-class EffectTrigger(Enum):
+class EffectTrigger(str, Enum):
     """效果触发时机枚举"""
     ON_CAST = "on_cast"         # 施放时
     ON_HIT = "on_hit"           # 命中时
@@ -95,111 +162,240 @@ class EffectTrigger(Enum):
     ON_TURN_END = "on_turn_end"       # 回合结束时
 
 
-@dataclass
+# 常用枚举值，模块加载时解析并驻留一次，避免每次构造时的属性查找
+_ON_CAST = sys.intern(EffectTrigger.ON_CAST.value)
+_ON_HIT = sys.intern(EffectTrigger.ON_HIT.value)
+_PHYSICAL = sys.intern(DamageType.PHYSICAL.value)
+_FIRE = sys.intern(DamageType.FIRE.value)
+_BUFF_ATTACK = sys.intern(BuffType.ATTACK.value)
+_BUFF_DEFENSE = sys.intern(BuffType.DEFENSE.value)
+_STUN = sys.intern(ControlType.STUN.value)
+_SINGLE_ENEMY = sys.intern(TargetType.SINGLE_ENEMY.value)
+_ALL_ENEMIES = sys.intern(TargetType.ALL_ENEMIES.value)
+_ALL_ALLIES = sys.intern(TargetType.ALL_ALLIES.value)
+
+# 取值为枚举字符串的技能/效果字段，从文件加载后驻留，相同取值共享同一字符串对象
+_INTERNED_FIELDS = frozenset({
+    "type", "trigger", "damage_type", "buff_type", "debuff_type", "control_type", "status_type",
+    "target_type", "skill_type",
+})
+
+
+def _intern_fields(data: Dict):
+    """原地驻留字典中_INTERNED_FIELDS字段的字符串取值"""
+    for key in data.keys() & _INTERNED_FIELDS:
+        value = data[key]
+        if isinstance(value, str):
+            data[key] = sys.intern(value)
+
+
+# 效果数据类参数：实例创建后不再修改；Python 3.10+ 使用__slots__，去掉实例__dict__
+_EFFECT_DATACLASS_OPTIONS = {'frozen': True}
+if sys.version_info >= (3, 10):
+    _EFFECT_DATACLASS_OPTIONS['slots'] = True
+
+
+def _with_to_dict(cls):
+    """为效果数据类生成专用的to_dict方法
+    
+    效果字段均为标量，直接按字段构造字典即可，避免dataclasses.asdict逐字段递归深拷贝。
+    类属性type排在最前面。需放在@dataclass之上，新增的效果类同样使用该装饰器。
+    """
+    items = ', '.join(["'type': self.type"] + [f"{f.name!r}: self.{f.name}" for f in fields(cls)])
+    namespace = {}
+    exec(f"def to_dict(self):\n    return {{{items}}}\n", {}, namespace)
+    to_dict = namespace['to_dict']
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    to_dict.__doc__ = "转换为字典"
+    cls.to_dict = to_dict
+    return cls
+
+
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class SkillEffect:
     """技能效果基类"""
-    type: str = ""              # 效果类型
-    trigger: str = EffectTrigger.ON_CAST.value  # 触发时机
+    type: ClassVar[str] = ""    # 效果类型（类属性，不是数据类字段）
+    trigger: str = _ON_CAST  # 触发时机
     probability: float = 1.0    # 触发概率 (0.0-1.0)
     duration: int = 0           # 持续时间(回合数)
-    
-    def to_dict(self) -> Dict:
-        """转换为字典"""
-        return asdict(self)
 
 
-@dataclass
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class DamageEffect(SkillEffect):
     """伤害效果"""
-    damage_type: str = DamageType.PHYSICAL.value
+    type: ClassVar[str] = "damage"
+    damage_type: str = _PHYSICAL
     base_damage: int = 0                    # 基础伤害值
     damage_multiplier: float = 1.0          # 伤害系数
     ignore_defense: bool = False            # 是否无视防御
     can_crit: bool = True                   # 是否可以暴击
-    
-    def __post_init__(self):
-        self.type = "damage"
 
 
-@dataclass
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class HealEffect(SkillEffect):
     """治疗效果"""
+    type: ClassVar[str] = "heal"
     base_heal: int = 0                      # 基础治疗值
     heal_multiplier: float = 1.0            # 治疗系数
     is_percentage: bool = False             # 是否按百分比治疗
-    
-    def __post_init__(self):
-        self.type = "heal"
 
 
-@dataclass
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class BuffEffect(SkillEffect):
     """增益效果"""
-    buff_type: str = BuffType.ATTACK.value
+    type: ClassVar[str] = "buff"
+    buff_type: str = _BUFF_ATTACK
     value: float = 0.0                      # 增益数值
     is_percentage: bool = True              # 是否为百分比增益
-    
-    def __post_init__(self):
-        self.type = "buff"
 
 
-@dataclass
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class DebuffEffect(SkillEffect):
     """减益效果"""
-    debuff_type: str = BuffType.ATTACK.value
+    type: ClassVar[str] = "debuff"
+    debuff_type: str = _BUFF_ATTACK
     value: float = 0.0                      # 减益数值
     is_percentage: bool = True              # 是否为百分比减益
-    
-    def __post_init__(self):
-        self.type = "debuff"
 
 
-@dataclass
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class ControlEffect(SkillEffect):
     """控制效果"""
-    control_type: str = ControlType.STUN.value
-    
-    def __post_init__(self):
-        self.type = "control"
+    type: ClassVar[str] = "control"
+    control_type: str = _STUN
 
 
-@dataclass
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class ShieldEffect(SkillEffect):
     """护盾效果"""
+    type: ClassVar[str] = "shield"
     shield_amount: int = 0                  # 护盾值
     is_percentage: bool = False             # 是否按百分比计算
-    
-    def __post_init__(self):
-        self.type = "shield"
 
 
-@dataclass
+@_with_to_dict
+@dataclass(**_EFFECT_DATACLASS_OPTIONS)
 class StatusEffect(SkillEffect):
     """状态效果"""
+    type: ClassVar[str] = "status"
     status_type: str = ""                   # 状态类型
     value: float = 0.0                      # 状态数值
-    
-    def __post_init__(self):
-        self.type = "status"
+
+
+# 效果类型 -> 效果数据类
+_EFFECT_CLASSES = {
+    "damage": DamageEffect,
+    "heal": HealEffect,
+    "buff": BuffEffect,
+    "debuff": DebuffEffect,
+    "control": ControlEffect,
+    "shield": ShieldEffect,
+    "status": StatusEffect,
+}
+
+# 效果类型 -> 整数编码（battle.effect_table中的type_code）
+EFFECT_TYPE_CODES = {effect_type: code for code, effect_type in enumerate(_EFFECT_CLASSES)}
+
+# 各效果数据类按字段顺序的默认值（type为效果类自身的类型，排在最前），模块加载时计算一次
+_EFFECT_DEFAULTS = {
+    effect_class: {"type": effect_class.type, **{f.name: f.default for f in fields(effect_class)}}
+    for effect_class in _EFFECT_CLASSES.values()
+}
+
+
+def _compact_effect(effect: Dict) -> Dict:
+    """去掉效果字典中等于默认值的字段（type始终保留），用于缩小保存的技能文件"""
+    effect_class = _EFFECT_CLASSES.get(effect.get("type"))
+    if effect_class is None:
+        return effect
+    defaults = _EFFECT_DEFAULTS[effect_class]
+    # 同时比较类型，避免1与True、0与0.0等相等值被当作默认值省略
+    return {
+        key: value for key, value in effect.items()
+        if key == "type" or key not in defaults
+        or not (value == defaults[key] and type(value) is type(defaults[key]))
+    }
+
+
+def _expand_effect(effect: Dict) -> Dict:
+    """为保存时省略的字段补回默认值（_compact_effect的逆过程，保留额外的键）"""
+    effect_class = _EFFECT_CLASSES.get(effect.get("type"))
+    if effect_class is None:
+        return effect
+    return {**_EFFECT_DEFAULTS[effect_class], **effect}
+
+
+def _merge_effect_fields(effect_class, effect_data: Dict) -> Dict:
+    """合并效果数据与默认值，按字段顺序返回效果类的全部字段（忽略多余的键）"""
+    defaults = _EFFECT_DEFAULTS[effect_class]
+    merged = {**defaults, **effect_data}
+    return {name: merged[name] for name in defaults}
+
+
+# 技能模板原型，模块加载时构造一次
+_SKILL_TEMPLATE = {
+    "name": "技能名称",
+    "description": "技能描述",
+    "skill_type": "damage",  # damage/heal/buff/debuff/control/summon/transform/custom
+    "cooldown": 3,
+    "mana_cost": 0,
+    "target_type": "single_enemy",  # self/single_enemy/single_ally/all_enemies/all_allies/random_enemy/random_ally
+    "level_values": {
+        1: 0.2,
+        2: 0.3, 
+        3: 0.4,
+        4: 0.5,
+        5: 0.6
+    },
+    "effects": [
+        # 效果列表，每个效果包含:
+        # {
+        #     "type": "damage",  # damage/heal/buff/debuff/control/shield/status
+        #     "trigger": "on_cast",  # on_cast/on_hit/on_crit/on_kill/on_take_damage/on_low_health/on_turn_start/on_turn_end
+        #     "probability": 1.0,  # 触发概率 (0.0-1.0)
+        #     "duration": 0,       # 持续时间(回合数)
+        #     # 其他效果特定参数...
+        # }
+    ]
+}
+_SKILL_TEMPLATE_VIEW = MappingProxyType(_SKILL_TEMPLATE)
 
 
 class SkillEditor:
     """技能编辑器类"""
     
-    def __init__(self, config_path: str = None):
-        """初始化技能编辑器"""
-        self.config_path = config_path or "/Users/diaoyuzhe/Desktop/模拟战斗/config/plugins/技能编辑器.json"
-        self.config = self._load_config()
+    def __init__(self, config_path: str = None, plugins_dir: str = None):
+        """初始化技能编辑器
+        
+        Args:
+            config_path: 编辑器配置文件路径，默认为插件目录下的技能编辑器.json
+            plugins_dir: 技能文件目录，默认为PLUGINS_DIR
+        """
+        self.logger = logging.getLogger(__name__)
+        self.plugins_dir = Path(plugins_dir) if plugins_dir else PLUGINS_DIR
+        self.config_path = Path(config_path) if config_path else self.plugins_dir / "技能编辑器.json"
+        self._listing_cache: Optional[tuple] = None  # (目录mtime_ns, 技能文件列表)
         
+    @functools.cached_property
+    def config(self) -> Dict:
+        """编辑器配置，首次访问时才读取配置文件"""
+        return self._load_config()
+    
     def _load_config(self) -> Dict:
         """加载配置文件"""
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            if self.config_path.exists():
+                return _read_json(self.config_path)
             return {}
         except Exception as e:
-            print(f"加载技能编辑器配置失败: {e}")
+            self.logger.warning("加载技能编辑器配置失败: %s", e)
             return {}
     
     def create_custom_skill(self, skill_data: Dict) -> Dict:
@@ -218,170 +414,155 @@ class SkillEditor:
             "skill_type": skill_data.get("skill_type", "custom"),
             "cooldown": skill_data.get("cooldown", 3),
             "mana_cost": skill_data.get("mana_cost", 0),
-            "target_type": skill_data.get("target_type", TargetType.SINGLE_ENEMY.value),
+            "target_type": skill_data.get("target_type", _SINGLE_ENEMY),
             "level_values": skill_data.get("level_values", {1: 0.2, 2: 0.3, 3: 0.4, 4: 0.5, 5: 0.6}),
             "effects": []
         }
         
-        # 添加效果
+        # 添加效果（直接生成效果字典，不经过效果对象）
         effects = skill_data.get("effects", [])
         for effect_data in effects:
-            effect = self._create_effect(effect_data)
+            effect = self._normalize_effect(effect_data)
             if effect:
-                skill_config["effects"].append(effect.to_dict())
+                skill_config["effects"].append(effect)
         
         return skill_config
     
+    def to_table(self, effects: List[Dict]) -> 'SkillEffectTable':
+        """将效果数据列表转换为结构化数组形式的效果表，用于大规模技能库的批量分析
+        
+        Args:
+            effects: 效果数据列表，缺省字段使用效果类的默认值，未知类型的效果被忽略
+        """
+        from battle.effect_table import SkillEffectTable
+        normalized = [self._normalize_effect(effect_data) for effect_data in effects]
+        return SkillEffectTable.from_effects([effect for effect in normalized if effect])
+    
+    def _normalize_effect(self, effect_data: Dict) -> Optional[Dict]:
+        """将效果数据规范化为完整的效果字典
+        
+        结果与 _create_effect(effect_data).to_dict() 相同，但不创建效果对象。
+        """
+        effect_class = _EFFECT_CLASSES.get(effect_data.get("type"))
+        if effect_class is None:
+            return None
+        
+        return _merge_effect_fields(effect_class, effect_data)
+    
     def _create_effect(self, effect_data: Dict) -> Optional[SkillEffect]:
         """创建技能效果对象"""
-        effect_type = effect_data.get("type")
+        effect_class = _EFFECT_CLASSES.get(effect_data.get("type"))
+        if effect_class is None:
+            return None
         
-        if effect_type == "damage":
-            return DamageEffect(
-                trigger=effect_data.get("trigger", EffectTrigger.ON_CAST.value),
-                probability=effect_data.get("probability", 1.0),
-                duration=effect_data.get("duration", 0),
-                damage_type=effect_data.get("damage_type", DamageType.PHYSICAL.value),
-                base_damage=effect_data.get("base_damage", 0),
-                damage_multiplier=effect_data.get("damage_multiplier", 1.0),
-                ignore_defense=effect_data.get("ignore_defense", False),
-                can_crit=effect_data.get("can_crit", True)
-            )
-            
-        elif effect_type == "heal":
-            return HealEffect(
-                trigger=effect_data.get("trigger", EffectTrigger.ON_CAST.value),
-                probability=effect_data.get("probability", 1.0),
-                duration=effect_data.get("duration", 0),
-                base_heal=effect_data.get("base_heal", 0),
-                heal_multiplier=effect_data.get("heal_multiplier", 1.0),
-                is_percentage=effect_data.get("is_percentage", False)
-            )
-            
-        elif effect_type == "buff":
-            return BuffEffect(
-                trigger=effect_data.get("trigger", EffectTrigger.ON_CAST.value),
-                probability=effect_data.get("probability", 1.0),
-                duration=effect_data.get("duration", 0),
-                buff_type=effect_data.get("buff_type", BuffType.ATTACK.value),
-                value=effect_data.get("value", 0.0),
-                is_percentage=effect_data.get("is_percentage", True)
-            )
-            
-        elif effect_type == "debuff":
-            return DebuffEffect(
-                trigger=effect_data.get("trigger", EffectTrigger.ON_CAST.value),
-                probability=effect_data.get("probability", 1.0),
-                duration=effect_data.get("duration", 0),
-                debuff_type=effect_data.get("debuff_type", BuffType.ATTACK.value),
-                value=effect_data.get("value", 0.0),
-                is_percentage=effect_data.get("is_percentage", True)
-            )
-            
-        elif effect_type == "control":
-            return ControlEffect(
-                trigger=effect_data.get("trigger", EffectTrigger.ON_CAST.value),
-                probability=effect_data.get("probability", 1.0),
-                duration=effect_data.get("duration", 0),
-                control_type=effect_data.get("control_type", ControlType.STUN.value)
-            )
-            
-        elif effect_type == "shield":
-            return ShieldEffect(
-                trigger=effect_data.get("trigger", EffectTrigger.ON_CAST.value),
-                probability=effect_data.get("probability", 1.0),
-                duration=effect_data.get("duration", 0),
-                shield_amount=effect_data.get("shield_amount", 0),
-                is_percentage=effect_data.get("is_percentage", False)
-            )
-            
-        elif effect_type == "status":
-            return StatusEffect(
-                trigger=effect_data.get("trigger", EffectTrigger.ON_CAST.value),
-                probability=effect_data.get("probability", 1.0),
-                duration=effect_data.get("duration", 0),
-                status_type=effect_data.get("status_type", ""),
-                value=effect_data.get("value", 0.0)
-            )
-            
-        return None
+        # 未提供的参数使用数据类字段的默认值；type是类属性，不作为构造参数
+        kwargs = _merge_effect_fields(effect_class, effect_data)
+        del kwargs["type"]
+        return effect_class(**kwargs)
     
     def save_skill_to_file(self, skill_config: Dict, filename: str) -> bool:
         """保存技能配置到文件"""
-        try:
-            plugins_dir = "/Users/diaoyuzhe/Desktop/模拟战斗/config/plugins"
-            os.makedirs(plugins_dir, exist_ok=True)
-            
-            filepath = os.path.join(plugins_dir, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(skill_config, f, ensure_ascii=False, indent=2)
-            
-            print(f"技能已保存到: {filepath}")
-            return True
+        return self._save_skills_bulk([(skill_config, filename)])
+    
+    def _save_skills_bulk(self, skills: List[Tuple[Dict, str]]) -> bool:
+        """批量保存技能配置，技能目录只创建一次
+        
+        Args:
+            skills: [(技能配置, 文件名), ...]
             
+        Returns:
+            是否全部保存成功
+        """
+        try:
+            self.plugins_dir.mkdir(parents=True, exist_ok=True)
         except Exception as e:
-            print(f"保存技能失败: {e}")
+            self.logger.warning("保存技能失败: %s", e)
             return False
+        
+        success = True
+        for skill_config, filename in skills:
+            filepath = self.plugins_dir / filename
+            try:
+                _write_json(filepath, self._to_file_format(skill_config))
+                print(f"技能已保存到: {filepath}")
+            except Exception as e:
+                self.logger.warning("保存技能失败: %s", e)
+                success = False
+        return success
+    
+    @staticmethod
+    def _to_file_format(skill_config: Dict) -> Dict:
+        """转换为技能文件的保存格式（不修改原配置）"""
+        # 效果中等于默认值的字段不写入文件，加载时补回
+        effects = skill_config.get('effects')
+        if isinstance(effects, list):
+            skill_config = {**skill_config, 'effects': [
+                _compact_effect(effect) if isinstance(effect, dict) else effect for effect in effects
+            ]}
+        # level_values以[等级, 数值]列表保存，避免JSON将整数键转为字符串
+        level_values = skill_config.get('level_values')
+        if isinstance(level_values, dict):
+            skill_config = {**skill_config, 'level_values': list(level_values.items())}
+        return skill_config
     
     def load_skill_from_file(self, filename: str) -> Optional[Dict]:
         """从文件加载技能配置"""
         try:
-            filepath = os.path.join("/Users/diaoyuzhe/Desktop/模拟战斗/config/plugins", filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    skill_data = json.load(f)
-                    
-                    # 转换level_values中的字符串键为整数键
-                    if 'level_values' in skill_data and isinstance(skill_data['level_values'], dict):
-                        level_values = {}
-                        for key, value in skill_data['level_values'].items():
-                            try:
-                                level_values[int(key)] = value
-                            except (ValueError, TypeError):
-                                level_values[key] = value
-                        skill_data['level_values'] = level_values
-                    
-                    return skill_data
+            filepath = self.plugins_dir / filename
+            if filepath.exists():
+                skill_data = _read_json(filepath)
+                
+                # 补回保存时省略的效果默认字段，并驻留技能类型、效果类型等枚举字符串
+                _intern_fields(skill_data)
+                effects = skill_data.get('effects')
+                if isinstance(effects, list):
+                    for i, effect in enumerate(effects):
+                        if isinstance(effect, dict):
+                            effect = effects[i] = _expand_effect(effect)
+                            _intern_fields(effect)
+                
+                # level_values以[等级, 数值]列表保存，直接还原为字典
+                level_values = skill_data.get('level_values')
+                if isinstance(level_values, list):
+                    skill_data['level_values'] = dict(level_values)
+                elif isinstance(level_values, dict):
+                    # 兼容旧格式：字符串键转换为整数键
+                    skill_data['level_values'] = {
+                        int(key) if isinstance(key, str) and key.isdigit() else key: value
+                        for key, value in level_values.items()
+                    }
+                
+                return skill_data
             return None
             
         except Exception as e:
-            print(f"加载技能失败: {e}")
+            self.logger.warning("加载技能失败: %s", e)
             return None
     
     def list_available_skills(self) -> List[str]:
-        """列出所有可用的技能文件"""
-        plugins_dir = "/Users/diaoyuzhe/Desktop/模拟战斗/config/plugins"
-        if os.path.exists(plugins_dir):
-            return [f for f in os.listdir(plugins_dir) if f.endswith('.json')]
-        return []
+        """列出所有可用的技能文件
+        
+        结果按目录修改时间缓存，目录内容未变化时只需一次stat。
+        """
+        try:
+            mtime = self.plugins_dir.stat().st_mtime_ns
+        except OSError:
+            self._listing_cache = None
+            return []
+        
+        if self._listing_cache is not None and self._listing_cache[0] == mtime:
+            return list(self._listing_cache[1])
+        
+        # 先按文件名后缀切片比较（无方法调用），命中后再检查是否为文件
+        suffix, suffix_len = _SKILL_FILE_SUFFIX, -len(_SKILL_FILE_SUFFIX)
+        with os.scandir(self.plugins_dir) as entries:
+            names = [entry.name for entry in entries if entry.name[suffix_len:] == suffix and entry.is_file()]
+        self._listing_cache = (mtime, names)
+        return list(names)
     
     def generate_skill_template(self) -> Dict:
         """生成技能模板"""
-        return {
-            "name": "技能名称",
-            "description": "技能描述",
-            "skill_type": "damage",  # damage/heal/buff/debuff/control/summon/transform/custom
-            "cooldown": 3,
-            "mana_cost": 0,
-            "target_type": "single_enemy",  # self/single_enemy/single_ally/all_enemies/all_allies/random_enemy/random_ally
-            "level_values": {
-                1: 0.2,
-                2: 0.3, 
-                3: 0.4,
-                4: 0.5,
-                5: 0.6
-            },
-            "effects": [
-                # 效果列表，每个效果包含:
-                # {
-                #     "type": "damage",  # damage/heal/buff/debuff/control/shield/status
-                #     "trigger": "on_cast",  # on_cast/on_hit/on_crit/on_kill/on_take_damage/on_low_health/on_turn_start/on_turn_end
-                #     "probability": 1.0,  # 触发概率 (0.0-1.0)
-                #     "duration": 0,       # 持续时间(回合数)
-                #     # 其他效果特定参数...
-                # }
-            ]
-        }
+        return create_skill_template()
     
     def create_example_skills(self):
         """创建一些示例技能"""
@@ -393,21 +574,21 @@ class SkillEditor:
             "skill_type": "damage",
             "cooldown": 2,
             "mana_cost": 20,
-            "target_type": TargetType.ALL_ENEMIES.value,
+            "target_type": _ALL_ENEMIES,
             "level_values": {1: 0.3, 2: 0.4, 3: 0.5, 4: 0.6, 5: 0.7},
             "effects": [
                 {
                     "type": "damage",
-                    "trigger": EffectTrigger.ON_CAST.value,
+                    "trigger": _ON_CAST,
                     "probability": 1.0,
-                    "damage_type": DamageType.FIRE.value,
+                    "damage_type": _FIRE,
                     "base_damage": 100,
                     "damage_multiplier": 0.8,
                     "can_crit": True
                 },
                 {
                     "type": "status",
-                    "trigger": EffectTrigger.ON_HIT.value,
+                    "trigger": _ON_HIT,
                     "probability": 0.3,
                     "duration": 3,
                     "status_type": "burn",
@@ -423,12 +604,12 @@ class SkillEditor:
             "skill_type": "buff",
             "cooldown": 4,
             "mana_cost": 40,
-            "target_type": TargetType.ALL_ALLIES.value,
+            "target_type": _ALL_ALLIES,
             "level_values": {1: 0.2, 2: 0.25, 3: 0.3, 4: 0.35, 5: 0.4},
             "effects": [
                 {
                     "type": "shield",
-                    "trigger": EffectTrigger.ON_CAST.value,
+                    "trigger": _ON_CAST,
                     "probability": 1.0,
                     "duration": 3,
                     "shield_amount": 200,
@@ -436,10 +617,10 @@ class SkillEditor:
                 },
                 {
                     "type": "buff",
-                    "trigger": EffectTrigger.ON_CAST.value,
+                    "trigger": _ON_CAST,
                     "probability": 1.0,
                     "duration": 3,
-                    "buff_type": BuffType.DEFENSE.value,
+                    "buff_type": _BUFF_DEFENSE,
                     "value": 0.2,
                     "is_percentage": True
                 }
@@ -447,39 +628,26 @@ class SkillEditor:
         }
         
         # 保存示例技能
-        self.save_skill_to_file(self.create_custom_skill(fire_arrow), "多重火焰箭.json")
-        self.save_skill_to_file(self.create_custom_skill(holy_protection), "神圣庇护.json")
+        self._save_skills_bulk([
+            (self.create_custom_skill(fire_arrow), "多重火焰箭.json"),
+            (self.create_custom_skill(holy_protection), "神圣庇护.json"),
+        ])
         
         print("示例技能创建完成!")
 
 
 def create_skill_template() -> Dict:
-    """创建技能模板"""
-    return {
-        "name": "技能名称",
-        "description": "技能描述",
-        "skill_type": "damage",  # damage/heal/buff/debuff/control/summon/transform/custom
-        "cooldown": 3,
-        "mana_cost": 0,
-        "target_type": "single_enemy",  # self/single_enemy/single_ally/all_enemies/all_allies/random_enemy/random_ally
-        "level_values": {
-            1: 0.2,
-            2: 0.3, 
-            3: 0.4,
-            4: 0.5,
-            5: 0.6
-        },
-        "effects": [
-            # 效果列表，每个效果包含:
-            # {
-            #     "type": "damage",  # damage/heal/buff/debuff/control/shield/status
-            #     "trigger": "on_cast",  # on_cast/on_hit/on_crit/on_kill/on_take_damage/on_low_health/on_turn_start/on_turn_end
-            #     "probability": 1.0,  # 触发概率 (0.0-1.0)
-            #     "duration": 0,       # 持续时间(回合数)
-            #     # 其他效果特定参数...
-            # }
-        ]
-    }
+    """创建技能模板（返回可自由修改的副本）"""
+    # 模板只有level_values和effects两个可变的嵌套字段，单独复制即可，无需deepcopy
+    template = dict(_SKILL_TEMPLATE)
+    template["level_values"] = dict(_SKILL_TEMPLATE["level_values"])
+    template["effects"] = list(_SKILL_TEMPLATE["effects"])
+    return template
+
+
+def get_skill_template_view() -> MappingProxyType:
+    """获取技能模板的只读视图（不复制，供只读取模板的调用方使用）"""
+    return _SKILL_TEMPLATE_VIEW
 
 
 # 测试代码
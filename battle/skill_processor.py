@@ -5,10 +5,17 @@
 处理技能效果和逻辑
 """
 
-import random
 import os
 import json
-from typing import Dict, Optional, List, Any
+import functools
+from typing import Dict, Optional, List, Any, Tuple
+
+from battle._rng import ModuleRNG
+from battle._verbose import emit as _emit
+from battle import effects
+from battle.status_manager import StatusEffect, StatusManager
+from config import BUFF_TYPE_KEYWORDS, DAMAGE_FORMULA_PARAMS
+from core.hero import Hero
 
 # 全局DEBUG模式控制
 DEBUG_MODE = False
@@ -22,10 +29,55 @@ except ImportError:
     print("技能编辑器模块未找到，自定义技能功能将不可用")
     SKILL_EDITOR_ENABLED = False
 
+# 技能效果使用的随机数源，见SkillProcessor.set_rng
+_rng = ModuleRNG()
+
+# 伤害公式参数（已转换为浮点数/整数），由reload_damage_params从DAMAGE_FORMULA_PARAMS读取
+_DEF_P1 = 0.0
+_DEF_P2 = 0.0
+_MIN_DMG = 0
+
+
+def reload_damage_params():
+    """重新读取伤害公式参数（修改DAMAGE_FORMULA_PARAMS后需调用）"""
+    global _DEF_P1, _DEF_P2, _MIN_DMG
+    _DEF_P1 = float(DAMAGE_FORMULA_PARAMS['defense_param1'])
+    _DEF_P2 = float(DAMAGE_FORMULA_PARAMS['defense_param2'])
+    _MIN_DMG = int(DAMAGE_FORMULA_PARAMS['min_damage'])
+
+
+def damage_params() -> Tuple[float, float, int]:
+    """当前使用的伤害公式参数（防御参数1, 防御参数2, 最小伤害），批量计算内核也从这里取参数"""
+    return _DEF_P1, _DEF_P2, _MIN_DMG
+
+
+reload_damage_params()
+
 
 class SkillProcessor:
     """技能处理器"""
     
+    @staticmethod
+    def set_rng(rng=None):
+        """设置技能效果使用的随机数源
+        
+        Args:
+            rng: 提供random()/random_array(n)/random_bits(n)的随机数源（如battle._rng.BatchedRNG(seed)），
+                 None表示恢复为标准库random模块
+        """
+        global _rng
+        _rng = rng if rng is not None else ModuleRNG()
+    
+    @staticmethod
+    def seed(seed: Optional[int] = None):
+        """使用指定种子的NumPy Generator作为随机数源（相同种子的战斗日志可复现）
+        
+        Args:
+            seed: 随机种子，None表示随机
+        """
+        from battle._rng import BatchedRNG
+        SkillProcessor.set_rng(BatchedRNG(seed))
+    
     @staticmethod
     def process_skill(hero, skill: Dict, target=None, display_name=None, target_display_name=None) -> Dict:
         """处理技能效果
@@ -42,87 +94,92 @@ class SkillProcessor:
         """
         # 使用显示名称，如果没有提供则使用原始名称
         hero_name = display_name if display_name else hero.name
-        target_name = target_display_name if target_display_name else (target.name if target else None)
+
+        # 处于控制状态且该技能受限时直接返回，不做任何技能解析
+        control_mask = hero.control_mask & Hero.DISABLED_MASK
+        if control_mask:
+            blocked = control_mask & _skill_blocking_mask(skill)
+            if blocked:
+                control_type = _CONTROL_LABEL[blocked]
+                _emit("%s 处于%s状态，无法使用技能!", hero_name, control_type)
+                return {'success': False, 'message': f"处于{control_type}状态"}
+
+        if target_display_name:
+            target_name = target_display_name
+        elif isinstance(target, list):
+            # 多个目标（群体技能）
+            target_name = [t.name for t in target]
+        else:
+            target_name = target.name if target else None
         
         # 根据英雄等级获取技能数值（系数）
-        skill_coefficient = SkillProcessor._get_skill_value(hero, skill)
+        skill_coefficient = _get_skill_value(hero, skill)
         
-        # 根据技能类型和描述模拟技能效果
-        skill_desc = skill['description'].lower()
         result = {'success': True, 'skill_name': skill['name'], 'effects': []}
         
-        # 首先检查是否为自定义技能（使用技能编辑器创建的技能）
-        if SKILL_EDITOR_ENABLED and 'effects' in skill and isinstance(skill['effects'], list):
-            return SkillProcessor._process_custom_skill(hero, skill, target, result, hero_name, target_name)
-        
-        # 特殊技能处理 - 永夜终焉（优先处理）
-        if '永夜终焉' in skill['name']:
-            return SkillProcessor._process_eternal_night(hero, skill, target, result, hero_name, target_name)
-        
-        # 特殊技能处理 - 毁灭重铸
-        if '毁灭重铸' in skill['name']:
-            return SkillProcessor._process_destruction_reforge(hero, skill, target, result, hero_name, target_name)
+        # 按技能选定的处理分支执行（首次使用时解析，见compile）
+        impl = skill.get('_impl')
+        if impl is None:
+            impl = SkillProcessor.compile(skill)
+        return impl(hero, skill, target, skill_coefficient, result, hero_name, target_name)
+
+    @staticmethod
+    def compile(skill: Dict):
+        """按技能名称、类型和描述选定处理分支，结果缓存在技能字典的'_impl'中
         
-        # 特殊技能处理 - 超载穿透弹
-        if '超载穿透弹' in skill['name']:
-            return SkillProcessor._process_overload_penetration(hero, skill, target, result, hero_name, target_name)
+        技能的分类在使用过程中不会改变，只需解析一次；修改技能字典的相关字段后需删除'_impl'和'_cache'。
         
-        # 特殊技能处理 - 碎颅猛击
-        if '碎颅猛击' in skill['name']:
-            return SkillProcessor._process_skull_smash(hero, skill, target, result, hero_name, target_name)
+        Args:
+            skill: 技能字典
+            
+        Returns:
+            处理函数 impl(hero, skill, target, skill_coefficient, result, hero_name, target_name)
+        """
+        skill['_impl'] = impl = SkillProcessor._select_impl(skill)
+        return impl
+
+    @staticmethod
+    def _select_impl(skill: Dict):
+        """选定技能的处理分支"""
+        # 首先检查是否为自定义技能（使用技能编辑器创建的技能）
+        if SKILL_EDITOR_ENABLED and isinstance(skill.get('effects'), list):
+            return _impl_custom_skill
         
-        # 特殊技能处理 - 举盾防御
-        if '举盾防御' in skill['name']:
-            return SkillProcessor._process_shield_defense(hero, skill, result, hero_name)
+        # 特殊技能处理（永夜终焉、毁灭重铸、超载穿透弹、碎颅猛击、举盾防御）
+        special_handler = _get_special_skill_handler(skill['name'])
+        if special_handler is not None:
+            return _SPECIAL_SKILL_IMPLS[special_handler]
         
-        # 检查技能使用类型（主动/被动）
-        from data.data_loader import HeroDataLoader
-        skill_type = skill.get('技能类型', '')  # 从技能字典中获取技能类型
-        usage_type = HeroDataLoader.get_skill_usage_type(skill_type)
+        # 根据技能类型和描述模拟技能效果（分类信息按技能缓存）
+        skill_info = _classify_skill(skill)
+        keyword_mask = skill_info['keyword_mask']
+        type_code = skill_info['type_code']
+        usage_type = skill_info['usage_type']
         
-        # 主动技能：全部生效
+        # 主动技能：全部生效，按（技能类型编码, 关键词掩码）查预先生成的分派表
         if usage_type == 'active':
-            # 技能类型1: 伤害类技能（攻击型）
-            if str(skill_type) in ['1', '1.0'] or (('攻击' in skill_desc or '伤害' in skill_desc) and str(skill_type) not in ['3', '3.0']):
-                return SkillProcessor._process_damage_skill(hero, skill, target, skill_coefficient, result)
-            
-            # 技能类型2: 控制类技能
-            elif str(skill_type) in ['2', '2.0'] or ('眩晕' in skill_desc or '冻结' in skill_desc or '沉默' in skill_desc or '控制' in skill_desc):
-                return SkillProcessor._process_control_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name)
-            
-            # 技能类型3: BUFF类技能（增益效果）
-            elif str(skill_type) in ['3', '3.0'] or ('攻击提升' in skill_desc or '防御提升' in skill_desc or '暴击提升' in skill_desc or '增益' in skill_desc):
-                return SkillProcessor._process_buff_skill(hero, skill, skill_coefficient, result, hero_name)
-            
-            # 默认处理：普通攻击
-            else:
-                return SkillProcessor._process_default_attack(hero, target, result, hero_name, target_name)
+            return _ACTIVE_SKILL_IMPLS[(type_code, keyword_mask)]
         
         # 被动技能：只有控制类和BUFF类生效
         elif usage_type == 'passive':
-            # 解析伤害类型
-            damage_types = HeroDataLoader.parse_damage_types(skill.get('技能伤害类型'))
+            damage_types = skill_info['damage_types']
             
-            # 被动技能中只有控制类和BUFF类生效
-            if 'control' in damage_types or 'buff' in damage_types:
-                # 控制类被动技能
-                if 'control' in damage_types:
-                    return SkillProcessor._process_control_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name)
-                # BUFF类被动技能  
-                elif 'buff' in damage_types:
-                    return SkillProcessor._process_buff_skill(hero, skill, skill_coefficient, result, hero_name)
+            # 控制类被动技能
+            if 'control' in damage_types:
+                return _impl_control_skill
+            # BUFF类被动技能
+            elif 'buff' in damage_types:
+                return _impl_buff_skill
+            # 其他类型的被动技能不产生战斗效果
             else:
-                # 其他类型的被动技能不产生战斗效果
-                print(f"    {hero_name} 被动技能: {skill['name']} 不产生战斗效果")
-                return result
+                return _impl_inert_passive
         
         # 未知类型的技能：使用默认攻击处理
         else:
-            print(f"    {hero_name} 未知类型技能: {skill['name']}，使用默认攻击")
-            return SkillProcessor._process_default_attack(hero, target, result, hero_name, target_name)
+            return _impl_unknown_skill
 
     @staticmethod
-    def _process_shield_defense(hero, skill: Dict, result: Dict, hero_name: str) -> Dict:
+    def _process_shield_defense(hero, skill: Dict, target, result: Dict, hero_name: str, target_name: str) -> Dict:
         """处理举盾防御特殊技能
         
         技能效果：为自身施加持续4秒的护盾，吸收伤害值分别为：
@@ -131,25 +188,17 @@ class SkillProcessor:
         if DEBUG_MODE:
             print(f"DEBUG: 进入举盾防御特殊技能处理")
         
-        # 检查是否处于控制状态
-        if hero.is_frozen or hero.is_stunned:
-            control_type = "冰冻" if hero.is_frozen else "眩晕"
-            print(f"{hero_name} 处于{control_type}状态，无法使用技能!")
-            return {'success': False, 'message': f"处于{control_type}状态"}
-
-        # 获取技能等级，默认为1级
-        skill_level = skill.get('level', 1)
+        # 获取技能等级，默认为1级（Excel数据可能是2.0这样的浮点数，取整后查表）
+        skill_level = int(skill.get('level', 1))
         
         # 根据技能等级计算护盾吸收值
-        shield_amounts = {1: 500, 2: 1000, 3: 1500, 4: 2000, 5: 2500}
-        shield_value = shield_amounts.get(skill_level, 500)
+        shield_value = _SHIELD_DEFENSE_BY_LEVEL[skill_level] if 1 <= skill_level <= 5 else 500
         
         # 设置护盾值
         hero.shield_amount = shield_value
         hero.max_shield = shield_value
         
         # 添加护盾状态效果（持续4秒）
-        from battle.status_manager import StatusManager
         StatusManager.apply_status_effect(hero, 'shield', 4, hero_name, 
                                        source=hero_name, amount=shield_value)
         
@@ -163,12 +212,65 @@ class SkillProcessor:
             'source': hero_name
         })
         
-        print(f"{hero_name} 使用举盾防御！")
-        print(f"获得 {shield_value} 点护盾，持续4秒！")
-        print(f"{hero_name} 当前护盾值：{hero.shield_amount}/{hero.max_shield}")
+        _emit("%s 使用举盾防御！", hero_name)
+        _emit("获得 %s 点护盾，持续4秒！", shield_value)
+        _emit("%s 当前护盾值：%s/%s", hero_name, hero.shield_amount, hero.max_shield)
         
         return result
 
+    @staticmethod
+    def _apply_with_shield(target, damage: int, target_name: str, label: str = '') -> int:
+        """护盾优先吸收伤害
+        
+        Args:
+            target: 受到伤害的英雄
+            damage: 伤害值
+            target_name: 提示信息中的目标名称
+            label: 提示信息中的伤害类型（如"真实"）
+            
+        Returns:
+            护盾吸收后剩余的伤害值
+        """
+        # 吸收量为护盾值与伤害值中的较小者，无护盾或无伤害时不大于0
+        shield = target.shield_amount
+        shield_absorbed = shield if shield < damage else damage
+        if shield_absorbed <= 0:
+            return damage
+        target.shield_amount = shield - shield_absorbed
+        _emit("%s 的护盾吸收了 %s 点%s伤害!", target_name, shield_absorbed, label)
+        if target.shield_amount == 0:
+            _emit("%s 的护盾已被击破!", target_name)
+        return damage - shield_absorbed
+
+    @staticmethod
+    def _apply_damage_to_target(target, damage: int, target_name: str) -> int:
+        """护盾优先吸收伤害，剩余伤害直接扣除生命值（不经过take_damage，不触发被动技能）
+        
+        Returns:
+            扣除生命值的伤害值
+        """
+        remaining = _apply_with_shield(target, damage, target_name)
+        if remaining > 0:
+            health = target.health - remaining
+            target.health = health if health > 0 else 0
+        return remaining
+
+    @staticmethod
+    def _record_passive_trigger(target, take_result: Dict, result: Dict, target_name: str):
+        """目标受到伤害触发不屈意志时，记录被动触发效果"""
+        if not take_result.get('passive_triggered', False) or take_result.get('triggered_passive') != 'unyielding_will':
+            return
+        
+        _emit("🎉 %s 触发不屈意志!", target_name)
+        boost_amount = take_result.get('attack_boost_amount', 0)
+        base_attack = target.attack - boost_amount
+        result['effects'].append({
+            'type': 'passive_trigger',
+            'passive_name': 'unyielding_will',
+            'revive_health': take_result.get('revive_health', 0),
+            'attack_boost_percent': int((boost_amount / base_attack) * 100) if base_attack > 0 else 30
+        })
+
     @staticmethod
     def _process_overload_penetration(hero, skill: Dict, target, result: Dict, hero_name: str, target_name: str) -> Dict:
         """处理超载穿透弹特殊技能
@@ -180,12 +282,6 @@ class SkillProcessor:
         if DEBUG_MODE:
             print(f"DEBUG: 进入超载穿透弹特殊技能处理")
         
-        # 检查是否处于控制状态
-        if hero.is_frozen or hero.is_stunned or hero.is_paralyzed:
-            control_type = "冰冻" if hero.is_frozen else "眩晕" if hero.is_stunned else "麻痹"
-            print(f"{hero_name} 处于{control_type}状态，无法使用技能!")
-            return {'success': False, 'message': f"处于{control_type}状态"}
-
         # 由于当前是1v1战斗，暂时只对目标生效
         if target:
             # 根据英雄等级获取基础伤害值
@@ -193,7 +289,7 @@ class SkillProcessor:
             base_damage = level_values.get(hero.level, 400)  # 默认1级400点伤害
             
             # 使用攻击公式计算最终伤害
-            damage_result = SkillProcessor.process_damage(
+            damage_result = _process_damage(
                 base_damage=base_damage,
                 defense=target.defense,
                 crit_rate=hero.crit_rate,
@@ -205,34 +301,16 @@ class SkillProcessor:
             is_crit = damage_result['is_crit']
             
             # 应用伤害（优先消耗护盾）
-            damage_after_shield = final_damage
-            if target.shield_amount > 0:
-                # 护盾吸收伤害
-                shield_absorbed = min(final_damage, target.shield_amount)
-                target.shield_amount -= shield_absorbed
-                damage_after_shield = final_damage - shield_absorbed
-                print(f"{target.name} 的护盾吸收了 {shield_absorbed} 点伤害!")
-                if target.shield_amount == 0:
-                    print(f"{target.name} 的护盾已被击破!")
+            damage_after_shield = _apply_with_shield(target, final_damage, target.name)
             
             # 剩余伤害扣除生命值（使用标准伤害处理流程）
             if damage_after_shield > 0:
-                damage_result = target.take_damage(damage_after_shield)
-                
-                # 检查是否有被动技能触发信息
-                if damage_result.get('passive_triggered', False) and damage_result.get('triggered_passive') == 'unyielding_will':
-                    print(f"🎉 {target_name} 触发不屈意志!")
-                    result['effects'].append({
-                        'type': 'passive_trigger',
-                        'passive_name': 'unyielding_will',
-                        'revive_health': damage_result.get('revive_health', 0),
-                        'attack_boost_percent': int((damage_result.get('attack_boost_amount', 0) / (target.attack - damage_result.get('attack_boost_amount', 0))) * 100) if (target.attack - damage_result.get('attack_boost_amount', 0)) > 0 else 30
-                    })
+                take_result = target.take_damage(damage_after_shield)
+                _record_passive_trigger(target, take_result, result, target_name)
             
             # 30%概率触发麻痹效果
-            if random.random() < 0.3:  # 30%概率
+            if _rng.random() < 0.3:  # 30%概率
                 # 添加麻痹效果（1.5秒，向上取整为2回合）
-                from battle.status_manager import StatusManager
                 StatusManager.apply_status_effect(target, 'paralyze', 2, target_name, source=hero_name)
                 
                 result['effects'].append({
@@ -244,12 +322,7 @@ class SkillProcessor:
                 })
             else:
                 # 将抵抗信息添加到效果中
-                result['effects'].append({
-                    'type': 'resist',
-                    'skill_name': '超载穿透弹',
-                    'effect_type': 'paralyze',
-                    'target': target_name
-                })
+                result['effects'].append(effects.ResistEffect('超载穿透弹', 'paralyze', target_name))
             
             # 记录伤害效果
             result['effects'].append({
@@ -260,9 +333,9 @@ class SkillProcessor:
                 'base_damage': base_damage  # 记录基础伤害值用于调试
             })
             
-            print(f"{hero_name} 使用超载穿透弹，造成 {final_damage} 点伤害！")
+            _emit("%s 使用超载穿透弹，造成 %s 点伤害！", hero_name, final_damage)
             if is_crit:
-                print(f"暴击！伤害翻倍！")
+                _emit("暴击！伤害翻倍！")
             
             # 如果触发了麻痹效果，在状态管理器中已经打印了信息
         
@@ -286,15 +359,9 @@ class SkillProcessor:
         if DEBUG_MODE:
             print(f"DEBUG: 处理自定义技能: {skill['name']}")
         
-        # 检查是否处于控制状态
-        if hero.is_frozen or hero.is_stunned or hero.is_paralyzed:
-            control_type = "冰冻" if hero.is_frozen else "眩晕" if hero.is_stunned else "麻痹"
-            print(f"{hero_name} 处于{control_type}状态，无法使用技能!")
-            return {'success': False, 'message': f"处于{control_type}状态"}
-        
         # 处理所有效果
         for effect_data in skill.get('effects', []):
-            SkillProcessor._process_custom_effect(hero, effect_data, target, result, hero_name, target_name)
+            _process_custom_effect(hero, effect_data, target, result, hero_name, target_name)
         
         return result
 
@@ -306,47 +373,40 @@ class SkillProcessor:
         probability = effect_data.get('probability', 1.0)
         
         # 检查触发概率
-        if random.random() > probability:
+        if _rng.random() > probability:
             if DEBUG_MODE:
                 print(f"DEBUG: 效果 {effect_type} 未触发 (概率: {probability})")
             return
         
         # 根据效果类型处理
-        if effect_type == 'damage':
-            SkillProcessor._process_custom_damage(hero, effect_data, target, result, hero_name, target_name)
-        elif effect_type == 'heal':
-            SkillProcessor._process_custom_heal(hero, effect_data, target, result, hero_name, target_name)
-        elif effect_type == 'buff':
-            SkillProcessor._process_custom_buff(hero, effect_data, target, result, hero_name, target_name)
-        elif effect_type == 'debuff':
-            SkillProcessor._process_custom_debuff(hero, effect_data, target, result, hero_name, target_name)
-        elif effect_type == 'control':
-            SkillProcessor._process_custom_control(hero, effect_data, target, result, hero_name, target_name)
-        elif effect_type == 'shield':
-            SkillProcessor._process_custom_shield(hero, effect_data, target, result, hero_name, target_name)
-        elif effect_type == 'status':
-            SkillProcessor._process_custom_status(hero, effect_data, target, result, hero_name, target_name)
-        else:
+        handler = _CUSTOM_EFFECT_HANDLERS.get(effect_type)
+        if handler is None:
             if DEBUG_MODE:
                 print(f"DEBUG: 未知效果类型: {effect_type}")
+            return
+        handler(hero, effect_data, target, result, hero_name, target_name)
 
     @staticmethod
     def _process_custom_damage(hero, effect_data: Dict, target, result: Dict, hero_name: str, target_name: str):
-        """处理自定义伤害效果"""
+        """处理自定义伤害效果（target为英雄列表时按群体伤害处理）"""
         if not target:
             return
+        if isinstance(target, list):
+            _process_custom_damage_batch(hero, effect_data, target, result, hero_name, target_name)
+            return
         
-        base_damage = effect_data.get('base_damage', 0)
-        damage_multiplier = effect_data.get('damage_multiplier', 1.0)
-        ignore_defense = effect_data.get('ignore_defense', False)
-        can_crit = effect_data.get('can_crit', True)
+        get = effect_data.get
+        base_damage = get('base_damage', 0)
+        damage_multiplier = get('damage_multiplier', 1.0)
+        ignore_defense = get('ignore_defense', False)
+        can_crit = get('can_crit', True)
         
         # 计算最终伤害
         final_damage = int(base_damage * damage_multiplier)
         
         # 如果不无视防御，应用防御计算
         if not ignore_defense:
-            damage_result = SkillProcessor.process_damage(
+            damage_result = _process_damage(
                 base_damage=final_damage,
                 defense=target.defense,
                 crit_rate=hero.crit_rate if can_crit else 0.0,
@@ -359,22 +419,10 @@ class SkillProcessor:
             is_crit = False
         
         # 应用职业克制关系和稀有度克制关系
-        final_damage = SkillProcessor._calculate_job_counter_damage(hero.role, target.role, final_damage, hero.rank, target.rank)
-        
-        # 应用伤害（优先消耗护盾）
-        damage_after_shield = final_damage
-        if target.shield_amount > 0:
-            shield_absorbed = min(final_damage, target.shield_amount)
-            target.shield_amount -= shield_absorbed
-            damage_after_shield = final_damage - shield_absorbed
-            print(f"{target_name} 的护盾吸收了 {shield_absorbed} 点伤害!")
-            if target.shield_amount == 0:
-                print(f"{target_name} 的护盾已被击破!")
-        
-        # 剩余伤害扣除生命值
-        if damage_after_shield > 0:
-            target.health -= damage_after_shield
-            target.health = max(0, target.health)
+        final_damage = _calculate_job_counter_damage(hero.role, target.role, final_damage, hero.rank, target.rank)
+        
+        # 应用伤害（优先消耗护盾，剩余伤害扣除生命值）
+        _apply_damage_to_target(target, final_damage, target_name)
         
         # 记录效果
         result['effects'].append({
@@ -382,22 +430,80 @@ class SkillProcessor:
             'damage': final_damage,
             'is_crit': is_crit,
             'target': target_name,
-            'damage_type': effect_data.get('damage_type', 'physical')
+            'damage_type': get('damage_type', 'physical')
         })
         
-        print(f"{hero_name} 造成 {final_damage} 点伤害！")
+        _emit("%s 造成 %s 点伤害！", hero_name, final_damage)
         if is_crit:
-            print("暴击！")
+            _emit("暴击！")
+
+    @staticmethod
+    def _process_custom_damage_batch(hero, effect_data: Dict, targets: List, result: Dict, hero_name: str, target_names):
+        """处理对多个目标的自定义伤害效果
+        
+        目标属性打包为列式数组，伤害、暴击、克制倍率和护盾吸收一次向量化计算，
+        结果与逐个目标调用_process_custom_damage一致。
+        
+        Args:
+            targets: 目标英雄列表
+            target_names: 与targets对应的显示名称列表（非列表时使用英雄名称）
+        """
+        # 向量化计算依赖NumPy/Numba，只有多目标技能才用到，使用时再导入
+        import numpy as np
+        from battle._fast_damage import BattleState, vector_damage
+        
+        if not isinstance(target_names, list):
+            target_names = [target.name for target in targets]
+        
+        final_damage = int(effect_data.get('base_damage', 0) * effect_data.get('damage_multiplier', 1.0))
+        damage_type = effect_data.get('damage_type', 'physical')
+        
+        # 无视防御时不计算防御减伤和暴击；否则每个目标各判定一次暴击
+        rolls = None
+        if not effect_data.get('ignore_defense', False):
+            rolls = _rng.random_array(len(targets))
+        crit_rate = hero.crit_rate if effect_data.get('can_crit', True) else 0.0
+        multipliers = np.array([_job_counter_multipliers(hero.role, target.role, hero.rank, target.rank)
+                                for target in targets]).reshape(-1, 2)
+        role_mult, rank_mult = multipliers[:, 0], multipliers[:, 1]
+        
+        state = BattleState(targets)
+        outcome = vector_damage(state, final_damage, crit_rate, hero.crit_damage, role_mult, rank_mult,
+                                _DEF_P1, _DEF_P2, _MIN_DMG, rolls)
+        state.write_back(targets)
+        
+        for target, target_name, damage, is_crit, absorbed in zip(
+                targets, target_names, outcome['damage'].tolist(), outcome['is_crit'].tolist(),
+                outcome['absorbed'].tolist()):
+            if absorbed > 0:
+                _emit("%s 的护盾吸收了 %s 点伤害!", target_name, absorbed)
+                if target.shield_amount == 0:
+                    _emit("%s 的护盾已被击破!", target_name)
+            
+            result['effects'].append({
+                'type': 'attack',
+                'damage': damage,
+                'is_crit': is_crit,
+                'target': target_name,
+                'damage_type': damage_type
+            })
+            
+            _emit("%s 造成 %s 点伤害！", hero_name, damage)
+            if is_crit:
+                _emit("暴击！")
 
     @staticmethod
     def _process_custom_heal(hero, effect_data: Dict, target, result: Dict, hero_name: str, target_name: str):
         """处理自定义治疗效果"""
-        heal_target = target if effect_data.get('target_type') == 'single_ally' else hero
-        target_display = target_name if effect_data.get('target_type') == 'single_ally' else hero_name
+        get = effect_data.get
+        if get('target_type') == 'single_ally':
+            heal_target, target_display = target, target_name
+        else:
+            heal_target, target_display = hero, hero_name
         
-        base_heal = effect_data.get('base_heal', 0)
-        heal_multiplier = effect_data.get('heal_multiplier', 1.0)
-        is_percentage = effect_data.get('is_percentage', False)
+        base_heal = get('base_heal', 0)
+        heal_multiplier = get('heal_multiplier', 1.0)
+        is_percentage = get('is_percentage', False)
         
         if is_percentage:
             # 百分比治疗
@@ -407,8 +513,7 @@ class SkillProcessor:
             heal_amount = int(base_heal * heal_multiplier)
         
         # 应用治疗
-        heal_target.health += heal_amount
-        heal_target.health = min(heal_target.health, heal_target.max_health)
+        heal_target.health = min(heal_target.health + heal_amount, heal_target.max_health)
         
         # 记录效果
         result['effects'].append({
@@ -418,21 +523,23 @@ class SkillProcessor:
             'source': hero_name
         })
         
-        print(f"{hero_name} 治疗 {target_display} {heal_amount} 点生命值！")
+        _emit("%s 治疗 %s %s 点生命值！", hero_name, target_display, heal_amount)
 
     @staticmethod
     def _process_custom_buff(hero, effect_data: Dict, target, result: Dict, hero_name: str, target_name: str):
         """处理自定义增益效果"""
-        buff_target = target if effect_data.get('target_type') == 'single_ally' else hero
-        target_display = target_name if effect_data.get('target_type') == 'single_ally' else hero_name
+        get = effect_data.get
+        if get('target_type') == 'single_ally':
+            buff_target, target_display = target, target_name
+        else:
+            buff_target, target_display = hero, hero_name
         
-        buff_type = effect_data.get('buff_type', 'attack')
-        value = effect_data.get('value', 0.0)
-        is_percentage = effect_data.get('is_percentage', True)
-        duration = effect_data.get('duration', 0)
+        buff_type = get('buff_type', 'attack')
+        value = get('value', 0.0)
+        is_percentage = get('is_percentage', True)
+        duration = get('duration', 0)
         
         # 应用增益效果
-        from battle.status_manager import StatusManager
         StatusManager.apply_buff_effect(buff_target, buff_type, value, duration, target_display, 
                                      source=hero_name, is_percentage=is_percentage)
         
@@ -447,7 +554,7 @@ class SkillProcessor:
             'is_percentage': is_percentage
         })
         
-        print(f"{hero_name} 为 {target_display} 施加 {buff_type} 增益效果！")
+        _emit("%s 为 %s 施加 %s 增益效果！", hero_name, target_display, buff_type)
 
     @staticmethod
     def _process_custom_debuff(hero, effect_data: Dict, target, result: Dict, hero_name: str, target_name: str):
@@ -455,13 +562,13 @@ class SkillProcessor:
         if not target:
             return
         
-        debuff_type = effect_data.get('debuff_type', 'attack')
-        value = effect_data.get('value', 0.0)
-        is_percentage = effect_data.get('is_percentage', True)
-        duration = effect_data.get('duration', 0)
+        get = effect_data.get
+        debuff_type = get('debuff_type', 'attack')
+        value = get('value', 0.0)
+        is_percentage = get('is_percentage', True)
+        duration = get('duration', 0)
         
         # 应用减益效果
-        from battle.status_manager import StatusManager
         StatusManager.apply_debuff_effect(target, debuff_type, value, duration, target_name, 
                                        source=hero_name, is_percentage=is_percentage)
         
@@ -476,7 +583,7 @@ class SkillProcessor:
             'is_percentage': is_percentage
         })
         
-        print(f"{hero_name} 对 {target_name} 施加 {debuff_type} 减益效果！")
+        _emit("%s 对 %s 施加 %s 减益效果！", hero_name, target_name, debuff_type)
 
     @staticmethod
     def _process_custom_control(hero, effect_data: Dict, target, result: Dict, hero_name: str, target_name: str):
@@ -484,11 +591,11 @@ class SkillProcessor:
         if not target:
             return
         
-        control_type = effect_data.get('control_type', 'stun')
-        duration = effect_data.get('duration', 2)
+        get = effect_data.get
+        control_type = get('control_type', 'stun')
+        duration = get('duration', 2)
         
         # 应用控制效果
-        from battle.status_manager import StatusManager
         StatusManager.apply_status_effect(target, control_type, duration, target_name, source=hero_name)
         
         # 记录效果
@@ -500,17 +607,20 @@ class SkillProcessor:
             'source': hero_name
         })
         
-        print(f"{hero_name} 对 {target_name} 施加 {control_type} 控制效果，持续 {duration} 秒！")
+        _emit("%s 对 %s 施加 %s 控制效果，持续 %s 秒！", hero_name, target_name, control_type, duration)
 
     @staticmethod
     def _process_custom_shield(hero, effect_data: Dict, target, result: Dict, hero_name: str, target_name: str):
         """处理自定义护盾效果"""
-        shield_target = target if effect_data.get('target_type') == 'single_ally' else hero
-        target_display = target_name if effect_data.get('target_type') == 'single_ally' else hero_name
+        get = effect_data.get
+        if get('target_type') == 'single_ally':
+            shield_target, target_display = target, target_name
+        else:
+            shield_target, target_display = hero, hero_name
         
-        shield_amount = effect_data.get('shield_amount', 0)
-        is_percentage = effect_data.get('is_percentage', False)
-        duration = effect_data.get('duration', 0)
+        shield_amount = get('shield_amount', 0)
+        is_percentage = get('is_percentage', False)
+        duration = get('duration', 0)
         
         if is_percentage:
             # 百分比护盾
@@ -520,7 +630,6 @@ class SkillProcessor:
             actual_shield = shield_amount
         
         # 应用护盾效果
-        from battle.status_manager import StatusManager
         StatusManager.apply_shield_effect(shield_target, actual_shield, duration, target_display, source=hero_name)
         
         # 记录效果
@@ -532,20 +641,22 @@ class SkillProcessor:
             'source': hero_name
         })
         
-        print(f"{hero_name} 为 {target_display} 施加 {actual_shield} 点护盾，持续 {duration} 秒！")
+        _emit("%s 为 %s 施加 %s 点护盾，持续 %s 秒！", hero_name, target_display, actual_shield, duration)
 
     @staticmethod
     def _process_custom_status(hero, effect_data: Dict, target, result: Dict, hero_name: str, target_name: str):
         """处理自定义状态效果"""
-        status_target = target if effect_data.get('target_type') == 'single_enemy' else hero
-        target_display = target_name if effect_data.get('target_type') == 'single_enemy' else hero_name
+        get = effect_data.get
+        if get('target_type') == 'single_enemy':
+            status_target, target_display = target, target_name
+        else:
+            status_target, target_display = hero, hero_name
         
-        status_type = effect_data.get('status_type', '')
-        value = effect_data.get('value', 0.0)
-        duration = effect_data.get('duration', 0)
+        status_type = get('status_type', '')
+        value = get('value', 0.0)
+        duration = get('duration', 0)
         
         # 应用状态效果
-        from battle.status_manager import StatusManager
         StatusManager.apply_status_effect(status_target, status_type, duration, target_display, 
                                        source=hero_name, amount=value)
         
@@ -559,7 +670,7 @@ class SkillProcessor:
             'source': hero_name
         })
         
-        print(f"{hero_name} 对 {target_display} 施加 {status_type} 状态效果，持续 {duration} 秒！")
+        _emit("%s 对 %s 施加 %s 状态效果，持续 %s 秒！", hero_name, target_display, status_type, duration)
 
     @staticmethod
     def _get_skill_value(hero, skill: Dict) -> float:
@@ -579,12 +690,6 @@ class SkillProcessor:
         if DEBUG_MODE:
             print(f"DEBUG: 进入永夜终焉特殊技能处理")
         
-        # 检查是否处于控制状态
-        if hero.is_frozen or hero.is_stunned:
-            control_type = "冰冻" if hero.is_frozen else "眩晕"
-            print(f"{hero_name} 处于{control_type}状态，无法使用技能!")
-            return {'success': False, 'message': f"处于{control_type}状态"}
-
         # 由于当前是1v1战斗，暂时只对目标生效
         if target:
             # 直接从level_values获取技能数值（避免_get_skill_value的问题）
@@ -593,65 +698,28 @@ class SkillProcessor:
             # 计算真实伤害（基于目标最大生命值的百分比）
             true_damage = int(target.max_health * eternal_night_coefficient)
             # 应用真实伤害（无视防御，但优先消耗护盾）
-            damage_after_shield = true_damage
-            if target.shield_amount > 0:
-                # 护盾吸收真实伤害
-                shield_absorbed = min(true_damage, target.shield_amount)
-                target.shield_amount -= shield_absorbed
-                damage_after_shield = true_damage - shield_absorbed
-                print(f"{target.name} 的护盾吸收了 {shield_absorbed} 点真实伤害!")
-                if target.shield_amount == 0:
-                    print(f"{target.name} 的护盾已被击破!")
+            damage_after_shield = _apply_with_shield(target, true_damage, target.name, '真实')
             
             # 剩余伤害扣除生命值（使用标准伤害处理流程）
             if damage_after_shield > 0:
-                damage_result = target.take_damage(damage_after_shield)
-                
-                # 检查是否有被动技能触发信息
-                if damage_result.get('passive_triggered', False) and damage_result.get('triggered_passive') == 'unyielding_will':
-                    print(f"🎉 {target_name} 触发不屈意志!")
-                    result['effects'].append({
-                        'type': 'passive_trigger',
-                        'passive_name': 'unyielding_will',
-                        'revive_health': damage_result.get('revive_health', 0),
-                        'attack_boost_percent': int((damage_result.get('attack_boost_amount', 0) / (target.attack - damage_result.get('attack_boost_amount', 0))) * 100) if (target.attack - damage_result.get('attack_boost_amount', 0)) > 0 else 30
-                    })
+                take_result = target.take_damage(damage_after_shield)
+                _record_passive_trigger(target, take_result, result, target_name)
             
             # 70%概率触发冰冻效果
-            if random.random() < 0.7:  # 70%概率
-                # 移除现有的冰冻效果
-                target.status_effects = [effect for effect in target.status_effects if effect['type'] != 'freeze']
-                
-                # 添加新的冰冻效果
-                freeze_effect = {
-                    'type': 'freeze',
-                    'duration': 2
-                }
-                target.status_effects.append(freeze_effect)
+            if _rng.random() < 0.7:  # 70%概率
+                # 用新的冰冻效果替换现有的冰冻效果
+                status_effects = target.status_effects
+                status_effects.remove_type('freeze')
+                status_effects.append(StatusEffect('freeze', 2))
                 target.is_frozen = True  # 立即设置冰冻状态
                 
-                result['effects'].append({
-                    'type': 'freeze',
-                    'duration': 2,
-                    'target': target_name
-                })
-                # 立即更新目标的状态
-                target.is_frozen = True
+                result['effects'].append(effects.FreezeEffect(2, target_name))
             else:
                 # 将抵抗信息添加到效果中，由战斗模拟器统一处理显示
-                result['effects'].append({
-                    'type': 'resist',
-                    'skill_name': '永夜终焉',
-                    'effect_type': 'freeze',
-                    'target': target_name
-                })
+                result['effects'].append(effects.ResistEffect('永夜终焉', 'freeze', target_name))
             
             # 将伤害信息添加到效果中，由战斗模拟器统一处理显示
-            result['effects'].append({
-                'type': 'true_damage',
-                'damage': true_damage,
-                'target': target_name
-            })
+            result['effects'].append(effects.TrueDamageEffect(true_damage, target_name))
         
         return result
     
@@ -663,25 +731,19 @@ class SkillProcessor:
         
         # 检查被动技能类型
         # 如果是控制类（类型2）或BUFF类（类型3）的被动技能，让它生效
-        damage_type = skill.get('damage_type', 0)  # 获取技能伤害类型
-        
-        # 处理可能的多个伤害类型（例如"1,2"或"2,3"）
-        damage_types = []
-        if isinstance(damage_type, str):
-            # 如果是字符串，按逗号分隔并转换为整数列表
-            damage_types = [int(dt.strip()) for dt in damage_type.split(',') if dt.strip().isdigit()]
-        elif isinstance(damage_type, (int, float)):
-            # 如果是数字，直接加入列表
-            damage_types = [int(damage_type)]
+        skill_info = _classify_skill(skill)
+        damage_type_codes = skill_info.get('damage_type_codes')
+        if damage_type_codes is None:
+            damage_type_codes = skill_info['damage_type_codes'] = _parse_damage_type_codes(skill.get('damage_type', 0))
 
         # 检查是否包含控制类(2)或BUFF类(3)
-        if any(dt in [2, 3] for dt in damage_types):
+        if not damage_type_codes.isdisjoint((2, 3)):
             if DEBUG_MODE:
                 print(f"DEBUG: 被动技能 {skill['name']} 包含控制类或BUFF类效果，将会生效")
             # 继续执行后续的技能效果逻辑
         else:
             # 其他类型的被动技能不生效
-            print(f"    {hero_name} 被动技能: {skill['name']} 不产生战斗效果")
+            _emit("    %s 被动技能: %s 不产生战斗效果", hero_name, skill['name'])
             return result
         
         if DEBUG_MODE:
@@ -690,13 +752,8 @@ class SkillProcessor:
         if target:
             # 默认控制效果：眩晕2秒
             control_duration = int(2 * skill_coefficient)
-            result['effects'].append({
-                'type': 'control',
-                'subtype': 'stun',  # 控制子类型：眩晕
-                'duration': control_duration,
-                'target': target_name
-            })
-            print(f"{target_name} 被控制 {control_duration} 秒!")
+            result['effects'].append(effects.ControlEffect('stun', control_duration, target_name))  # 控制子类型：眩晕
+            _emit("%s 被控制 %s 秒!", target_name, control_duration)
         
         return result
     
@@ -726,33 +783,15 @@ class SkillProcessor:
         Returns:
             应用职业克制和稀有度克制后的伤害值
         """
-        damage = base_damage
-        
-        # 职业克制关系检查
-        if attacker_role == 'DPS' and target_role == 'SNIP':
-            damage = int(damage * 1.2)
-            print(f"职业克制! DPS对SNIP造成额外20%伤害")
-        elif attacker_role == 'SNIP' and target_role == 'TANK':
-            damage = int(damage * 1.2)
-            print(f"职业克制! SNIP对TANK造成额外20%伤害")
-        elif attacker_role == 'TANK' and target_role == 'DPS':
-            damage = int(damage * 1.2)
-            print(f"职业克制! TANK对DPS造成额外20%伤害")
-        elif attacker_role == 'TANK' and target_role == 'TANK':
-            damage = int(damage * 1.5)
-            print(f"TANK对TANK! 伤害加成50%")
-        
-        # 稀有度克制关系检查（需要提供稀有度信息）
-        if attacker_rank and target_rank:
-            if attacker_rank == 'SSR' and target_rank == 'SR':
-                damage = int(damage * 1.5)
-                print(f"稀有度克制! SSR对SR造成额外50%伤害")
-            elif attacker_rank == 'SSR' and target_rank == 'R':
-                damage = int(damage * 2.0)
-                print(f"稀有度克制! SSR对R造成额外100%伤害")
-            elif attacker_rank == 'SR' and target_rank == 'R':
-                damage = int(damage * 1.5)
-                print(f"稀有度克制! SR对R造成额外50%伤害")
+        # 两次倍率分别取整，与逐项结算的结果保持一致
+        role_mult, rank_mult = _job_counter_multipliers(attacker_role, target_role, attacker_rank, target_rank)
+        damage = int(int(base_damage * role_mult) * rank_mult)
+        
+        if DEBUG_MODE:
+            if (attacker_role, target_role) in _ROLE_COUNTER_MESSAGES:
+                print(_ROLE_COUNTER_MESSAGES[(attacker_role, target_role)])
+            if (attacker_rank, target_rank) in _RANK_COUNTER_MESSAGES:
+                print(_RANK_COUNTER_MESSAGES[(attacker_rank, target_rank)])
         
         return damage
 
@@ -767,72 +806,47 @@ class SkillProcessor:
             damage = int(base_damage)
             
             # 应用职业克制关系和稀有度克制关系
-            damage = SkillProcessor._calculate_job_counter_damage(hero.role, target.role, damage, hero.rank, target.rank)
+            damage = _calculate_job_counter_damage(hero.role, target.role, damage, hero.rank, target.rank)
             
             if damage > 0:
-                # 应用伤害（优先消耗护盾）
-                damage_after_shield = damage
-                if target.shield_amount > 0:
-                    # 护盾吸收伤害
-                    shield_absorbed = min(damage, target.shield_amount)
-                    target.shield_amount -= shield_absorbed
-                    damage_after_shield = damage - shield_absorbed
-                    print(f"{target.name} 的护盾吸收了 {shield_absorbed} 点伤害!")
-                    if target.shield_amount == 0:
-                        print(f"{target.name} 的护盾已被击破!")
-                
-                # 剩余伤害扣除生命值
-                if damage_after_shield > 0:
-                    target.health -= damage_after_shield
-                    target.health = max(0, target.health)
-                result['effects'].append({
-                    'type': 'attack',
-                    'damage': damage,
-                    'is_crit': False  # 技能攻击默认不暴击
-                })
+                # 应用伤害（优先消耗护盾，剩余伤害扣除生命值）
+                _apply_damage_to_target(target, damage, target.name)
+                result['effects'].append(effects.AttackEffect(damage, False))  # 技能攻击默认不暴击
         
         return result
     
     @staticmethod
     def _process_buff_skill(hero, skill: Dict, skill_coefficient: float, result: Dict, hero_name: str) -> Dict:
         """处理BUFF类技能"""
-        if DEBUG_MODE:
-            print(f"DEBUG: 进入BUFF类技能处理")
-        # BUFF技能 - 基于技能系数计算增益效果
-        skill_desc = skill['description'].lower()
-        buff_type = 'attack_boost'  # 默认攻击提升
-        buff_amount = 0
-        
-        if DEBUG_MODE:
-            print(f"DEBUG: 处理BUFF类技能，技能类型={skill.get('skill_type', '')}, 技能描述={skill_desc}")
-            print(f"DEBUG: 当前攻击力={hero.attack}, 技能系数={skill_coefficient}")
-        
-        if '防御' in skill_desc or '防御值' in skill_desc:
-            buff_type = 'defense_boost'
-            buff_amount = int(hero.defense * skill_coefficient)
-            hero.defense += buff_amount
-            if DEBUG_MODE:
-                print(f"DEBUG: 防御提升 {buff_amount}, 新防御={hero.defense}")
-        elif '暴击' in skill_desc or '概率' in skill_desc:
-            buff_type = 'crit_boost'
+        # BUFF技能 - 基于技能系数计算增益效果（属性只读取一次，调试输出统一放在最后）
+        skill_info = _classify_skill(skill)
+        buff_type = skill_info['buff_type']
+        attack = hero.attack
+        
+        # 各分支同时选好调试输出的格式串（常量，不做格式化）
+        if buff_type == 'defense_boost':
+            old_value = hero.defense
+            buff_amount = int(old_value * skill_coefficient)
+            hero.defense = new_value = old_value + buff_amount
+            debug_detail = "DEBUG: 防御提升 %s, 新防御=%s"
+        elif buff_type == 'crit_boost':
+            old_value = hero.crit_rate
             buff_amount = skill_coefficient
-            hero.crit_rate += buff_amount
-            if DEBUG_MODE:
-                print(f"DEBUG: 暴击率提升 {buff_amount}, 新暴击率={hero.crit_rate}")
+            hero.crit_rate = new_value = old_value + buff_amount
+            debug_detail = "DEBUG: 暴击率提升 %s, 新暴击率=%s"
         else:
             # 默认攻击提升
-            buff_type = 'attack_boost'
-            buff_amount = int(hero.attack * skill_coefficient)
-            hero.attack += buff_amount
-            if DEBUG_MODE:
-                print(f"DEBUG: 攻击力提升 {buff_amount}, 新攻击力={hero.attack}")
+            buff_amount = int(attack * skill_coefficient)
+            hero.attack = new_value = attack + buff_amount
+            debug_detail = "DEBUG: 攻击力提升 %s, 新攻击力=%s"
         
-        result['effects'].append({
-            'type': 'buff',
-            'subtype': buff_type,
-            'amount': buff_amount,
-            'target': hero_name
-        })
+        if DEBUG_MODE:
+            print("DEBUG: 进入BUFF类技能处理")
+            print(f"DEBUG: 处理BUFF类技能，技能类型={skill.get('skill_type', '')}, 技能描述={skill_info['desc_lower']}")
+            print(f"DEBUG: 当前攻击力={attack}, 技能系数={skill_coefficient}")
+            print(debug_detail % (buff_amount, new_value))
+        
+        result['effects'].append(effects.BuffEffect(buff_type, buff_amount, hero_name))
         
         return result
     
@@ -842,12 +856,7 @@ class SkillProcessor:
         # 默认处理：普通攻击
         if target:
             damage = hero.attack_target(target)
-            result['effects'].append({
-                'type': 'attack',
-                'damage': damage['damage'],
-                'is_crit': damage['is_crit'],
-                'target': target_name
-            })
+            result['effects'].append(effects.AttackEffect(damage['damage'], damage['is_crit'], target_name))
         
         return result
 
@@ -866,28 +875,61 @@ class SkillProcessor:
         Returns:
             包含伤害计算结果的字典
         """
-        # 从配置中获取防御参数
-        from config import DAMAGE_FORMULA_PARAMS
-        defense_param1 = DAMAGE_FORMULA_PARAMS['defense_param1']
-        defense_param2 = DAMAGE_FORMULA_PARAMS['defense_param2']
-        min_damage = DAMAGE_FORMULA_PARAMS['min_damage']
-        
-        # 计算防御减伤比例：1 - (防御力 / (防御力 + (等级 * 参数1 + 参数2)))
-        defense_reduction = (defense / (defense + (target_level * defense_param1 + defense_param2)))
+        # 单次计算直接用Python完成（逐次调用编译内核的分派开销高于公式本身），
+        # 与battle._fast_damage.compute_damage的公式保持一致，批量计算见process_damage_batch
+        # 计算防御减伤比例：防御力 / (防御力 + (等级 * 参数1 + 参数2))
+        defense_reduction = defense / (defense + (target_level * _DEF_P1 + _DEF_P2))
         
         # 暴击判断
-        is_crit = random.random() < crit_rate
+        is_crit = _rng.random() < crit_rate
         
-        if is_crit:
-            # 暴击伤害公式: 基础伤害 * 暴击倍率 * (1 - 防御减伤比例)
-            damage = int(base_damage * crit_damage * (1 - defense_reduction))
-        else:
-            # 普通伤害公式: 基础伤害 * (1 - 防御减伤比例)
-            damage = int(base_damage * (1 - defense_reduction))
+        # 伤害公式: 基础伤害 * 暴击倍率(未暴击为1) * (1 - 防御减伤比例)
+        multiplier = crit_damage if is_crit else 1.0
+        damage = int(base_damage * multiplier * (1 - defense_reduction))
         
         # 最小伤害保护
-        damage = max(min_damage, damage)
+        damage = max(_MIN_DMG, damage)
+        
+        return {
+            'damage': damage,
+            'is_crit': is_crit,
+            'defense_reduction': defense_reduction
+        }
+
+    @staticmethod
+    def process_damage_batch(base_damage: int, defense: int, crit_rate: float, crit_damage: float,
+                             target_level: int = 1, n: int = 1, quantized_crit: bool = False) -> Dict:
+        """
+        批量处理相同参数的伤害计算（用于平衡性测试的蒙特卡洛模拟）
+
+        一次抽取n个暴击判定随机数，整体按数组计算；默认情况下单次结果与逐次调用process_damage一致。
+
+        Args:
+            base_damage: 基础伤害值
+            defense: 防御力
+            crit_rate: 暴击率
+            crit_damage: 暴击伤害倍率
+            target_level: 目标等级（默认1级）
+            n: 模拟次数
+            quantized_crit: 暴击率量化为1/256，每个64位随机数并行判定8次暴击（SWAR），
+                            结果与process_damage不再逐次一致
+
+        Returns:
+            包含伤害值数组、暴击标记数组和防御减伤比例的字典
+        """
+        import numpy as np
+        from battle._fast_damage import swar_crit_rolls
         
+        # 防御减伤比例与随机数无关，只计算一次
+        defense_reduction = float(defense) / (float(defense) + (float(target_level) * _DEF_P1 + _DEF_P2))
+        if quantized_crit:
+            is_crit = swar_crit_rolls(crit_rate, _rng.random_bits((n + 7) // 8), n)
+        else:
+            is_crit = _rng.random_array(n) < crit_rate
+        multiplier = np.where(is_crit, float(crit_damage), 1.0)
+        damage = (float(base_damage) * multiplier * (1 - defense_reduction)).astype(np.int64)
+        np.maximum(damage, _MIN_DMG, out=damage)
+
         return {
             'damage': damage,
             'is_crit': is_crit,
@@ -922,30 +964,19 @@ class SkillProcessor:
         if DEBUG_MODE:
             print(f"DEBUG: 进入碎颅猛击特殊技能处理")
         
-        # 检查是否处于控制状态
-        if hero.is_frozen or hero.is_stunned:
-            control_type = "冰冻" if hero.is_frozen else "眩晕"
-            print(f"{hero_name} 处于{control_type}状态，无法使用技能!")
-            return {'success': False, 'message': f"处于{control_type}状态"}
-
         # 由于当前是1v1战斗，暂时只对目标生效
         if target:
-            # 获取技能等级，默认为1级
-            skill_level = skill.get('level', 1)
+            # 获取技能等级，默认为1级（Excel数据可能是2.0这样的浮点数，取整后查表）
+            skill_level = int(skill.get('level', 1))
             
-            # 根据技能等级计算基础伤害
-            base_damage = 300  # 1级基础伤害
-            if skill_level >= 2:
-                base_damage = 350  # 2级基础伤害
-            if skill_level >= 3:
-                base_damage = 400  # 3级基础伤害
-            if skill_level >= 4:
-                base_damage = 450  # 4级基础伤害
-            if skill_level >= 5:
-                base_damage = 500  # 5级基础伤害
+            # 根据技能等级计算基础伤害（1级以下按1级，5级以上按5级）
+            if 1 <= skill_level <= 5:
+                base_damage = _SKULL_SMASH_DAMAGE_BY_LEVEL[skill_level]
+            else:
+                base_damage = _SKULL_SMASH_DAMAGE_BY_LEVEL[5 if skill_level > 5 else 1]
             
             # 使用攻击公式计算实际伤害
-            damage_result = SkillProcessor.process_damage(
+            damage_result = _process_damage(
                 base_damage=base_damage,
                 defense=target.defense,
                 crit_rate=hero.crit_rate,
@@ -954,25 +985,12 @@ class SkillProcessor:
             )
             
             # 应用职业克制关系和稀有度克制关系
-            damage_result['damage'] = SkillProcessor._calculate_job_counter_damage(
+            damage_result['damage'] = _calculate_job_counter_damage(
                 hero.role, target.role, damage_result['damage'], hero.rank, target.rank
             )
             
-            # 应用伤害（优先消耗护盾）
-            damage_after_shield = damage_result['damage']
-            if target.shield_amount > 0:
-                # 护盾吸收伤害
-                shield_absorbed = min(damage_result['damage'], target.shield_amount)
-                target.shield_amount -= shield_absorbed
-                damage_after_shield = damage_result['damage'] - shield_absorbed
-                print(f"{target.name} 的护盾吸收了 {shield_absorbed} 点伤害!")
-                if target.shield_amount == 0:
-                    print(f"{target.name} 的护盾已被击破!")
-            
-            # 剩余伤害扣除生命值
-            if damage_after_shield > 0:
-                target.health -= damage_after_shield
-                target.health = max(0, target.health)
+            # 应用伤害（优先消耗护盾，剩余伤害扣除生命值）
+            _apply_damage_to_target(target, damage_result['damage'], target.name)
             
             # 降低目标20%防御值，持续5秒
             armor_reduction = int(target.defense * 0.2)
@@ -981,18 +999,12 @@ class SkillProcessor:
             target.defense = max(0, target.defense)
             
             # 添加防御值降低状态效果
-            from battle.status_manager import StatusManager
             StatusManager.apply_status_effect(target, 'armor_reduction', 5, target_name, 
                                            source=hero_name, amount=armor_reduction, original_defense=original_defense)
             
             # 记录技能效果
             result['effects'].extend([
-                {
-                    'type': 'attack',
-                    'damage': damage_result['damage'],
-                    'is_crit': damage_result['is_crit'],
-                    'target': target_name
-                },
+                effects.AttackEffect(damage_result['damage'], damage_result['is_crit'], target_name),
                 {
                     'type': 'debuff',
                     'subtype': 'armor_reduction',
@@ -1003,12 +1015,12 @@ class SkillProcessor:
                 }
             ])
             
-            print(f"{hero_name} 使用碎颅猛击！")
-            print(f"造成 {damage_result['damage']} 点伤害！")
+            _emit("%s 使用碎颅猛击！", hero_name)
+            _emit("造成 %s 点伤害！", damage_result['damage'])
             if damage_result['is_crit']:
-                print("暴击！")
-            print(f"{target_name} 防御值降低 {armor_reduction} 点，持续5秒！")
-            print(f"{target_name} 当前防御值：{target.defense}")
+                _emit("暴击！")
+            _emit("%s 防御值降低 %s 点，持续5秒！", target_name, armor_reduction)
+            _emit("%s 当前防御值：%s", target_name, target.defense)
         
         return result
 
@@ -1028,25 +1040,17 @@ class SkillProcessor:
         if DEBUG_MODE:
             print(f"DEBUG: 进入毁灭重铸特殊技能处理")
 
-        # 检查是否处于控制状态
-        if hero.is_frozen or hero.is_stunned:
-            control_type = "冰冻" if hero.is_frozen else "眩晕"
-            print(f"{hero_name} 处于{control_type}状态，无法使用技能!")
-            return {'success': False, 'message': f"处于{control_type}状态"}
-
         # 由于当前是1v1战斗，暂时只对目标生效
         if target:
             # 牺牲当前30%生命值
             sacrifice_amount = int(hero.health * 0.3)
-            hero.health -= sacrifice_amount
-            hero.health = max(1, hero.health)  # 至少保留1点生命值
+            hero.health = max(1, hero.health - sacrifice_amount)  # 至少保留1点生命值
             
-            # 获取技能等级，默认为1级
-            skill_level = skill.get('level', 1)
+            # 获取技能等级，默认为1级（Excel数据可能是2.0这样的浮点数，取整后查表）
+            skill_level = int(skill.get('level', 1))
             
             # 根据技能等级计算伤害系数
-            damage_coefficients = {1: 0.4, 2: 0.5, 3: 0.6, 4: 0.7, 5: 0.8}
-            damage_coefficient = damage_coefficients.get(skill_level, 0.4)
+            damage_coefficient = _DESTRUCTION_REFORGE_COEF_BY_LEVEL[skill_level] if 1 <= skill_level <= 5 else 0.4
             
             # 基于牺牲生命值计算伤害
             damage = int(sacrifice_amount * damage_coefficient)
@@ -1056,17 +1060,16 @@ class SkillProcessor:
             
             # 检查是否触发了不屈意志被动
             if damage_result.get('passive_triggered', False) and damage_result.get('triggered_passive') == 'unyielding_will':
-                print(f"{target.name} 的不屈意志触发! 复活并恢复{damage_result.get('revive_health', 0)}点生命值")
+                _emit("%s 的不屈意志触发! 复活并恢复%s点生命值", target.name, damage_result.get('revive_health', 0))
                 
             # 更新伤害值为实际造成的伤害（考虑护盾吸收）
             actual_damage = damage_result.get('damage_after_shield', damage)
             if actual_damage < damage:
-                print(f"{target.name} 的护盾吸收了 {damage - actual_damage} 点伤害!")
+                _emit("%s 的护盾吸收了 %s 点伤害!", target.name, damage - actual_damage)
                 if target.shield_amount == 0:
-                    print(f"{target.name} 的护盾已被击破!")
+                    _emit("%s 的护盾已被击破!", target.name)
             
             # 添加嘲讽效果（5秒）
-            from battle.status_manager import StatusManager
             StatusManager.apply_status_effect(target, 'taunt', 5, target_name, source=hero_name)
             
             # 记录技能效果
@@ -1093,8 +1096,267 @@ class SkillProcessor:
                 }
             ])
             
-            print(f"{hero_name} 牺牲了 {sacrifice_amount} 点生命值！")
-            print(f"{target_name} 受到 {damage} 点伤害（{damage_coefficient*100}% {hero_name}牺牲生命值）！")
-            print(f"{target_name} 被强制嘲讽 5 秒！")
+            _emit("%s 牺牲了 %s 点生命值！", hero_name, sacrifice_amount)
+            _emit("%s 受到 %s 点伤害（%s%% %s牺牲生命值）！", target_name, damage, damage_coefficient*100, hero_name)
+            _emit("%s 被强制嘲讽 5 秒！", target_name)
         
-        return result
\ No newline at end of file
+        return result
+
+
+# 每次施放技能都会调用的静态方法绑定为模块级函数，内部调用省去类属性查找和staticmethod描述符
+_process_damage = SkillProcessor.process_damage
+_get_skill_value = SkillProcessor._get_skill_value
+_apply_with_shield = SkillProcessor._apply_with_shield
+_apply_damage_to_target = SkillProcessor._apply_damage_to_target
+_record_passive_trigger = SkillProcessor._record_passive_trigger
+_calculate_job_counter_damage = SkillProcessor._calculate_job_counter_damage
+_process_custom_skill = SkillProcessor._process_custom_skill
+_process_custom_effect = SkillProcessor._process_custom_effect
+_process_custom_damage_batch = SkillProcessor._process_custom_damage_batch
+_process_damage_skill = SkillProcessor._process_damage_skill
+_process_control_skill = SkillProcessor._process_control_skill
+_process_buff_skill = SkillProcessor._process_buff_skill
+_process_default_attack = SkillProcessor._process_default_attack
+
+
+# 技能类型值的字符串形式 -> 整数编码（Excel中读取的技能类型可能是整数或浮点数），其他值编码为-1
+_SKILL_TYPE_CODES = {'1': 1, '1.0': 1, '2': 2, '2.0': 2, '3': 3, '3.0': 3}
+
+# 职业克制倍率：(攻击者职业, 目标职业) -> 伤害倍率（battle.fast_sim打包英雄属性时也使用这两张表）
+_ROLE_MULT = {
+    ('DPS', 'SNIP'): 1.2,
+    ('SNIP', 'TANK'): 1.2,
+    ('TANK', 'DPS'): 1.2,
+    ('TANK', 'TANK'): 1.5,
+}
+
+# 稀有度克制倍率：(攻击者稀有度, 目标稀有度) -> 伤害倍率
+_RANK_MULT = {
+    ('SSR', 'SR'): 1.5,
+    ('SSR', 'R'): 2.0,
+    ('SR', 'R'): 1.5,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _job_counter_multipliers(attacker_role: str, target_role: str, attacker_rank: str, target_rank: str) -> Tuple[float, float]:
+    """攻击者对目标的（职业克制倍率, 稀有度克制倍率），职业和稀有度组合很少，按参数缓存"""
+    return _ROLE_MULT.get((attacker_role, target_role), 1.0), _RANK_MULT.get((attacker_rank, target_rank), 1.0)
+
+
+# 克制提示信息（仅DEBUG模式输出）
+_ROLE_COUNTER_MESSAGES = {
+    ('DPS', 'SNIP'): "职业克制! DPS对SNIP造成额外20%伤害",
+    ('SNIP', 'TANK'): "职业克制! SNIP对TANK造成额外20%伤害",
+    ('TANK', 'DPS'): "职业克制! TANK对DPS造成额外20%伤害",
+    ('TANK', 'TANK'): "TANK对TANK! 伤害加成50%",
+}
+_RANK_COUNTER_MESSAGES = {
+    ('SSR', 'SR'): "稀有度克制! SSR对SR造成额外50%伤害",
+    ('SSR', 'R'): "稀有度克制! SSR对R造成额外100%伤害",
+    ('SR', 'R'): "稀有度克制! SR对R造成额外50%伤害",
+}
+
+# 特殊技能按技能等级（1-5级）的数值，下标即等级，下标0不使用
+_SHIELD_DEFENSE_BY_LEVEL = (500, 500, 1000, 1500, 2000, 2500)        # 举盾防御护盾值
+_SKULL_SMASH_DAMAGE_BY_LEVEL = (300, 300, 350, 400, 450, 500)        # 碎颅猛击基础伤害
+_DESTRUCTION_REFORGE_COEF_BY_LEVEL = (0.4, 0.4, 0.5, 0.6, 0.7, 0.8)  # 毁灭重铸伤害系数
+
+# 技能描述关键词分类位及对应的关键词
+_KW_ATTACK = 1      # 伤害类
+_KW_CONTROL = 2     # 控制类
+_KW_BUFF = 4        # BUFF类
+_SKILL_KEYWORDS = (
+    (_KW_ATTACK, ('攻击', '伤害')),
+    (_KW_CONTROL, ('眩晕', '冻结', '沉默', '控制')),
+    (_KW_BUFF, ('攻击提升', '防御提升', '暴击提升', '增益')),
+)
+
+
+def _keyword_mask(skill_desc: str) -> int:
+    """扫描技能描述，返回包含的关键词分类位"""
+    mask = 0
+    for bit, keywords in _SKILL_KEYWORDS:
+        if any(keyword in skill_desc for keyword in keywords):
+            mask |= bit
+    return mask
+
+
+def _buff_type(skill_desc: str) -> str:
+    """按技能描述中的关键词确定BUFF类技能的增益类型"""
+    for keyword, buff_type in BUFF_TYPE_KEYWORDS.items():
+        if keyword in skill_desc:
+            return buff_type
+    return 'attack_boost'
+
+
+def _classify_skill(skill: Dict) -> Dict:
+    """获取技能的分类信息
+    
+    描述、技能类型等派生信息在技能首次使用时计算，缓存在技能字典的'_cache'中；
+    修改技能字典的这些字段后需删除'_cache'（及SkillProcessor.compile缓存的'_impl'）。
+    """
+    cache = skill.get('_cache')
+    if cache is None:
+        from data.data_loader import HeroDataLoader
+        skill_type = skill.get('技能类型', '')  # 从技能字典中获取技能类型
+        skill_desc = skill['description'].lower()
+        cache = skill['_cache'] = {
+            'desc_lower': skill_desc,
+            'keyword_mask': _keyword_mask(skill_desc),
+            'buff_type': _buff_type(skill_desc),
+            'type_code': _SKILL_TYPE_CODES.get(str(skill_type), -1),
+            'usage_type': HeroDataLoader.get_skill_usage_type(skill_type),
+            'damage_types': frozenset(HeroDataLoader.parse_damage_types(skill.get('技能伤害类型'))),
+        }
+    return cache
+
+
+def _parse_damage_type_codes(damage_type) -> frozenset:
+    """解析技能的damage_type字段，可能包含多个类型（例如"1,2"或"2,3"）"""
+    if isinstance(damage_type, str):
+        # 如果是字符串，按逗号分隔并转换为整数
+        return frozenset(int(dt.strip()) for dt in damage_type.split(',') if dt.strip().isdigit())
+    if isinstance(damage_type, (int, float)):
+        # 如果是数字，直接使用
+        return frozenset((int(damage_type),))
+    return frozenset()
+
+
+# 自定义技能效果类型 -> 处理函数
+_CUSTOM_EFFECT_HANDLERS = {
+    'damage': SkillProcessor._process_custom_damage,
+    'heal': SkillProcessor._process_custom_heal,
+    'buff': SkillProcessor._process_custom_buff,
+    'debuff': SkillProcessor._process_custom_debuff,
+    'control': SkillProcessor._process_custom_control,
+    'shield': SkillProcessor._process_custom_shield,
+    'status': SkillProcessor._process_custom_status,
+}
+
+# 特殊技能名称 -> 处理函数，按优先级排列（永夜终焉优先）
+_SPECIAL_SKILL_HANDLERS = {
+    '永夜终焉': SkillProcessor._process_eternal_night,
+    '毁灭重铸': SkillProcessor._process_destruction_reforge,
+    '超载穿透弹': SkillProcessor._process_overload_penetration,
+    '碎颅猛击': SkillProcessor._process_skull_smash,
+    '举盾防御': SkillProcessor._process_shield_defense,
+}
+
+# 各特殊技能受限的控制状态（超载穿透弹还受麻痹限制，其余只受冰冻和眩晕限制）
+_SPECIAL_SKILL_BLOCKING_MASKS = {
+    SkillProcessor._process_eternal_night: Hero.FROZEN | Hero.STUNNED,
+    SkillProcessor._process_destruction_reforge: Hero.FROZEN | Hero.STUNNED,
+    SkillProcessor._process_overload_penetration: Hero.DISABLED_MASK,
+    SkillProcessor._process_skull_smash: Hero.FROZEN | Hero.STUNNED,
+    SkillProcessor._process_shield_defense: Hero.FROZEN | Hero.STUNNED,
+}
+
+# 受限的控制状态位 -> 提示文字（同时处于多种状态时按冰冻、眩晕、麻痹的顺序取第一个）
+_CONTROL_LABEL = {
+    mask: "冰冻" if mask & Hero.FROZEN else "眩晕" if mask & Hero.STUNNED else "麻痹"
+    for mask in range(1, Hero.DISABLED_MASK + 1)
+}
+
+# 技能处理分支（SkillProcessor.compile的结果），统一签名：
+# (hero, skill, target, skill_coefficient, result, hero_name, target_name)
+def _impl_custom_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+    return _process_custom_skill(hero, skill, target, result, hero_name, target_name)
+
+
+def _impl_damage_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+    return _process_damage_skill(hero, skill, target, skill_coefficient, result)
+
+
+def _impl_control_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+    return _process_control_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name)
+
+
+def _impl_buff_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+    return _process_buff_skill(hero, skill, skill_coefficient, result, hero_name)
+
+
+def _impl_default_attack(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+    return _process_default_attack(hero, target, result, hero_name, target_name)
+
+
+def _impl_inert_passive(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+    _emit("    %s 被动技能: %s 不产生战斗效果", hero_name, skill['name'])
+    return result
+
+
+def _impl_unknown_skill(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+    _emit("    %s 未知类型技能: %s，使用默认攻击", hero_name, skill['name'])
+    return _process_default_attack(hero, target, result, hero_name, target_name)
+
+
+def _active_skill_impl(type_code: int, keyword_mask: int):
+    """主动技能的处理分支（只在生成_ACTIVE_SKILL_IMPLS时调用）"""
+    # 技能类型1: 伤害类技能（攻击型）
+    if type_code == 1 or (keyword_mask & _KW_ATTACK and type_code != 3):
+        return _impl_damage_skill
+    # 技能类型2: 控制类技能
+    elif type_code == 2 or keyword_mask & _KW_CONTROL:
+        return _impl_control_skill
+    # 技能类型3: BUFF类技能（增益效果）
+    elif type_code == 3 or keyword_mask & _KW_BUFF:
+        return _impl_buff_skill
+    # 默认处理：普通攻击
+    else:
+        return _impl_default_attack
+
+
+# 主动技能分派表：(技能类型编码, 关键词掩码) -> 处理分支，覆盖全部编码和掩码组合
+_ACTIVE_SKILL_IMPLS = {
+    (type_code, keyword_mask): _active_skill_impl(type_code, keyword_mask)
+    for type_code in set(_SKILL_TYPE_CODES.values()) | {-1}
+    for keyword_mask in range((_KW_ATTACK | _KW_CONTROL | _KW_BUFF) + 1)
+}
+
+
+def _special_skill_impl(handler):
+    """将特殊技能处理函数包装为统一签名的处理分支"""
+    def impl(hero, skill, target, skill_coefficient, result, hero_name, target_name):
+        return handler(hero, skill, target, result, hero_name, target_name)
+    return impl
+
+
+_SPECIAL_SKILL_IMPLS = {handler: _special_skill_impl(handler) for handler in _SPECIAL_SKILL_HANDLERS.values()}
+
+# 技能名称 -> 处理函数（None表示普通技能），每个技能名称只解析一次
+_special_handler_cache = {}
+
+
+def _get_special_skill_handler(skill_name: str):
+    """获取特殊技能的处理函数
+    
+    先按技能名称精确查找；技能名称只是包含特殊技能名称（如带前后缀的变体）时，
+    按优先级顺序匹配，结果按技能名称缓存。
+    """
+    handler = _SPECIAL_SKILL_HANDLERS.get(skill_name)
+    if handler is not None:
+        return handler
+    try:
+        return _special_handler_cache[skill_name]
+    except KeyError:
+        pass
+    for special_name, special_handler in _SPECIAL_SKILL_HANDLERS.items():
+        if special_name in skill_name:
+            handler = special_handler
+            break
+    _special_handler_cache[skill_name] = handler
+    return handler
+
+
+def _skill_blocking_mask(skill: Dict) -> int:
+    """技能受限的控制状态位掩码
+
+    自定义技能受冰冻、眩晕、麻痹限制，特殊技能见_SPECIAL_SKILL_BLOCKING_MASKS，
+    普通技能不受限制（由Hero.use_skill统一检查）。
+    """
+    if SKILL_EDITOR_ENABLED and isinstance(skill.get('effects'), list):
+        return Hero.DISABLED_MASK
+    handler = _get_special_skill_handler(skill['name'])
+    if handler is None:
+        return 0
+    return _SPECIAL_SKILL_BLOCKING_MASKS[handler]
@@ -5,8 +5,166 @@
 处理英雄状态效果和状态更新
 """
 
+import sys
 from typing import Dict, List
 
+from battle._verbose import emit as _emit
+
+
+class StatusEffect:
+    """状态效果记录（使用__slots__的轻量记录类）
+
+    未赋值的字段保持未设置状态（等同于效果字典中不存在该键），
+    未知的附加参数保存在extra字典中。
+    """
+
+    __slots__ = ('type', 'duration', 'buff_type', 'debuff_type', 'value', 'is_percentage', 'source',
+                 'amount', 'boost_amount', 'reduction_amount', 'original_defense', 'extra')
+
+    def __init__(self, effect_type: str, duration: int, **kwargs):
+        self.type = effect_type
+        self.duration = duration
+        extra = None
+        for name, value in kwargs.items():
+            if name in _STATUS_EFFECT_FIELDS:
+                setattr(self, name, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[name] = value
+        if extra is not None:
+            self.extra = extra
+
+    def to_dict(self) -> Dict:
+        """转换为效果字典（type、duration在前，其余为已设置的字段和附加参数）"""
+        result = {'type': self.type, 'duration': self.duration}
+        for name in _STATUS_EFFECT_FIELDS:
+            if hasattr(self, name):
+                result[name] = getattr(self, name)
+        result.update(getattr(self, 'extra', ()))
+        return result
+
+    @classmethod
+    def from_dict(cls, effect: Dict) -> 'StatusEffect':
+        """由效果字典创建记录（兼容直接向status_effects追加字典的旧插件代码）"""
+        kwargs = {name: value for name, value in effect.items() if name != 'type' and name != 'duration'}
+        return cls(_intern(effect['type']), effect['duration'], **kwargs)
+
+    def get(self, key: str, default=None):
+        """按效果字典的键读取字段，未设置时返回default（兼容按字典读取效果的旧插件代码）"""
+        if key in _STATUS_EFFECT_KEYS:
+            return getattr(self, key, default)
+        extra = getattr(self, 'extra', None)
+        return extra.get(key, default) if extra else default
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __repr__(self) -> str:
+        return f"StatusEffect({self.to_dict()!r})"
+
+
+# 除type、duration、extra外可按关键字参数设置的字段
+_STATUS_EFFECT_FIELDS = StatusEffect.__slots__[2:-1]
+# 可按字典键读取的字段（extra除外）
+_STATUS_EFFECT_KEYS = frozenset(StatusEffect.__slots__[:-1])
+_MISSING = object()
+
+
+def _as_status_effect(effect):
+    """把旧插件代码追加的效果字典转换为StatusEffect"""
+    return StatusEffect.from_dict(effect) if isinstance(effect, dict) else effect
+
+
+class StatusEffectList(list):
+    """英雄的状态效果列表
+
+    按施加顺序保存效果（结束时也按施加顺序结算），并维护效果类型 -> 数量的索引，
+    判断是否存在某类效果时不必遍历列表。追加字典形式的效果时自动转换为StatusEffect。
+    """
+
+    __slots__ = ('_type_counts',)
+
+    def __init__(self, effects=()):
+        super().__init__(map(_as_status_effect, effects))
+        self._reindex()
+
+    def _reindex(self):
+        """按列表内容重建类型索引"""
+        counts = {}
+        for effect in self:
+            counts[effect.type] = counts.get(effect.type, 0) + 1
+        self._type_counts = counts
+
+    def has_type(self, effect_type: str) -> bool:
+        """是否存在指定类型的效果"""
+        return effect_type in self._type_counts
+
+    def first_of_type(self, effect_type: str):
+        """最早施加的指定类型效果，不存在时返回None"""
+        if effect_type in self._type_counts:
+            for effect in self:
+                if effect.type == effect_type:
+                    return effect
+        return None
+
+    def remove_type(self, effect_type: str):
+        """原地移除指定类型的所有效果"""
+        if self._type_counts.pop(effect_type, None) is not None:
+            self[:] = [effect for effect in self if effect.type != effect_type]
+
+    def append(self, effect):
+        effect = _as_status_effect(effect)
+        list.append(self, effect)
+        counts = self._type_counts
+        counts[effect.type] = counts.get(effect.type, 0) + 1
+
+    # 其余修改列表的操作不在每回合的热路径上，执行后整体重建索引
+    def extend(self, effects):
+        list.extend(self, map(_as_status_effect, effects))
+        self._reindex()
+
+    def __iadd__(self, effects):
+        self.extend(effects)
+        return self
+
+    def insert(self, index, effect):
+        list.insert(self, index, _as_status_effect(effect))
+        self._reindex()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_as_status_effect(effect) for effect in value]
+        else:
+            value = _as_status_effect(value)
+        list.__setitem__(self, index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._reindex()
+
+    def remove(self, effect):
+        list.remove(self, effect)
+        self._reindex()
+
+    def pop(self, index=-1):
+        effect = list.pop(self, index)
+        self._reindex()
+        return effect
+
+    def clear(self):
+        list.clear(self)
+        self._type_counts = {}
+
+
+def _intern(value):
+    """驻留类型字符串（枚举成员等str子类不能驻留，原样返回）"""
+    return sys.intern(value) if type(value) is str else value
+
 
 class StatusManager:
     """状态管理器"""
@@ -17,116 +175,90 @@ class StatusManager:
         # 使用显示名称，如果没有提供则使用原始名称
         hero_name = display_name if display_name else hero.name
         
-        # 更新状态效果持续时间
-        new_effects = []
-        
-        for effect in hero.status_effects:
-            effect['duration'] -= 1
-            if effect['duration'] > 0:
-                new_effects.append(effect)
+        # 更新状态效果持续时间（按施加顺序原地压缩，没有效果结束的回合不分配新列表）
+        status_effects = hero.status_effects
+        kept = 0
+        for effect in status_effects:
+            effect.duration -= 1
+            if effect.duration > 0:
+                list.__setitem__(status_effects, kept, effect)
+                kept += 1
             else:
                 # 效果结束，清除对应状态
-                if effect['type'] == 'freeze':
-                    hero.is_frozen = False
-                    print(f"{hero_name} 的冻结状态结束!")
-                elif effect['type'] == 'stun':
-                    hero.is_stunned = False
-                    print(f"{hero_name} 的眩晕状态结束!")
-                elif effect['type'] == 'taunt':
-                    hero.is_taunted = False
-                    print(f"{hero_name} 的嘲讽状态结束!")
-                elif effect['type'] == 'paralyze':
-                    hero.is_paralyzed = False
-                    print(f"{hero_name} 的麻痹状态结束!")
-                elif effect['type'] == 'armor_reduction':
-                    # 恢复防御值
-                    if 'original_defense' in effect:
-                        hero.defense = effect['original_defense']
-                    print(f"{hero_name} 的防御值降低状态结束!")
-                    print(f"{hero_name} 防御值恢复至: {hero.defense}")
-                elif effect['type'] == 'shield':
-                    # 护盾效果结束
-                    hero.shield_amount = 0
-                    hero.max_shield = 0
-                    print(f"{hero_name} 的护盾效果结束!")
-                elif effect['type'] == 'buff':
-                    # 移除增益效果
-                    StatusManager._remove_buff_effect(hero, effect, hero_name)
-                elif effect['type'] == 'debuff':
-                    # 移除减益效果
-                    StatusManager._remove_debuff_effect(hero, effect, hero_name)
-        
-        hero.status_effects = new_effects
+                effect_type = effect.type
+                control_flag = hero.CONTROL_EFFECT_FLAGS.get(effect_type)
+                if control_flag:
+                    hero.control_mask &= ~control_flag
+
+                on_expire = _ON_EXPIRE.get(effect_type)
+                if on_expire is not None:
+                    on_expire(hero, effect, hero_name)
+
+        # 有效果结束时截断列表并重建类型索引
+        if kept < len(status_effects):
+            del status_effects[kept:]
         
         # 更新被动技能状态
-        StatusManager._update_passive_states(hero, hero_name)
+        _update_passive_states(hero, hero_name)
+
+    @staticmethod
+    def _expire_control(hero, effect, hero_name):
+        """控制/嘲讽状态结束"""
+        _emit("%s 的%s状态结束!", hero_name, _CONTROL_STATUS_NAMES[effect.type])
+
+    @staticmethod
+    def _expire_armor_reduction(hero, effect, hero_name):
+        """防御值降低状态结束，恢复防御值"""
+        if hasattr(effect, 'original_defense'):
+            hero.defense = effect.original_defense
+        _emit("%s 的防御值降低状态结束!", hero_name)
+        _emit("%s 防御值恢复至: %s", hero_name, hero.defense)
+
+    @staticmethod
+    def _expire_shield(hero, effect, hero_name):
+        """护盾效果结束"""
+        hero.shield_amount = 0
+        hero.max_shield = 0
+        _emit("%s 的护盾效果结束!", hero_name)
 
     @staticmethod
     def _remove_buff_effect(hero, effect, hero_name):
         """移除增益效果"""
-        buff_type = effect['buff_type']
-        
-        if buff_type == 'attack':
-            boost_amount = effect.get('boost_amount', 0)
-            hero.attack -= boost_amount
-            print(f"{hero_name} 的攻击力提升效果结束，攻击力减少 {boost_amount} 点!")
-        elif buff_type == 'defense':
-            boost_amount = effect.get('boost_amount', 0)
-            hero.defense -= boost_amount
-            print(f"{hero_name} 的防御力提升效果结束，防御力减少 {boost_amount} 点!")
-        elif buff_type == 'crit_rate':
-            hero.crit_rate -= effect['value']
-            print(f"{hero_name} 的暴击率提升效果结束，暴击率减少 {effect['value']*100}%!")
-        elif buff_type == 'crit_damage':
-            hero.crit_damage -= effect['value']
-            print(f"{hero_name} 的暴击伤害提升效果结束，暴击伤害减少 {effect['value']*100}%!")
-        elif buff_type == 'max_health':
-            boost_amount = effect.get('boost_amount', 0)
-            hero.max_health -= boost_amount
-            hero.health = min(hero.health, hero.max_health)  # 确保当前生命值不超过最大生命值
-            print(f"{hero_name} 的最大生命值提升效果结束，最大生命值减少 {boost_amount} 点!")
+        handler = _REMOVE_BUFF_HANDLERS.get(effect.buff_type)
+        if handler is not None:
+            handler(hero, effect, hero_name)
 
     @staticmethod
     def _remove_debuff_effect(hero, effect, hero_name):
         """移除减益效果"""
-        debuff_type = effect['debuff_type']
-        
-        if debuff_type == 'attack':
-            reduction_amount = effect.get('reduction_amount', 0)
-            hero.attack += reduction_amount
-            print(f"{hero_name} 的攻击力降低效果结束，攻击力恢复 {reduction_amount} 点!")
-        elif debuff_type == 'defense':
-            reduction_amount = effect.get('reduction_amount', 0)
-            hero.defense += reduction_amount
-            print(f"{hero_name} 的防御力降低效果结束，防御力恢复 {reduction_amount} 点!")
-        elif debuff_type == 'crit_rate':
-            hero.crit_rate += effect['value']
-            print(f"{hero_name} 的暴击率降低效果结束，暴击率恢复 {effect['value']*100}%!")
-        elif debuff_type == 'crit_damage':
-            hero.crit_damage += effect['value']
-            print(f"{hero_name} 的暴击伤害降低效果结束，暴击伤害恢复 {effect['value']*100}%!")
+        handler = _REMOVE_DEBUFF_HANDLERS.get(effect.debuff_type)
+        if handler is not None:
+            handler(hero, effect, hero_name)
     
     @staticmethod
     def _update_passive_states(hero, hero_name):
         """更新被动技能状态"""
         # 更新不屈意志攻击力提升剩余回合（仅当英雄拥有该被动技能时）
-        if 'unyielding_will' in hero.passive_states and hero.passive_states['unyielding_will']['attack_boost_remaining'] > 0:
-            hero.passive_states['unyielding_will']['attack_boost_remaining'] -= 1
-            if hero.passive_states['unyielding_will']['attack_boost_remaining'] == 0:
+        passive_states = hero.passive_states
+        unyielding_will = passive_states.get('unyielding_will')
+        if unyielding_will is not None and unyielding_will['attack_boost_remaining'] > 0:
+            unyielding_will['attack_boost_remaining'] -= 1
+            if unyielding_will['attack_boost_remaining'] == 0:
                 # 攻击力提升效果结束
-                boost_amount = hero.passive_states['unyielding_will']['attack_boost_amount']
-                hero.attack -= boost_amount
-                hero.passive_states['unyielding_will']['attack_boost_amount'] = 0
-                print(f"{hero_name} 的不屈意志攻击力提升效果结束!")
-        
-        # 更新寒冰血脉减速效果
-        if hero.passive_states['frost_blood']['slow_effects']:
-            new_slow_effects = []
-            for slow_effect in hero.passive_states['frost_blood']['slow_effects']:
+                hero.attack -= unyielding_will['attack_boost_amount']
+                unyielding_will['attack_boost_amount'] = 0
+                _emit("%s 的不屈意志攻击力提升效果结束!", hero_name)
+
+        # 更新寒冰血脉减速效果（原地移除已结束的减速效果）
+        slow_effects = passive_states['frost_blood']['slow_effects']
+        if slow_effects:
+            kept = 0
+            for slow_effect in slow_effects:
                 slow_effect['remaining'] -= 1
                 if slow_effect['remaining'] > 0:
-                    new_slow_effects.append(slow_effect)
-            hero.passive_states['frost_blood']['slow_effects'] = new_slow_effects
+                    slow_effects[kept] = slow_effect
+                    kept += 1
+            del slow_effects[kept:]
     
     @staticmethod
     def apply_status_effect(hero, effect_type: str, duration: int, display_name=None, **kwargs):
@@ -134,29 +266,21 @@ class StatusManager:
         # 使用显示名称，如果没有提供则使用原始名称
         hero_name = display_name if display_name else hero.name
         
-        effect = {
-            'type': effect_type,
-            'duration': duration,
-            **kwargs
-        }
+        # 效果类型可能来自技能数据或插件，驻留后与字面量比较、查表时可直接命中同一对象
+        effect_type = _intern(effect_type)
+        effect = StatusEffect(effect_type, duration, **kwargs)
         
-        # 移除同类型的旧效果
-        hero.status_effects = [eff for eff in hero.status_effects if eff['type'] != effect_type]
+        # 移除同类型的旧效果后添加新效果
+        status_effects = hero.status_effects
+        status_effects.remove_type(effect_type)
+        status_effects.append(effect)
         
-        # 添加新效果
-        hero.status_effects.append(effect)
-        
-        # 立即设置对应状态
-        if effect_type == 'freeze':
-            hero.is_frozen = True
-        elif effect_type == 'stun':
-            hero.is_stunned = True
-        elif effect_type == 'taunt':
-            hero.is_taunted = True
-        elif effect_type == 'paralyze':
-            hero.is_paralyzed = True
+        # 立即设置对应控制状态位
+        control_flag = hero.CONTROL_EFFECT_FLAGS.get(effect_type)
+        if control_flag:
+            hero.control_mask |= control_flag
         
-        print(f"{hero_name} 被施加 {effect_type} 效果，持续 {duration} 回合!")
+        _emit("%s 被施加 %s 效果，持续 %s 回合!", hero_name, effect_type, duration)
 
     @staticmethod
     def apply_buff_effect(hero, buff_type: str, value: float, duration: int, display_name=None, 
@@ -164,53 +288,17 @@ class StatusManager:
         """应用增益效果"""
         hero_name = display_name if display_name else hero.name
         
-        effect = {
-            'type': 'buff',
-            'buff_type': buff_type,
-            'value': value,
-            'duration': duration,
-            'is_percentage': is_percentage,
-            'source': source
-        }
+        # 增益类型可能来自插件或界面输入，驻留后查处理表、移除时比较可直接命中同一对象
+        buff_type = _intern(buff_type)
+        effect = StatusEffect('buff', duration, buff_type=buff_type, value=value,
+                              is_percentage=is_percentage, source=source)
         
         # 应用增益效果
-        if buff_type == 'attack':
-            if is_percentage:
-                boost_amount = int(hero.attack * value)
-            else:
-                boost_amount = int(value)
-            hero.attack += boost_amount
-            effect['boost_amount'] = boost_amount
-            print(f"{hero_name} 攻击力提升 {boost_amount} 点，持续 {duration} 回合!")
-            
-        elif buff_type == 'defense':
-            if is_percentage:
-                boost_amount = int(hero.defense * value)
-            else:
-                boost_amount = int(value)
-            hero.defense += boost_amount
-            effect['boost_amount'] = boost_amount
-            print(f"{hero_name} 防御力提升 {boost_amount} 点，持续 {duration} 回合!")
-            
-        elif buff_type == 'crit_rate':
-            hero.crit_rate += value
-            print(f"{hero_name} 暴击率提升 {value*100}%，持续 {duration} 回合!")
-            
-        elif buff_type == 'crit_damage':
-            hero.crit_damage += value
-            print(f"{hero_name} 暴击伤害提升 {value*100}%，持续 {duration} 回合!")
-            
-        elif buff_type == 'max_health':
-            if is_percentage:
-                boost_amount = int(hero.max_health * value)
-            else:
-                boost_amount = int(value)
-            hero.max_health += boost_amount
-            hero.health += boost_amount  # 同时增加当前生命值
-            effect['boost_amount'] = boost_amount
-            print(f"{hero_name} 最大生命值提升 {boost_amount} 点，持续 {duration} 回合!")
+        handler = _APPLY_BUFF_HANDLERS.get(buff_type)
+        if handler is not None:
+            handler(hero, effect, hero_name)
         
-        # 添加到状态效果列表
+        # 添加到状态效果列表（同类增益可叠加）
         hero.status_effects.append(effect)
 
     @staticmethod
@@ -219,43 +307,17 @@ class StatusManager:
         """应用减益效果"""
         hero_name = display_name if display_name else hero.name
         
-        effect = {
-            'type': 'debuff',
-            'debuff_type': debuff_type,
-            'value': value,
-            'duration': duration,
-            'is_percentage': is_percentage,
-            'source': source
-        }
+        # 减益类型可能来自插件或界面输入，驻留后查处理表、移除时比较可直接命中同一对象
+        debuff_type = _intern(debuff_type)
+        effect = StatusEffect('debuff', duration, debuff_type=debuff_type, value=value,
+                              is_percentage=is_percentage, source=source)
         
         # 应用减益效果
-        if debuff_type == 'attack':
-            if is_percentage:
-                reduction_amount = int(hero.attack * value)
-            else:
-                reduction_amount = int(value)
-            hero.attack = max(0, hero.attack - reduction_amount)
-            effect['reduction_amount'] = reduction_amount
-            print(f"{hero_name} 攻击力降低 {reduction_amount} 点，持续 {duration} 回合!")
-            
-        elif debuff_type == 'defense':
-            if is_percentage:
-                reduction_amount = int(hero.defense * value)
-            else:
-                reduction_amount = int(value)
-            hero.defense = max(0, hero.defense - reduction_amount)
-            effect['reduction_amount'] = reduction_amount
-            print(f"{hero_name} 防御力降低 {reduction_amount} 点，持续 {duration} 回合!")
-            
-        elif debuff_type == 'crit_rate':
-            hero.crit_rate = max(0, hero.crit_rate - value)
-            print(f"{hero_name} 暴击率降低 {value*100}%，持续 {duration} 回合!")
-            
-        elif debuff_type == 'crit_damage':
-            hero.crit_damage = max(1.0, hero.crit_damage - value)
-            print(f"{hero_name} 暴击伤害降低 {value*100}%，持续 {duration} 回合!")
+        handler = _APPLY_DEBUFF_HANDLERS.get(debuff_type)
+        if handler is not None:
+            handler(hero, effect, hero_name)
         
-        # 添加到状态效果列表
+        # 添加到状态效果列表（同类减益可叠加）
         hero.status_effects.append(effect)
 
     @staticmethod
@@ -263,18 +325,13 @@ class StatusManager:
         """应用护盾效果"""
         hero_name = display_name if display_name else hero.name
         
-        effect = {
-            'type': 'shield',
-            'amount': shield_amount,
-            'duration': duration,
-            'source': source
-        }
+        effect = StatusEffect('shield', duration, amount=shield_amount, source=source)
         
         # 设置护盾值
         hero.shield_amount = shield_amount
         hero.max_shield = shield_amount
         
-        print(f"{hero_name} 获得 {shield_amount} 点护盾，持续 {duration} 回合!")
+        _emit("%s 获得 %s 点护盾，持续 %s 回合!", hero_name, shield_amount, duration)
         
         # 添加到状态效果列表
         hero.status_effects.append(effect)
@@ -285,28 +342,203 @@ class StatusManager:
         # 使用显示名称，如果没有提供则使用原始名称
         hero_name = display_name if display_name else hero.name
         
-        hero.status_effects = []
-        hero.is_frozen = False
-        hero.is_stunned = False
-        print(f"{hero_name} 的所有状态效果已被清除!")
+        hero.status_effects = StatusEffectList()
+        hero.control_mask &= ~(hero.FROZEN | hero.STUNNED)
+        _emit("%s 的所有状态效果已被清除!", hero_name)
     
     @staticmethod
     def has_status_effect(hero, effect_type: str) -> bool:
         """检查是否具有特定状态效果"""
-        return any(eff['type'] == effect_type for eff in hero.status_effects)
+        return hero.status_effects.has_type(effect_type)
+    
+    @staticmethod
+    def has_active_effects(hero) -> bool:
+        """检查英雄当前是否存在任何状态效果（用于跳过无效果英雄的查询）"""
+        return bool(hero.status_effects)
     
     @staticmethod
     def get_status_effect_duration(hero, effect_type: str) -> int:
         """获取特定状态效果的剩余持续时间"""
-        for effect in hero.status_effects:
-            if effect['type'] == effect_type:
-                return effect['duration']
-        return 0
+        effect = hero.status_effects.first_of_type(effect_type)
+        return effect.duration if effect is not None else 0
     
     @staticmethod
-    def get_active_effects(hero_name: str) -> List[Dict]:
-        """获取指定英雄的当前活跃状态效果"""
-        # 这个方法需要从全局状态管理器中获取效果，但目前我们简化实现
-        # 在实际应用中，这里应该查询全局状态管理器
-        # 暂时返回空列表，避免错误
-        return []
\ No newline at end of file
+    def get_active_effects(hero) -> List[Dict]:
+        """获取指定英雄的当前活跃状态效果
+        
+        状态效果直接保存在英雄对象上，按英雄对象而非名称查询，同名英雄互不影响。
+        返回效果记录转换出的字典（按施加顺序排列），持续时间后续变化不会影响已返回的结果。
+        """
+        return [effect.to_dict() for effect in hero.status_effects]
+
+
+def _buff_amount(base, effect) -> int:
+    """增益/减益的实际数值：百分比效果按当前属性值计算"""
+    if effect.is_percentage:
+        return int(base * effect.value)
+    return int(effect.value)
+
+
+# 增益效果的施加与移除，处理函数签名统一为 (hero, effect, hero_name)
+def _apply_attack_buff(hero, effect, hero_name):
+    boost_amount = _buff_amount(hero.attack, effect)
+    hero.attack += boost_amount
+    effect.boost_amount = boost_amount
+    _emit("%s 攻击力提升 %s 点，持续 %s 回合!", hero_name, boost_amount, effect.duration)
+
+
+def _apply_defense_buff(hero, effect, hero_name):
+    boost_amount = _buff_amount(hero.defense, effect)
+    hero.defense += boost_amount
+    effect.boost_amount = boost_amount
+    _emit("%s 防御力提升 %s 点，持续 %s 回合!", hero_name, boost_amount, effect.duration)
+
+
+def _apply_crit_rate_buff(hero, effect, hero_name):
+    value = effect.value
+    hero.crit_rate += value
+    _emit("%s 暴击率提升 %s%%，持续 %s 回合!", hero_name, value*100, effect.duration)
+
+
+def _apply_crit_damage_buff(hero, effect, hero_name):
+    value = effect.value
+    hero.crit_damage += value
+    _emit("%s 暴击伤害提升 %s%%，持续 %s 回合!", hero_name, value*100, effect.duration)
+
+
+def _apply_max_health_buff(hero, effect, hero_name):
+    boost_amount = _buff_amount(hero.max_health, effect)
+    hero.max_health += boost_amount
+    hero.health += boost_amount  # 同时增加当前生命值
+    effect.boost_amount = boost_amount
+    _emit("%s 最大生命值提升 %s 点，持续 %s 回合!", hero_name, boost_amount, effect.duration)
+
+
+def _remove_attack_buff(hero, effect, hero_name):
+    boost_amount = getattr(effect, 'boost_amount', 0)
+    hero.attack -= boost_amount
+    _emit("%s 的攻击力提升效果结束，攻击力减少 %s 点!", hero_name, boost_amount)
+
+
+def _remove_defense_buff(hero, effect, hero_name):
+    boost_amount = getattr(effect, 'boost_amount', 0)
+    hero.defense -= boost_amount
+    _emit("%s 的防御力提升效果结束，防御力减少 %s 点!", hero_name, boost_amount)
+
+
+def _remove_crit_rate_buff(hero, effect, hero_name):
+    hero.crit_rate -= effect.value
+    _emit("%s 的暴击率提升效果结束，暴击率减少 %s%%!", hero_name, effect.value*100)
+
+
+def _remove_crit_damage_buff(hero, effect, hero_name):
+    hero.crit_damage -= effect.value
+    _emit("%s 的暴击伤害提升效果结束，暴击伤害减少 %s%%!", hero_name, effect.value*100)
+
+
+def _remove_max_health_buff(hero, effect, hero_name):
+    boost_amount = getattr(effect, 'boost_amount', 0)
+    hero.max_health -= boost_amount
+    hero.health = min(hero.health, hero.max_health)  # 确保当前生命值不超过最大生命值
+    _emit("%s 的最大生命值提升效果结束，最大生命值减少 %s 点!", hero_name, boost_amount)
+
+
+# 减益效果的施加与移除
+def _apply_attack_debuff(hero, effect, hero_name):
+    reduction_amount = _buff_amount(hero.attack, effect)
+    hero.attack = max(0, hero.attack - reduction_amount)
+    effect.reduction_amount = reduction_amount
+    _emit("%s 攻击力降低 %s 点，持续 %s 回合!", hero_name, reduction_amount, effect.duration)
+
+
+def _apply_defense_debuff(hero, effect, hero_name):
+    reduction_amount = _buff_amount(hero.defense, effect)
+    hero.defense = max(0, hero.defense - reduction_amount)
+    effect.reduction_amount = reduction_amount
+    _emit("%s 防御力降低 %s 点，持续 %s 回合!", hero_name, reduction_amount, effect.duration)
+
+
+def _apply_crit_rate_debuff(hero, effect, hero_name):
+    value = effect.value
+    hero.crit_rate = max(0, hero.crit_rate - value)
+    _emit("%s 暴击率降低 %s%%，持续 %s 回合!", hero_name, value*100, effect.duration)
+
+
+def _apply_crit_damage_debuff(hero, effect, hero_name):
+    value = effect.value
+    hero.crit_damage = max(1.0, hero.crit_damage - value)
+    _emit("%s 暴击伤害降低 %s%%，持续 %s 回合!", hero_name, value*100, effect.duration)
+
+
+def _remove_attack_debuff(hero, effect, hero_name):
+    reduction_amount = getattr(effect, 'reduction_amount', 0)
+    hero.attack += reduction_amount
+    _emit("%s 的攻击力降低效果结束，攻击力恢复 %s 点!", hero_name, reduction_amount)
+
+
+def _remove_defense_debuff(hero, effect, hero_name):
+    reduction_amount = getattr(effect, 'reduction_amount', 0)
+    hero.defense += reduction_amount
+    _emit("%s 的防御力降低效果结束，防御力恢复 %s 点!", hero_name, reduction_amount)
+
+
+def _remove_crit_rate_debuff(hero, effect, hero_name):
+    hero.crit_rate += effect.value
+    _emit("%s 的暴击率降低效果结束，暴击率恢复 %s%%!", hero_name, effect.value*100)
+
+
+def _remove_crit_damage_debuff(hero, effect, hero_name):
+    hero.crit_damage += effect.value
+    _emit("%s 的暴击伤害降低效果结束，暴击伤害恢复 %s%%!", hero_name, effect.value*100)
+
+
+# 增益/减益类型 -> 处理函数（未列出的类型只记录效果，不修改属性）
+_APPLY_BUFF_HANDLERS = {
+    'attack': _apply_attack_buff,
+    'defense': _apply_defense_buff,
+    'crit_rate': _apply_crit_rate_buff,
+    'crit_damage': _apply_crit_damage_buff,
+    'max_health': _apply_max_health_buff,
+}
+_REMOVE_BUFF_HANDLERS = {
+    'attack': _remove_attack_buff,
+    'defense': _remove_defense_buff,
+    'crit_rate': _remove_crit_rate_buff,
+    'crit_damage': _remove_crit_damage_buff,
+    'max_health': _remove_max_health_buff,
+}
+_APPLY_DEBUFF_HANDLERS = {
+    'attack': _apply_attack_debuff,
+    'defense': _apply_defense_debuff,
+    'crit_rate': _apply_crit_rate_debuff,
+    'crit_damage': _apply_crit_damage_debuff,
+}
+_REMOVE_DEBUFF_HANDLERS = {
+    'attack': _remove_attack_debuff,
+    'defense': _remove_defense_debuff,
+    'crit_rate': _remove_crit_rate_debuff,
+    'crit_damage': _remove_crit_damage_debuff,
+}
+
+# 控制/嘲讽状态类型 -> 结束提示中的状态名称
+_CONTROL_STATUS_NAMES = {
+    'freeze': '冻结',
+    'stun': '眩晕',
+    'taunt': '嘲讽',
+    'paralyze': '麻痹',
+}
+
+# 每回合调用的静态方法绑定为模块级函数，省去类属性查找和staticmethod描述符
+_update_passive_states = StatusManager._update_passive_states
+
+# 状态效果类型 -> 效果结束时的处理函数
+_ON_EXPIRE = {
+    'freeze': StatusManager._expire_control,
+    'stun': StatusManager._expire_control,
+    'taunt': StatusManager._expire_control,
+    'paralyze': StatusManager._expire_control,
+    'armor_reduction': StatusManager._expire_armor_reduction,
+    'shield': StatusManager._expire_shield,
+    'buff': StatusManager._remove_buff_effect,
+    'debuff': StatusManager._remove_debuff_effect,
+}
@@ -30,6 +30,14 @@ SKILL_KEYWORDS_MAPPING = {
     'heal': ['治疗', '回复', '恢复', '生命', 'HP', '血量']
 }
 
+# BUFF类技能描述关键词 -> 增益类型（按顺序匹配第一个出现的关键词，均未出现时为攻击提升）
+BUFF_TYPE_KEYWORDS = {
+    '防御': 'defense_boost',
+    '防御值': 'defense_boost',
+    '暴击': 'crit_boost',
+    '概率': 'crit_boost',
+}
+
 # 战斗配置
 MAX_BATTLE_TURNS = 50  # 最大战斗回合数
 DEFAULT_CRITICAL_MULTIPLIER = 1.5  # 默认暴击倍率
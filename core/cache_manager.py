@@ -4,13 +4,63 @@
 数据缓存管理器 - 提供数据预加载和缓存功能
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+import heapq
 import threading
 import time
+from types import MappingProxyType
 from core.config_manager import config
 import logging
 
+# 不存在的数据类型对应的空缓存（只读）
+_EMPTY = MappingProxyType({})
+
+# 缓存配置在导入时读取一次
+_DEFAULT_TTL = getattr(config.cache, 'default_ttl', 300)  # 默认缓存过期时间（秒）
+_MAX_ITEMS = getattr(config.cache, 'max_items', 256)      # 每种数据类型最多缓存的条目数
+
+
+class _CacheEntry:
+    """缓存项（使用__slots__的轻量记录类）"""
+    
+    __slots__ = ('data', 'expire_ts', 'hits', 'last_access')
+    
+    def __init__(self, data: Any, expire_ts: float, now: float):
+        self.data = data
+        self.expire_ts = expire_ts  # 过期时间（time.monotonic()时间戳）
+        self.hits = 0               # 命中次数
+        self.last_access = now      # 最近访问时间
+
+
+class _CacheShard:
+    """一种数据类型的缓存分片：独立的写锁和缓存快照"""
+    
+    __slots__ = ('lock', 'items')
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        # 缓存键 -> 缓存项，发布后不再增删缓存项；写入时复制后整体替换
+        self.items: Dict[str, _CacheEntry] = {}
+
+
+class _ExpiryState:
+    """过期清理线程的状态（与缓存读取路径使用的字段分开存放，清理线程只修改这个对象）"""
+    
+    __slots__ = ('heap', 'cv', 'running', 'thread')
+    
+    def __init__(self):
+        # 过期时间堆：(过期时间戳, 数据类型, 缓存键)，清理线程等待到堆顶到期时再处理；
+        # 被覆盖、淘汰或清除的缓存项在出堆时按过期时间戳识别并跳过
+        self.heap: List[Tuple[float, str, str]] = []
+        self.cv = threading.Condition(threading.Lock())
+        self.running = True
+        self.thread: Optional[threading.Thread] = None
+
+
+# 不存在的数据类型对应的空分片（不会写入）
+_EMPTY_SHARD = _CacheShard()
+_EMPTY_SHARD.items = _EMPTY
+
 
 class CacheManager:
     """数据缓存管理器（单例模式）"""
@@ -29,17 +79,16 @@ class CacheManager:
     def _initialize(self):
         """初始化缓存管理器"""
         self.logger = logging.getLogger(__name__)
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_lock = threading.RLock()
-        self._last_loaded: Dict[str, datetime] = {}
-        
-        # 默认缓存过期时间（秒）
-        self.default_ttl = config.cache.default_ttl if hasattr(config.cache, 'default_ttl') else 300
+        # 按数据类型分片：数据类型 -> 分片，各分片的缓存快照发布后不再增删缓存项（只更新缓存项内的访问统计）；
+        # 读取不加锁；写入只持有所属分片的锁，不同数据类型的写入互不阻塞
+        self._shards: Dict[str, _CacheShard] = {}
+        # 过期清理状态单独存放，读取路径只访问上面的只读字段
+        self._expiry = _ExpiryState()
+        self._last_loaded: Dict[str, float] = {}
         
         # 启动缓存清理线程
-        self._running = True
-        self._cleanup_thread = threading.Thread(target=self._cleanup_expired_cache, daemon=True)
-        self._cleanup_thread.start()
+        self._expiry.thread = threading.Thread(target=self._cleanup_expired_cache, daemon=True)
+        self._expiry.thread.start()
         
         self.logger.info("缓存管理器初始化完成")
     
@@ -54,21 +103,25 @@ class CacheManager:
         Returns:
             缓存数据或None
         """
-        with self._cache_lock:
-            if data_type in self._cache and cache_key in self._cache[data_type]:
-                cached_data = self._cache[data_type][cache_key]
-                
-                # 检查是否过期
-                if self._is_expired(data_type, cache_key):
-                    self.logger.debug(f"缓存 {data_type}:{cache_key} 已过期")
-                    self._remove(data_type, cache_key)
-                    return None
-                
-                self.logger.debug(f"缓存命中 {data_type}:{cache_key}")
-                return cached_data['data']
-            
+        # 读取所属分片的当前快照（不加锁）
+        cached_data = self._shards.get(data_type, _EMPTY_SHARD).items.get(cache_key)
+        if cached_data is None:
             self.logger.debug(f"缓存未命中 {data_type}:{cache_key}")
             return None
+        
+        # 检查是否过期
+        now = time.monotonic()
+        if now > cached_data.expire_ts:
+            self.logger.debug(f"缓存 {data_type}:{cache_key} 已过期")
+            self._remove(data_type, cache_key, cached_data)
+            return None
+        
+        # 记录访问统计，供超出容量时淘汰（并发读取时计数可能略少，不影响正确性）
+        cached_data.hits += 1
+        cached_data.last_access = now
+        
+        self.logger.debug(f"缓存命中 {data_type}:{cache_key}")
+        return cached_data.data
     
     def set(self, cache_key: str, data_type: str, data: Any, ttl: Optional[int] = None) -> None:
         """
@@ -80,18 +133,35 @@ class CacheManager:
             data: 要缓存的数据
             ttl: 过期时间（秒），None使用默认值
         """
-        with self._cache_lock:
-            if data_type not in self._cache:
-                self._cache[data_type] = {}
-            
-            expire_time = datetime.now() + timedelta(seconds=ttl or self.default_ttl)
-            self._cache[data_type][cache_key] = {
-                'data': data,
-                'expire_time': expire_time,
-                'created_at': datetime.now()
-            }
-            
-            self.logger.debug(f"缓存设置 {data_type}:{cache_key}, 过期时间: {expire_time}")
+        # 过期时间使用单调时钟的浮点时间戳，判断过期只需一次浮点比较
+        ttl = ttl or _DEFAULT_TTL
+        now = time.monotonic()
+        cached_item = _CacheEntry(data, now + ttl, now)
+        
+        shard = self._shards.get(data_type)
+        if shard is None:
+            # setdefault是原子操作，并发创建时只有一个分片生效
+            shard = self._shards.setdefault(data_type, _CacheShard())
+        
+        with shard.lock:
+            # 复制该分片的缓存后写入，再替换快照引用
+            type_cache = dict(shard.items)
+            type_cache[cache_key] = cached_item
+            if len(type_cache) > _MAX_ITEMS:
+                evicted_key = self._select_victim(type_cache, now)
+                del type_cache[evicted_key]
+                self.logger.debug(f"缓存 {data_type} 超出容量，淘汰 {evicted_key}")
+            shard.items = type_cache
+        
+        expiry = self._expiry
+        with expiry.cv:
+            # 新的过期时间早于当前堆顶时唤醒清理线程重新计算等待时间
+            heap = expiry.heap
+            heapq.heappush(heap, (cached_item.expire_ts, data_type, cache_key))
+            if heap[0][0] == cached_item.expire_ts:
+                expiry.cv.notify()
+        
+        self.logger.debug(f"缓存设置 {data_type}:{cache_key}, 有效期: {ttl}秒")
     
     def preload_data(self, data_loader: Any) -> None:
         """
@@ -139,69 +209,118 @@ class CacheManager:
         Args:
             data_type: 要清除的数据类型，None表示清除所有
         """
-        with self._cache_lock:
-            if data_type is None:
-                self._cache.clear()
-                self.logger.info("清除所有缓存")
-            elif data_type in self._cache:
-                self._cache[data_type].clear()
-                self.logger.info(f"清除 {data_type} 类型缓存")
+        if data_type is None:
+            # 换上新的分片表，旧分片同时清空（正在写入旧分片的数据随之丢弃）
+            shards, self._shards = self._shards, {}
+            for shard in shards.values():
+                with shard.lock:
+                    shard.items = {}
+            with self._expiry.cv:
+                self._expiry.heap.clear()
+            self.logger.info("清除所有缓存")
+        elif data_type in self._shards:
+            shard = self._shards[data_type]
+            with shard.lock:
+                shard.items = {}
+            self.logger.info(f"清除 {data_type} 类型缓存")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
-        with self._cache_lock:
-            stats = {
-                'total_items': 0,
-                'by_type': {},
-                'memory_usage_estimate': 0  # 简化的内存使用估计
-            }
-            
-            for data_type, cache_data in self._cache.items():
-                stats['by_type'][data_type] = len(cache_data)
-                stats['total_items'] += len(cache_data)
-                
-                # 粗略估计内存使用（假设每个缓存项约1KB）
-                stats['memory_usage_estimate'] += len(cache_data) * 1024
+        # 统计基于各分片的当前快照，不需要加锁
+        stats = {
+            'total_items': 0,
+            'by_type': {},
+            'memory_usage_estimate': 0  # 简化的内存使用估计
+        }
+        
+        for data_type, shard in list(self._shards.items()):
+            cache_data = shard.items
+            stats['by_type'][data_type] = len(cache_data)
+            stats['total_items'] += len(cache_data)
             
-            return stats
+            # 粗略估计内存使用（假设每个缓存项约1KB）
+            stats['memory_usage_estimate'] += len(cache_data) * 1024
+        
+        return stats
     
-    def _is_expired(self, data_type: str, cache_key: str) -> bool:
-        """检查缓存是否过期"""
-        if data_type in self._cache and cache_key in self._cache[data_type]:
-            cached_item = self._cache[data_type][cache_key]
-            return datetime.now() > cached_item['expire_time']
-        return True
+    @staticmethod
+    def _select_victim(type_cache: Dict[str, _CacheEntry], now: float) -> str:
+        """选择超出容量时淘汰的缓存键（v-LRU）
+        
+        取最久未访问的10%缓存项，淘汰其中得分 log(命中次数 + 剩余有效期 + δ) 最低的一项；
+        对数单调递增，直接比较括号内的值。
+        """
+        sample_size = max(1, len(type_cache) // 10)
+        candidates = heapq.nsmallest(sample_size, type_cache.items(), key=lambda kv: kv[1].last_access)
+        return min(candidates, key=lambda kv: kv[1].hits + max(kv[1].expire_ts - now, 0.0))[0]
     
-    def _remove(self, data_type: str, cache_key: str) -> None:
-        """移除缓存项"""
-        if data_type in self._cache and cache_key in self._cache[data_type]:
-            del self._cache[data_type][cache_key]
+    def _remove(self, data_type: str, cache_key: str, cached_item: _CacheEntry) -> None:
+        """移除缓存项（仅当该键仍对应cached_item时移除，避免删除其他线程刚写入的新数据）"""
+        shard = self._shards.get(data_type)
+        if shard is None:
+            return
+        with shard.lock:
+            if shard.items.get(cache_key) is not cached_item:
+                return
+            type_cache = dict(shard.items)
+            del type_cache[cache_key]
+            shard.items = type_cache
     
     def _cleanup_expired_cache(self) -> None:
         """清理过期缓存的线程函数"""
-        while self._running:
+        expiry = self._expiry
+        heap = expiry.heap
+        while expiry.running:
             try:
-                time.sleep(60)  # 每分钟检查一次
+                with expiry.cv:
+                    # 等待到堆顶的缓存项到期（set写入更早的过期时间或关闭时被唤醒）
+                    if not heap:
+                        expiry.cv.wait()
+                        continue
+                    delay = heap[0][0] - time.monotonic()
+                    if delay > 0:
+                        expiry.cv.wait(timeout=delay)
+                        continue
+                    
+                    # 弹出所有已到期的记录
+                    now = time.monotonic()
+                    due = {}
+                    while heap and heap[0][0] <= now:
+                        expire_ts, data_type, cache_key = heapq.heappop(heap)
+                        due.setdefault(data_type, []).append((cache_key, expire_ts))
                 
-                with self._cache_lock:
-                    expired_count = 0
-                    for data_type in list(self._cache.keys()):
-                        for cache_key in list(self._cache[data_type].keys()):
-                            if self._is_expired(data_type, cache_key):
-                                self._remove(data_type, cache_key)
+                # 逐个分片移除过期时间戳仍一致的缓存项，每次只持有一个分片的锁
+                expired_count = 0
+                for data_type, records in due.items():
+                    shard = self._shards.get(data_type)
+                    if shard is None:
+                        continue
+                    with shard.lock:
+                        type_cache = None
+                        for cache_key, expire_ts in records:
+                            cached_item = shard.items.get(cache_key)
+                            if cached_item is not None and cached_item.expire_ts == expire_ts:
+                                if type_cache is None:
+                                    type_cache = dict(shard.items)
+                                del type_cache[cache_key]
                                 expired_count += 1
-                    
-                    if expired_count > 0:
-                        self.logger.debug(f"清理了 {expired_count} 个过期缓存项")
+                        if type_cache is not None:
+                            shard.items = type_cache
+                
+                if expired_count > 0:
+                    self.logger.debug(f"清理了 {expired_count} 个过期缓存项")
                         
             except Exception as e:
                 self.logger.error(f"缓存清理线程错误: {e}")
     
     def shutdown(self) -> None:
         """关闭缓存管理器"""
-        self._running = False
-        if self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=5)
+        expiry = self._expiry
+        expiry.running = False
+        with expiry.cv:
+            expiry.cv.notify()
+        if expiry.thread.is_alive():
+            expiry.thread.join(timeout=5)
         self.logger.info("缓存管理器已关闭")
 
 
@@ -7,6 +7,7 @@ CLI交互增强模块 - 提供更好的用户体验
 from typing import Dict, List, Optional, Callable, Any
 import sys
 import os
+import re
 from dataclasses import dataclass
 from enum import Enum
 import readline  # 提供命令行历史记录和自动补全
@@ -26,6 +27,44 @@ class TextColor:
     UNDERLINE = '\033[4m'
 
 
+# 预先拼接的常用颜色组合，输出时不再逐个读取TextColor属性
+_RESET = TextColor.RESET
+_HEADER_STYLE = TextColor.CYAN + TextColor.BOLD
+_HEADER_BAR = _HEADER_STYLE + '=' * 60 + _RESET
+_SUCCESS_PREFIX = TextColor.GREEN + '✓ '
+_WARNING_PREFIX = TextColor.YELLOW + '⚠ '
+_ERROR_PREFIX = TextColor.RED + '✗ '
+_INFO_PREFIX = TextColor.BLUE + 'ℹ '
+_BACK_OPTION = TextColor.MAGENTA + 'b. 返回上级菜单' + _RESET
+_QUIT_OPTION = TextColor.MAGENTA + 'q. 退出程序' + _RESET
+
+# 整数输入（先校验格式再转换，无效输入不经过int()抛出异常）
+_INT_RE = re.compile(r'[+-]?\d+')
+
+# 清屏并将光标移到左上角
+_CLEAR_SEQUENCE = '\033[2J\033[H'
+
+
+def _enable_ansi_clear() -> bool:
+    """检查终端能否使用ANSI清屏序列（Windows 10+需先开启虚拟终端处理）"""
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+
+ANSI_CLEAR_ENABLED = _enable_ansi_clear()
+
+
 class MenuOption:
     """菜单选项类"""
     
@@ -47,54 +86,68 @@ class CLIEnhancer:
         self.current_menu: Optional[List[MenuOption]] = None
         
     def clear_screen(self):
-        """清屏"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """清屏（支持ANSI时直接输出清屏序列，不启动子进程）"""
+        if ANSI_CLEAR_ENABLED:
+            sys.stdout.write(_CLEAR_SEQUENCE)
+            sys.stdout.flush()
+        else:
+            os.system('cls')
     
     def print_header(self, title: Optional[str] = None):
         """打印应用头部"""
         self.clear_screen()
         header_title = title or self.app_name
-        print(f"{TextColor.CYAN}{TextColor.BOLD}{'='*60}{TextColor.RESET}")
-        print(f"{TextColor.CYAN}{TextColor.BOLD}{header_title:^60}{TextColor.RESET}")
-        print(f"{TextColor.CYAN}{TextColor.BOLD}{'='*60}{TextColor.RESET}\n")
+        print(_HEADER_BAR)
+        print(f"{_HEADER_STYLE}{header_title:^60}{_RESET}")
+        print(f"{_HEADER_BAR}\n")
     
     def print_success(self, message: str):
         """打印成功消息"""
-        print(f"{TextColor.GREEN}✓ {message}{TextColor.RESET}")
+        print(f"{_SUCCESS_PREFIX}{message}{_RESET}")
     
     def print_warning(self, message: str):
         """打印警告消息"""
-        print(f"{TextColor.YELLOW}⚠ {message}{TextColor.RESET}")
+        print(f"{_WARNING_PREFIX}{message}{_RESET}")
     
     def print_error(self, message: str):
         """打印错误消息"""
-        print(f"{TextColor.RED}✗ {message}{TextColor.RESET}")
+        print(f"{_ERROR_PREFIX}{message}{_RESET}")
     
     def print_info(self, message: str):
         """打印信息消息"""
-        print(f"{TextColor.BLUE}ℹ {message}{TextColor.RESET}")
+        print(f"{_INFO_PREFIX}{message}{_RESET}")
     
     def create_menu(self, options: List[MenuOption], title: str = "请选择操作") -> Optional[Callable]:
         """创建交互式菜单"""
         self.current_menu = options
+        # 小写选项键 -> 选项（倒序构建，键重复时保留第一个选项）
+        key_index = {option.key.lower(): option for option in reversed(options)}
         
         while True:
             self.print_header(title)
             
+            # 菜单内容逐行拼接后一次写出
+            lines = []
+            
             # 显示菜单历史（如果有）
             if self.menu_history:
-                print(f"{TextColor.WHITE}当前位置: {' > '.join(self.menu_history)}{TextColor.RESET}\n")
+                lines.append(f"{TextColor.WHITE}当前位置: {' > '.join(self.menu_history)}{_RESET}\n")
             
             # 显示菜单选项
             for option in options:
-                status = "" if option.enabled else "(禁用)"
-                color = TextColor.WHITE if option.enabled else TextColor.YELLOW
-                print(f"{color}{option.key}. {option.description} {status}{TextColor.RESET}")
+                if option.enabled:
+                    lines.append(f"{TextColor.WHITE}{option.key}. {option.description} {_RESET}")
+                else:
+                    lines.append(f"{TextColor.YELLOW}{option.key}. {option.description} (禁用){_RESET}")
             
             # 显示返回选项（如果不是主菜单）
             if len(self.menu_history) > 0:
-                print(f"{TextColor.MAGENTA}b. 返回上级菜单{TextColor.RESET}")
-            print(f"{TextColor.MAGENTA}q. 退出程序{TextColor.RESET}")
+                lines.append(_BACK_OPTION)
+            lines.append(_QUIT_OPTION)
+            
+            lines.append('')
+            sys.stdout.write('\n'.join(lines))
+            sys.stdout.flush()
             
             # 获取用户输入
             choice = input(f"\n{TextColor.CYAN}请输入选择: {TextColor.RESET}").strip().lower()
@@ -107,7 +160,7 @@ class CLIEnhancer:
                 return None
             
             # 查找匹配的选项
-            selected_option = next((opt for opt in options if opt.key.lower() == choice), None)
+            selected_option = key_index.get(choice)
             
             if selected_option:
                 if selected_option.enabled:
@@ -147,22 +200,22 @@ class CLIEnhancer:
         default_text = f" [{default}]" if default is not None else ""
         
         while True:
-            try:
-                response = input(f"{TextColor.CYAN}{prompt}{range_text}{default_text}: {TextColor.RESET}").strip()
-                
-                if response == '' and default is not None:
-                    return default
-                
-                value = int(response)
-                
-                if (min_val is not None and value < min_val) or (max_val is not None and value > max_val):
-                    self.print_error(f"数值必须在 {min_val}-{max_val} 范围内")
-                    continue
-                
-                return value
-                
-            except ValueError:
+            response = input(f"{TextColor.CYAN}{prompt}{range_text}{default_text}: {TextColor.RESET}").strip()
+            
+            if response == '' and default is not None:
+                return default
+            
+            if _INT_RE.fullmatch(response) is None:
                 self.print_error("请输入有效的数字")
+                continue
+            
+            value = int(response)
+            
+            if (min_val is not None and value < min_val) or (max_val is not None and value > max_val):
+                self.print_error(f"数值必须在 {min_val}-{max_val} 范围内")
+                continue
+            
+            return value
     
     def prompt_selection(self, prompt: str, options: List[str], 
                         display_func: Optional[Callable[[str], str]] = None) -> Optional[int]:
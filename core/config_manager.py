@@ -48,6 +48,7 @@ class CacheConfig:
     default_ttl: int = 300  # 默认缓存过期时间（秒）
     preload_enabled: bool = True  # 是否启用预加载
     cleanup_interval: int = 60  # 缓存清理间隔（秒）
+    max_items: int = 256  # 每种数据类型最多缓存的条目数（超出时按v-LRU淘汰）
 
 
 @dataclass
@@ -8,15 +8,60 @@
 
 import random
 from typing import Dict, List, Optional, Any
+from battle._verbose import emit as _emit
+from battle.status_manager import StatusEffectList, StatusManager
+from config import DAMAGE_FORMULA_PARAMS
 from .plugin_config import plugin_config_manager, PluginConfig
 
 # 全局DEBUG模式控制
 DEBUG_MODE = False
 
 
+def _control_flag(bit: int, doc: str) -> property:
+    """基于control_mask位的布尔属性"""
+    def getter(self) -> bool:
+        return bool(self.control_mask & bit)
+    
+    def setter(self, value: bool):
+        if value:
+            self.control_mask |= bit
+        else:
+            self.control_mask &= ~bit
+    
+    return property(getter, setter, doc=doc)
+
+
+# 技能处理器（battle.skill_processor引用本模块，首次使用技能时再导入并缓存）
+_SkillProcessor = None
+
+
+def _get_skill_processor():
+    """获取技能处理器类"""
+    global _SkillProcessor
+    if _SkillProcessor is None:
+        from battle.skill_processor import SkillProcessor
+        _SkillProcessor = SkillProcessor
+    return _SkillProcessor
+
+
 class Hero:
     """英雄类"""
     
+    # 控制状态位
+    FROZEN = 1
+    STUNNED = 2
+    PARALYZED = 4
+    TAUNTED = 8
+    # 无法攻击/使用技能的控制状态
+    DISABLED_MASK = FROZEN | STUNNED | PARALYZED
+    # 状态效果类型 -> 控制状态位
+    CONTROL_EFFECT_FLAGS = {'freeze': FROZEN, 'stun': STUNNED, 'paralyze': PARALYZED, 'taunt': TAUNTED}
+    
+    is_frozen = _control_flag(FROZEN, "是否处于冻结状态")
+    is_stunned = _control_flag(STUNNED, "是否处于眩晕状态")
+    is_paralyzed = _control_flag(PARALYZED, "是否处于麻痹状态")
+    is_taunted = _control_flag(TAUNTED, "是否处于嘲讽状态")
+    
     def __init__(self, hero_data: Dict, skills_data: List[Dict] = None):
         """初始化英雄属性"""
         self.id = hero_data.get('英雄ID', '')
@@ -31,20 +76,21 @@ class Hero:
         
         # 技能信息
         self.skills = self._create_skills(hero_data, skills_data)
+        # 技能冷却索引：可用技能与冷却中技能的下标集合，避免每回合全量扫描
+        self.ready_skills = set(range(len(self.skills)))
+        self.cooling_skills = set()
         
         # 插件技能系统
         self.plugin_skills: Dict[str, Any] = {}  # 插件技能字典 {技能名: 插件实例}
+        self._plugin_skill_names: List[str] = []  # 插件技能名称缓存，增删插件技能时更新
         
         # 根据Excel数据设置实际属性
         self._set_actual_attributes(hero_data)
         
         # 战斗状态
         self.health = self.max_health
-        self.status_effects = []  # [{'type': 'freeze', 'duration': 2}, ...]
-        self.is_frozen = False    # 是否处于冻结状态
-        self.is_stunned = False   # 是否处于眩晕状态
-        self.is_taunted = False   # 是否处于嘲讽状态
-        self.is_paralyzed = False # 是否处于麻痹状态
+        self.status_effects = StatusEffectList()  # 按施加顺序排列，如 [StatusEffect('freeze', 2)]
+        self.control_mask = 0     # 控制状态位掩码，is_frozen/is_stunned等属性由此派生
         self.shield_amount = 0    # 当前护盾值
         self.max_shield = 0       # 最大护盾值
         
@@ -211,34 +257,34 @@ class Hero:
         # 职业克制关系检查
         if self.role == 'DPS' and target.role == 'SNIP':
             damage = int(damage * 1.2)
-            print(f"职业克制! DPS对SNIP造成额外20%伤害")
+            _emit("职业克制! DPS对SNIP造成额外20%伤害")
         elif self.role == 'SNIP' and target.role == 'TANK':
             damage = int(damage * 1.2)
-            print(f"职业克制! SNIP对TANK造成额外20%伤害")
+            _emit("职业克制! SNIP对TANK造成额外20%伤害")
         elif self.role == 'TANK' and target.role == 'DPS':
             damage = int(damage * 1.2)
-            print(f"职业克制! TANK对DPS造成额外20%伤害")
+            _emit("职业克制! TANK对DPS造成额外20%伤害")
         elif self.role == 'TANK' and target.role == 'TANK':
             damage = int(damage * 1.5)
-            print(f"TANK对TANK! 伤害加成50%")
+            _emit("TANK对TANK! 伤害加成50%")
         
         # 稀有度克制关系检查
         if self.rank == 'SSR' and target.rank == 'SR':
             damage = int(damage * 1.5)
-            print(f"稀有度克制! SSR对SR造成额外50%伤害")
+            _emit("稀有度克制! SSR对SR造成额外50%伤害")
         elif self.rank == 'SSR' and target.rank == 'R':
             damage = int(damage * 2.0)
-            print(f"稀有度克制! SSR对R造成额外100%伤害")
+            _emit("稀有度克制! SSR对R造成额外100%伤害")
         elif self.rank == 'SR' and target.rank == 'R':
             damage = int(damage * 1.5)
-            print(f"稀有度克制! SR对R造成额外50%伤害")
+            _emit("稀有度克制! SR对R造成额外50%伤害")
         
         return damage
 
     def attack_target(self, target: 'Hero') -> Dict:
         """攻击目标英雄"""
         # 检查是否处于控制状态
-        if self.is_frozen or self.is_stunned or self.is_paralyzed:
+        if self.control_mask & Hero.DISABLED_MASK:
             control_type = "冻结" if self.is_frozen else "眩晕" if self.is_stunned else "麻痹"
             return {
                 'damage': 0,
@@ -249,23 +295,19 @@ class Hero:
             }
 
         # 从配置中获取防御参数
-        from config import DAMAGE_FORMULA_PARAMS
         defense_param1 = DAMAGE_FORMULA_PARAMS['defense_param1']
         defense_param2 = DAMAGE_FORMULA_PARAMS['defense_param2']
         min_damage = DAMAGE_FORMULA_PARAMS['min_damage']
         
-        # 计算防御减伤比例：防御力 / (防御力 + (等级 * 参数1 + 参数2))
-        defense_reduction = (target.defense / (target.defense + (target.level * defense_param1 + defense_param2)))
+        # 防御减伤比例：防御力 / (防御力 + (等级 * 参数1 + 参数2))
+        defense_reduction = target.defense / (target.defense + (target.level * defense_param1 + defense_param2))
         
-        # 暴击判断（实际是否触发暴击）
+        # 暴击判断
         is_crit = random.random() < self.crit_rate
         
-        if is_crit:
-            # 暴击伤害公式: 攻击力 * 暴击倍率 * (1 - 防御减伤比例)
-            damage = int(self.attack * self.crit_damage * (1 - defense_reduction))
-        else:
-            # 普通伤害公式: 攻击力 * (1 - 防御减伤比例)
-            damage = int(self.attack * (1 - defense_reduction))
+        # 伤害公式: 攻击力 * 暴击倍率(未暴击为1) * (1 - 防御减伤比例)；最小伤害保护在克制加成之后进行
+        multiplier = self.crit_damage if is_crit else 1.0
+        damage = int(self.attack * multiplier * (1 - defense_reduction))
         
         # 应用职业克制关系和稀有度克制关系
         damage = self._calculate_job_counter_damage(target, damage)
@@ -283,9 +325,9 @@ class Hero:
             shield_absorbed = min(damage, target.shield_amount)
             target.shield_amount -= shield_absorbed
             damage_after_shield = damage - shield_absorbed
-            print(f"{target.name} 的护盾吸收了 {shield_absorbed} 点伤害!")
+            _emit("%s 的护盾吸收了 %s 点伤害!", target.name, shield_absorbed)
             if target.shield_amount == 0:
-                print(f"{target.name} 的护盾已被击破!")
+                _emit("%s 的护盾已被击破!", target.name)
         
         # 剩余伤害扣除生命值（使用take_damage方法处理被动技能触发）
         if damage_after_shield > 0:
@@ -312,11 +354,10 @@ class Hero:
                     'duration': slow_duration,
                     'target': target.name
                 })
-                print(f"{self.name} 的寒冰血脉触发，{target.name} 被减速 {slow_duration} 秒!")
+                _emit("%s 的寒冰血脉触发，%s 被减速 %s 秒!", self.name, target.name, slow_duration)
             
             # 检查目标是否已被冻结，如果已冻结则造成额外伤害
-            frozen_effects = [eff for eff in target.status_effects if eff.get('type') == 'freeze']
-            if frozen_effects:
+            if target.status_effects.has_type('freeze'):
                 extra_damage = int(damage * 0.3)  # 额外30%伤害
                 if extra_damage > 0:
                     target.health -= extra_damage
@@ -327,7 +368,7 @@ class Hero:
                         'is_crit': False,
                         'description': '寒冰血脉对冻结目标的额外伤害'
                     })
-                    print(f"{self.name} 的寒冰血脉触发，对冻结的 {target.name} 造成额外 {extra_damage} 点伤害!")
+                    _emit("%s 的寒冰血脉触发，对冻结的 %s 造成额外 %s 点伤害!", self.name, target.name, extra_damage)
         
         return {
             'damage': damage,
@@ -338,10 +379,8 @@ class Hero:
     
     def use_skill(self, skill_index: int, target: Optional['Hero'] = None) -> Dict:
         """使用技能"""
-        from battle.skill_processor import SkillProcessor
-        
         # 检查是否处于控制状态
-        if self.is_frozen or self.is_stunned or self.is_paralyzed:
+        if self.control_mask & Hero.DISABLED_MASK:
             control_type = "冻结" if self.is_frozen else "眩晕" if self.is_stunned else "麻痹"
             return {'success': False, 'message': f"{self.name} 处于{control_type}状态，无法使用技能"}
             
@@ -357,13 +396,14 @@ class Hero:
         # 设置技能冷却
         if skill['cooldown'] > 0:
             skill['current_cooldown'] = skill['cooldown']
+            self.ready_skills.discard(skill_index)
+            self.cooling_skills.add(skill_index)
         
         # 使用技能处理器处理技能效果
-        return SkillProcessor.process_skill(self, skill, target, self.name, target.name if target else None)
+        return _get_skill_processor().process_skill(self, skill, target, self.name, target.name if target else None)
     
     def update_status_effects(self):
         """更新状态效果"""
-        from battle.status_manager import StatusManager
         StatusManager.update_hero_status(self)
     
     def get_skill_info(self, skill_index: int) -> Optional[Dict]:
@@ -380,18 +420,32 @@ class Hero:
         """重置所有技能冷却"""
         for skill in self.skills:
             skill['current_cooldown'] = 0
+        self.ready_skills = set(range(len(self.skills)))
+        self.cooling_skills.clear()
+    
+    def tick_cooldowns(self):
+        """回合结束时减少冷却中技能的剩余回合"""
+        for skill_index in list(self.cooling_skills):
+            skill = self.skills[skill_index]
+            skill['current_cooldown'] -= 1
+            if skill['current_cooldown'] <= 0:
+                self.cooling_skills.discard(skill_index)
+                if skill['current_cooldown'] == 0:
+                    self.ready_skills.add(skill_index)
     
     def add_plugin_skill(self, skill_name: str, plugin_instance: Any) -> bool:
         """添加插件技能"""
         if skill_name in self.plugin_skills:
             return False
         self.plugin_skills[skill_name] = plugin_instance
+        self._plugin_skill_names = list(self.plugin_skills)
         return True
     
     def remove_plugin_skill(self, skill_name: str) -> bool:
         """移除插件技能"""
         if skill_name in self.plugin_skills:
             del self.plugin_skills[skill_name]
+            self._plugin_skill_names = list(self.plugin_skills)
             return True
         return False
     
@@ -401,7 +455,7 @@ class Hero:
             return {'success': False, 'message': f"未找到插件技能: {skill_name}"}
         
         # 检查是否处于控制状态
-        if self.is_frozen or self.is_stunned or self.is_paralyzed:
+        if self.control_mask & Hero.DISABLED_MASK:
             control_type = "冻结" if self.is_frozen else "眩晕" if self.is_stunned else "麻痹"
             return {'success': False, 'message': f"{self.name} 处于{control_type}状态，无法使用技能"}
         
@@ -413,8 +467,8 @@ class Hero:
             return {'success': False, 'message': f"执行插件技能失败: {str(e)}"}
     
     def get_plugin_skills(self) -> List[str]:
-        """获取所有插件技能名称"""
-        return list(self.plugin_skills.keys())
+        """获取所有插件技能名称（返回缓存列表，调用方不应修改）"""
+        return self._plugin_skill_names
     
     def take_damage(self, damage: int, attacker: Optional['Hero'] = None) -> Dict:
         """
@@ -436,15 +490,16 @@ class Hero:
             'revived': False
         }
         
-        # 优先消耗护盾
+        # 优先消耗护盾：吸收量为护盾值与伤害值中的较小者，无护盾或无伤害时不大于0，只需一次判断
+        shield = self.shield_amount
+        shield_absorbed = shield if shield < damage else damage
         damage_after_shield = damage
-        if self.shield_amount > 0:
-            shield_absorbed = min(damage, self.shield_amount)
-            self.shield_amount -= shield_absorbed
+        if shield_absorbed > 0:
+            self.shield_amount = shield = shield - shield_absorbed
             damage_after_shield = damage - shield_absorbed
             result['shield_absorbed'] = shield_absorbed
-            
-            if self.shield_amount == 0:
+
+            if shield == 0:
                 result['shield_broken'] = True
         
         # 剩余伤害扣除生命值
@@ -483,7 +538,8 @@ class Hero:
                             'attack_boost_amount': passive_state['attack_boost_amount']  # 使用实际的攻击力提升数值
                         })
                         
-                        print(f"{self.name} 的不屈意志触发! 复活并恢复{revive_health}点生命值，攻击力提升{int(attack_boost_percent*100)}%持续10秒")
+                        _emit("%s 的不屈意志触发! 复活并恢复%s点生命值，攻击力提升%s%%持续10秒",
+                              self.name, revive_health, int(attack_boost_percent * 100))
         
         result['is_alive'] = self.health > 0
         return result
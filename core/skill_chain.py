@@ -158,8 +158,8 @@ class SkillChainManager:
         # 检查状态条件
         if 'status_effects' in requirements:
             required_status = requirements['status_effects']
-            hero_status = [effect['type'] for effect in hero.status_effects]
-            if not all(status in hero_status for status in required_status):
+            hero_status = hero.status_effects
+            if not all(hero_status.has_type(status) for status in required_status):
                 return False
         
         # 检查职业条件
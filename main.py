@@ -110,7 +110,7 @@ def run_battle_mode(heroes_data: List[Dict], skills_data: List[Dict], base_heroe
         # 开始战斗
         input("\n按回车键开始战斗...")
         
-        simulator = BattleSimulator()
+        simulator = BattleSimulator(verbose=True)
         simulator.setup_battle(hero1, hero2)
         battle_result = simulator.run_battle()
         
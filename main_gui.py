@@ -462,6 +462,8 @@ class BattleSimulatorGUI:
             DAMAGE_FORMULA_PARAMS['defense_param1'] = defense_param1
             DAMAGE_FORMULA_PARAMS['defense_param2'] = defense_param2
             DAMAGE_FORMULA_PARAMS['min_damage'] = min_damage
+            from battle.skill_processor import reload_damage_params
+            reload_damage_params()
             
             # 保存参数到配置文件
             self._save_damage_params_to_config(defense_param1, defense_param2, min_damage)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+扩展编译脚本 - 英雄对战模拟系统
+使用Cython将战斗模拟器的加速模块编译为本地扩展（可选）
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Cython扩展模块：(模块名, 源文件)
+EXTENSIONS = [
+    ("battle._simulator_fast", "battle/_simulator_fast.pyx"),
+]
+
+
+def build_extensions():
+    """原地编译Cython扩展"""
+    try:
+        from Cython.Build import cythonize
+        from setuptools import Extension, setup
+    except ImportError as e:
+        print(f"✗ 缺少依赖: {e}")
+        print("请运行: pip install cython setuptools")
+        return False
+
+    project_root = Path(__file__).resolve().parent.parent
+    os.chdir(project_root)
+
+    print("开始编译Cython扩展...")
+    try:
+        setup(
+            name="battle-simulator-ext",
+            ext_modules=cythonize(
+                [Extension(name, [source]) for name, source in EXTENSIONS],
+                compiler_directives={'language_level': 3}
+            ),
+            script_args=["build_ext", "--inplace"],
+        )
+    except SystemExit as e:
+        print(f"✗ 编译失败: {e}")
+        return False
+
+    print("✓ 编译完成，模拟器将自动使用加速模块")
+    return True
+
+
+def main():
+    """主函数"""
+    print("=== 英雄对战模拟系统扩展编译工具 ===\n")
+    if not build_extensions():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -299,6 +299,7 @@ __version__ = "{version}"
 __author__ = "{author}"
 
 from core.plugin_manager import SkillPlugin
+from battle.status_manager import StatusEffect
 from typing import Dict, Any, Optional
 
 
@@ -360,11 +361,7 @@ class {plugin_name}Plugin(SkillPlugin):
             return f'''    def execute_skill(self, hero, target) -> Dict[str, Any]:
         """执行技能：控制效果"""
         # 添加控制效果
-        target.status_effects.append({{
-            'type': 'stun',
-            'duration': 1,
-            'message': "被眩晕"
-        }})
+        target.status_effects.append(StatusEffect('stun', 1, message="被眩晕"))
         
         return {{
             'damage': 0,